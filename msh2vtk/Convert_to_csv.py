@@ -1,230 +1,67 @@
 import os
-import numpy as np
-import pandas as pd
-import gmsh
-import json
-import pyvista as pv
-from pyvista import _vtk as vtk
 import argparse
 import sys
+from engine.vtk_export import VTU_FORMAT, LEGACY_FORMAT, VTU_COMPRESSORS, DEFAULT_VTU_COMPRESSION
+from engine.postprocess_pool import serve_worker, SERVE_FLAG
+from engine.streaming import DEFAULT_CHUNK_SIZE
+from engine.summary_stats import parse_number_list, DEFAULT_TRIMMED_PERCENTS, DEFAULT_PERCENTILES
 #import cupy as cp
 
-def find_msh_files(python_file):
-    folder_path = os.path.splitext(python_file)[0]
-    mesh_file = os.path.join(folder_path, 'mesh.msh')
-    stress_tensor_file = os.path.join(folder_path, 'smooth_stress_tensor.msh')
-    force_vector_file = os.path.join(folder_path, 'force_vector.msh')
-
-    if os.path.exists(mesh_file) and os.path.exists(stress_tensor_file) and os.path.exists(force_vector_file):
-        return mesh_file, stress_tensor_file, force_vector_file
-    else:
-        print(f"Error: MSH files not found in the {folder_path} folder. Exiting.")
-        sys.exit()
-        
-
-def process_file(selected_file, export_von_mises, export_smooth_stress, export_vtk):
-    gmsh.initialize()
-
-    folder_path = os.path.splitext(selected_file)[0]
-    mesh_file, stress_tensor_file, force_vector_file = find_msh_files(selected_file)
-
-    print(f"\nUsing the MSH files in the {os.path.basename(folder_path)} folder:")
-    print(f" - mesh.msh: {mesh_file}")
-    print(f" - smooth_stress_tensor.msh: {stress_tensor_file}")
-    print(f" - force_vector.msh: {force_vector_file}")
-
-    gmsh.merge(mesh_file)
-    gmsh.merge(stress_tensor_file)
-    gmsh.merge(force_vector_file)
-
-    nodeTags, nodeCoords, _ = gmsh.model.mesh.getNodes()
-    nodeCoords = np.array(nodeCoords).reshape((-1, 3))
-    nodeData = pd.DataFrame({'NodeTag': nodeTags, 'X': nodeCoords[:, 0], 'Y': nodeCoords[:, 1], 'Z': nodeCoords[:, 2]})
-
-    dataType, tags, data, time, numComp = gmsh.view.getModelData(1, 0)
-    svms = []
-    for sig in data:
-        [xx, xy, xz, yx, yy, yz, zx, zy, zz] = sig
-        svm = np.sqrt(((xx - yy) ** 2 + (yy - zz) ** 2 + (zz - xx) ** 2) / 2 + 3 * (xy * xy + yz * yz + zx * zx))
-        svms.append(svm)
-    svms = np.array(svms)
-    svmData = pd.DataFrame({'Von mises Stress': svms}, index=nodeTags)
-
-    nodeData.reset_index(drop=True, inplace=True)
-    svmData.reset_index(drop=True, inplace=True)
-    combinedData = pd.concat([nodeData, svmData], axis=1)
-
-    dataType_force, tags_force, data_force, time_force, numComp_force = gmsh.view.getModelData(2, 0)
-    forces = []
-    for force in data_force:
-        [fx, fy, fz] = force
-        forces.append([fx, fy, fz])
-    forces = np.array(forces)
-    combinedData = pd.concat([combinedData, pd.DataFrame(forces, columns=['Fx', 'Fy', 'Fz'])], axis=1)
-
-    output_folder = folder_path
-
-    if export_smooth_stress:
-        combinedData.to_csv(os.path.join(output_folder, 'smooth_stress_tensor.csv'), index=False)
-
-    if export_vtk:
-        points = nodeCoords.reshape(-1, 3)
-        elementTypes, elementTags, nodeTagsPerElement = gmsh.model.mesh.getElements()
-        cells = []
-        for elementType, nodeTags in zip(elementTypes, nodeTagsPerElement):
-            numNodesPerElement = gmsh.model.mesh.getElementProperties(elementType)[3]
-            for element in nodeTags.reshape(-1, numNodesPerElement):
-                cells.append(np.insert(element - 1, 0, numNodesPerElement))
-        cellsArray = np.concatenate(cells).astype(np.int_)
-        mesh = pv.PolyData(points, cellsArray)
-        mesh.point_data['Von mises Stress'] = svms
-        mesh.point_data['Forces'] = forces
-        vtk_file_path = os.path.join(output_folder, 'combined_data.vtk')
-        mesh.save(vtk_file_path)
-    
-    gmsh.finalize()
-
-    if export_von_mises:
-        tolerance = 1e-4
-        results_list = []
-        max_von_mises_stress = combinedData['Von mises Stress'].max()
-        max_von_mises_stress_row = combinedData.loc[combinedData['Von mises Stress'].idxmax()]
-        max_von_mises_stress_coords = max_von_mises_stress_row[['X', 'Y', 'Z']].values
-        min_von_mises_stress = combinedData['Von mises Stress'].min()
-        average_von_mises_stress = combinedData['Von mises Stress'].mean()
-        results_list.append({
-            'Value': 'Maximum',
-            'Von mises Stress': max_von_mises_stress,
-            'Coordinate X': max_von_mises_stress_coords[0],
-            'Coordinate Y': max_von_mises_stress_coords[1],
-            'Coordinate Z': max_von_mises_stress_coords[2]
-        })
-        results_list.append({'Value': 'Minimum', 'Von mises Stress': min_von_mises_stress})
-        results_list.append({'Value': 'Average', 'Von mises Stress': average_von_mises_stress})
-
-        combinedData2 = combinedData.sort_values(by='Von mises Stress', ascending=False)
-        num_nodes = len(combinedData2)
-        num_nodes_to_exclude = int(num_nodes * 0.02)
-        combinedData2 = combinedData2.iloc[num_nodes_to_exclude:]
-        average_von_mises_stress2 = combinedData2['Von mises Stress'].mean()
-        results_list.append({'Value': 'Average (excluding 2% highest)', 'Von mises Stress': average_von_mises_stress2})
-
-        found_areas_of_interest = False
-        area_von_mises_stress = {}
-        with open(selected_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if found_areas_of_interest and line.startswith("#"):
-                    try:
-                        name, coordinates_str = line.strip("#").strip().split(":")
-                        coordinates_list = json.loads(coordinates_str)
-                        von_mises_stresses = []
-                        for coord_group in coordinates_list:
-                            coordinates = [float(str(coord).strip()) for coord in coord_group]
-                            x, y, z = coordinates
-                            matching_rows = combinedData[
-                                (abs(combinedData['X'] - x) < tolerance) &
-                                (abs(combinedData['Y'] - y) < tolerance) &
-                                (abs(combinedData['Z'] - z) < tolerance)
-                            ]
-                            if not matching_rows.empty:
-                                von_mises_stress = matching_rows['Von mises Stress'].mean()
-                                von_mises_stresses.append(von_mises_stress)
-                            else:
-                                print(f"Coordinates ({x}, {y}, {z}) not found in combinedData.")
-                        if von_mises_stresses:
-                            area_von_mises_stress[name.strip()] = (np.mean(von_mises_stresses), len(von_mises_stresses))
-                    except Exception as e:
-                        print(f"Error processing coordinates: {e}")
-                elif "# Areas of interest" in line:
-                    found_areas_of_interest = True
-        for name, data in area_von_mises_stress.items():
-            average_von_mises_stress, num_elements = data
-            results_list.append({
-                'Value': name,
-                'Von mises Stress': average_von_mises_stress,
-                'Coordinate X': None,
-                'Coordinate Y': None,
-                'Coordinate Z': None,
-                'Number of nodes': num_elements
-            })
-
-        fixations_found = False
-        accumulating = False
-        json_string = ""
-        with open(selected_file, 'r', encoding='utf-8') as f:
-            accumulating = False
-            json_string = ''
-            previous_line = ''
-            for line in f:
-                if 'p[' in line and 'fixations' in line:
-                    accumulating = True
-                    json_string = '{"fixations":' + line.split('fixations')[1].split('] = ')[1].strip()
-                elif accumulating:
-                    if line.strip().startswith('p') and previous_line.strip().endswith(']'):
-                        json_string += previous_line.strip() + "}"
-                        json_string = json_string[:-3] + "]}"
-
-                        accumulating = False
-                        try:
-                            fixations = json.loads(json_string.replace("'", '"'))
-                            fixations_found = True
-                            for fixation in fixations['fixations']:
-                                x, y, z = fixation['nodes'][0]
-                                matching_rows = combinedData[
-                                    (abs(combinedData['X'] - x) < tolerance) &
-                                    (abs(combinedData['Y'] - y) < tolerance) &
-                                    (abs(combinedData['Z'] - z) < tolerance)
-                                ]
-                                if not matching_rows.empty():
-                                    row = matching_rows.iloc[0]
-                                    fx, fy, fz = row[['Fx', 'Fy', 'Fz']].values
-                                    fixation['forces'] = [fx, fy, fz]
-                                    results_list.append({
-                                        'Value': fixation['name'],
-                                        'Von mises Stress': None,
-                                        'Coordinate X': x,
-                                        'Coordinate Y': y,
-                                        'Coordinate Z': z,
-                                        'Fx': fx,
-                                        'Fy': fy,
-                                        'Fz': fz
-                                    })
-                                else:
-                                    print(f"Node ({x}, {y}, {z}) not found in combinedData.")
-                        except json.JSONDecodeError as e:
-                            print("Error decoding JSON from accumulated string: Fixations not found. Be sure you are using python files for Fossils v1.3")
-                        json_string = ""
-                    else:
-                        json_string += line.strip()
-                        previous_line = line
-        if not fixations_found:
-            print("No fixations found")
-        results_df = pd.DataFrame(results_list)
-        pd.set_option('display.max_rows', None)
-        pd.set_option('display.max_columns', None)
-        pd.set_option('display.width', None)
-        pd.set_option('display.max_colwidth', None)
-        print("Results:")
-        print(results_df)
-        results_df.to_csv(os.path.join(output_folder, 'von_mises_stress_results.csv'), index=False)
-        print(f"Results saved to {os.path.join(output_folder, 'von_mises_stress_results.csv')}")
+def process_file(selected_file, export_von_mises, export_smooth_stress, export_vtk, export_columnar=False,
+                 vtk_format=VTU_FORMAT, vtk_compression=DEFAULT_VTU_COMPRESSION, force=False, streaming=False,
+                 chunk_size=DEFAULT_CHUNK_SIZE, trimmed_percents=DEFAULT_TRIMMED_PERCENTS,
+                 percentiles=DEFAULT_PERCENTILES):
+    """Convert the Fossils output of one script with the engine's pipeline; False when it failed"""
+    # Imported here: --help and --serve-postprocess do not need the MSH pipeline yet
+    from engine.postprocess import process_fossils_output
+    return process_fossils_output(selected_file, export_von_mises, export_smooth_stress, export_vtk, export_columnar,
+                                  vtk_format, force, streaming=streaming, chunk_size=chunk_size,
+                                  vtk_compression=vtk_compression, trimmed_percents=trimmed_percents,
+                                  percentiles=percentiles)
 
 def main():
     parser = argparse.ArgumentParser(description="Process Python files and convert MSH to CSV and VTK.")
-    parser.add_argument("directory", help="Directory containing the Python files.")
-    parser.add_argument("files", nargs='+', help="List of Python files to process.")
+    parser.add_argument("directory", nargs='?', help="Directory containing the Python files.")
+    parser.add_argument("files", nargs='*', help="List of Python files to process.")
     parser.add_argument("--export-von-mises", action='store_true', help="Export Von mises stress results.")
     parser.add_argument("--export-smooth-stress", action='store_true', help="Export smooth stress tensor to CSV.")
     parser.add_argument("--export-vtk", action='store_true', help="Export combined data to VTK.")
+    parser.add_argument("--legacy-vtk", action='store_true', help="Write legacy combined_data.vtk instead of combined_data.vtu.")
+    parser.add_argument("--vtk-compression", choices=VTU_COMPRESSORS, default=DEFAULT_VTU_COMPRESSION, help="Compression of the .vtu appended data.")
+    parser.add_argument("--force", action='store_true', help="Reprocess files even if their outputs are up to date.")
+    parser.add_argument("--streaming", action='store_true', help="Process results in chunks with bounded memory (large meshes).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Nodes per chunk in streaming mode.")
+    parser.add_argument("--trimmed-means", type=parse_number_list, default=DEFAULT_TRIMMED_PERCENTS,
+                        help="Comma-separated percentages of highest stresses to exclude from trimmed means (default: 1,2,5).")
+    parser.add_argument("--percentiles", type=parse_number_list, default=DEFAULT_PERCENTILES,
+                        help="Comma-separated stress percentiles for the summary (default: 50,95,99).")
+    parser.add_argument("--export-columnar", action='store_true', help="Export results to Parquet (or NPZ without pyarrow).")
+    parser.add_argument(SERVE_FLAG, action='store_true', help="Run as a persistent post-processing worker for the GUI.")
     args = parser.parse_args()
 
+    if args.serve_postprocess:
+        serve_worker()
+        return
+    if not args.directory or not args.files:
+        parser.error("the following arguments are required: directory, files")
+    if args.streaming and args.legacy_vtk:
+        parser.error("--legacy-vtk cannot be combined with --streaming, which writes .vtu files")
+
     selected_files = [os.path.join(args.directory, file) for file in args.files]
     export_von_mises = args.export_von_mises
     export_smooth_stress = args.export_smooth_stress
     export_vtk = args.export_vtk
+    export_columnar = args.export_columnar
+    vtk_format = LEGACY_FORMAT if args.legacy_vtk else VTU_FORMAT
 
+    failed = 0
     for selected_file in selected_files:
-        process_file(selected_file, export_von_mises, export_smooth_stress, export_vtk)
+        if not process_file(selected_file, export_von_mises, export_smooth_stress, export_vtk, export_columnar,
+                            vtk_format, args.vtk_compression, args.force, args.streaming, args.chunk_size,
+                            args.trimmed_means, args.percentiles):
+            failed += 1
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""Startup time of the GUI/CLI engine, the converter and a post-processing worker
+
+Every case runs in fresh interpreters, once as the code now imports
+(heavy libraries on first use) and once with the heavy libraries imported
+up front, as the modules used to. Example:
+
+    python benchmark_startup.py --runs 10
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Libraries the modules used to import at load time
+HEAVY_MODULES = ('pandas', 'pyvista', 'gmsh', 'scipy.spatial', 'pyarrow', 'requests', 'lz4')
+
+CASES = {
+    # What main.py imports before creating the window, and `main.py run`
+    'gui/cli': "import engine.cli, engine.selection, engine.scanner, engine.joblog",
+    'converter': "import runpy, sys; sys.argv = ['Convert_to_csv.py', '--help']\n"
+                 "try:\n    runpy.run_path('Convert_to_csv.py', run_name='__main__')\nexcept SystemExit:\n    pass",
+    'worker': "import engine.postprocess, engine.msh_reader",
+}
+
+PROBE = """
+import sys, time, json, io, contextlib
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+{eager}
+{code}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+EAGER = """    for name in {heavy!r}:
+        try:
+            __import__(name)
+        except Exception:
+            pass
+"""
+
+
+def indent(code):
+    return "\n".join("    " + line for line in code.splitlines())
+
+
+def run_case(code, eager):
+    """(import seconds, process seconds, heavy modules loaded) of one fresh interpreter"""
+    probe = PROBE.format(eager=EAGER.format(heavy=HEAVY_MODULES) if eager else "", code=indent(code),
+                         heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", probe], cwd=HERE, capture_output=True, text=True)
+    process_seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "probe failed")
+    answer = json.loads(result.stdout.strip().splitlines()[-1])
+    return answer['seconds'], process_seconds, answer['loaded']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per case (median reported).")
+    parser.add_argument("cases", nargs='*', help=f"Cases to run: {', '.join(CASES)} (default: all).")
+    args = parser.parse_args()
+    names = args.cases or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case: {', '.join(unknown)}")
+
+    print(f"{'case':<10} {'mode':<6} {'imports':>9} {'process':>9}  heavy modules loaded")
+    for name in names:
+        for eager in (True, False):
+            # One untimed run warms the disk cache
+            run_case(CASES[name], eager)
+            runs = [run_case(CASES[name], eager) for _ in range(max(1, args.runs))]
+            imports = statistics.median(run[0] for run in runs)
+            process = statistics.median(run[1] for run in runs)
+            loaded = ", ".join(runs[-1][2]) or "-"
+            print(f"{name:<10} {'eager' if eager else 'lazy':<6} {imports * 1000:7.0f} ms {process * 1000:7.0f} ms  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Headless Fossils pipeline shared by the GUI and the command line
+
+main.py is a thin client over this package; the same batches run without a
+display through `msh2vtk run` (python main.py run ... or python -m engine run ...).
+"""
+from .batch import FossilsBatch
+from .config import load_config, save_config, CONFIG_FILE
@@ -0,0 +1,983 @@
+import os
+import time
+import datetime
+import threading
+import sqlite3
+import subprocess
+from . import telegram
+from .ledger import QUEUED, SOLVING, POST_PROCESSING, DONE, FAILED
+from .scheduler import AdmissionController, RuntimeModel, estimate_makespan, process_tree_usage
+from .postprocess_pool import get_postprocess_pool, DEFAULT_POSTPROCESS_WORKERS, DEFAULT_POSTPROCESS_TIMEOUT
+from .processes import kill_process_tree, session_kwargs
+from .joblog import JobOutput, job_log_path, move_job_logs
+from .metrics import METRICS_FILE, append_metrics, throughput, format_throughput
+from .events import EventBus, STATUS, JOB, FINISHED
+from .executor import WorkerPool
+from .remote import RemoteWorker, RemoteError, REMOTE_POLL_INTERVAL, REMOTE_LOST_TIMEOUT
+from .workspace import rename_workspace_folder, find_output_folder
+from .paths import data_path
+
+# Seconds between admission retries while the queue waits for resources
+RECHECK_INTERVAL = 5.0
+
+# Seconds between timeout/watchdog checks of a running solver
+WATCHDOG_INTERVAL = 1.0
+
+# Defaults of the per-job limits (0 disables a limit)
+DEFAULT_JOB_TIMEOUT = 0                # wall-clock seconds per Fossils run
+DEFAULT_IDLE_TIMEOUT = 30 * 60         # seconds without any solver output
+DEFAULT_MAX_RETRIES = 1                # extra attempts after a transient failure
+DEFAULT_RETRY_BACKOFF = 30             # seconds before the first retry, doubled for each next one
+MAX_RETRY_DELAY = 30 * 60
+
+# Job states within a batch; the ledger records retry waits as queued and cancellations as failed
+RETRY_WAIT = "retry-wait"
+CANCELLED = "cancelled"
+JOB_STATES = (QUEUED, SOLVING, RETRY_WAIT, POST_PROCESSING, DONE, FAILED, CANCELLED)
+FINAL_STATES = (DONE, FAILED, CANCELLED)
+TRANSITIONS = {
+    QUEUED: (SOLVING, CANCELLED),
+    SOLVING: (QUEUED, POST_PROCESSING, RETRY_WAIT, FAILED, CANCELLED),
+    RETRY_WAIT: (QUEUED, CANCELLED),
+    POST_PROCESSING: (DONE, FAILED, CANCELLED),
+}
+
+# Levels passed to on_status along with the status text
+RUNNING = "running"
+SUCCESS = "success"
+ERROR = "error"
+
+
+def _format_duration(seconds):
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    hours, minutes = divmod(int(round(seconds / 60)), 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m"
+
+
+def _clock():
+    return datetime.datetime.now().strftime('%H:%M:%S')
+
+
+class FossilsBatch:
+    """Queue of Fossils jobs solved under an AdmissionController, then post-processed
+
+    Every job follows the TRANSITIONS state machine, changed only under the
+    batch lock. Progress goes to stdout, Telegram and the `events` bus (STATUS,
+    JOB and FINISHED); with a JobLedger every state change is persisted so an
+    interrupted batch can be resumed. remote_workers (`msh2vtk worker` agents,
+    host:port) add slots besides the max_jobs local ones.
+    """
+
+    def __init__(self, fossils_path, max_jobs=1, resource_aware=True, postprocess_options=None,
+                 postprocess_workers=DEFAULT_POSTPROCESS_WORKERS, on_status=None, on_finished=None, ledger=None,
+                 job_timeout=DEFAULT_JOB_TIMEOUT, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 retry_backoff=DEFAULT_RETRY_BACKOFF, longest_first=True, metrics_path=None,
+                 remote_workers=(), remote_token="", postprocess_timeout=DEFAULT_POSTPROCESS_TIMEOUT):
+        self.fossils_path = fossils_path
+        self.remote_workers = list(remote_workers)
+        self.remote_token = remote_token
+        self.max_jobs = max(0 if self.remote_workers else 1, int(max_jobs))
+        self.resource_aware = resource_aware
+        self.postprocess_options = postprocess_options
+        self.postprocess_workers = postprocess_workers
+        self.postprocess_timeout = postprocess_timeout
+        self.events = EventBus()
+        if on_status is not None:
+            self.events.subscribe(lambda event: on_status(event.data['text'], event.data['level']), (STATUS,))
+        if on_finished is not None:
+            self.events.subscribe(lambda event: on_finished(event.data['batch']), (FINISHED,))
+        self.ledger = ledger
+        self.batch_id = None  # Ledger batch id
+        self.job_timeout = job_timeout
+        self.idle_timeout = idle_timeout
+        self.max_retries = max(0, int(max_retries))
+        self.retry_backoff = retry_backoff
+        self.longest_first = longest_first
+        self.metrics_path = metrics_path if metrics_path is not None else data_path(METRICS_FILE)
+
+        self.queue = []  # Queued files, in start order
+        self.states = {}  # file -> job state (JOB_STATES)
+        self.processes = {}  # file -> Popen of the running solves
+        self.results = {}  # file -> True when Fossils and post-processing succeeded (final states only)
+        self.scheduler = None
+        self.runtime_model = None
+        self.predictions = {}  # file -> (features, predicted solve seconds)
+        self.metrics = {}  # file -> timings and usage of the job so far
+        self.metric_records = []  # job_metrics.jsonl records of the finished jobs
+        self.started_at = None
+        self.cancelled = False
+        self._finished = True
+        self._recheck_timer = None
+        self._retry_timers = {}  # file -> Timer putting it back in the queue
+        self._attempts = {}
+        self._postprocess_jobs = {}  # file -> PostProcessJob waiting in or running on the pool
+        self._solvers = None  # WorkerPool running the solves
+        self._finishers = None  # WorkerPool renaming and post-processing solved jobs
+        self.workers = []  # RemoteWorker of each remote worker agent
+        self._remote = None  # WorkerPool following the remote jobs
+        self._remote_jobs = {}  # file -> start time of the jobs running on remote workers
+        self.outputs = {}  # file -> JobOutput of the running solves (live tail and progress)
+        self._lock = threading.RLock()
+        self._done = threading.Event()
+        self._done.set()
+
+    @property
+    def succeeded(self):
+        """True when every job of the batch finished successfully"""
+        return not self.cancelled and bool(self.results) and all(self.results.values())
+
+    @classmethod
+    def from_ledger(cls, ledger, batch, **callbacks):
+        """Batch with the settings recorded for a ledger batch"""
+        settings = batch['settings']
+        return cls(batch['fossils_path'], max_jobs=settings['max_jobs'], resource_aware=settings['resource_aware'],
+                   postprocess_options=settings['postprocess_options'],
+                   postprocess_workers=settings['postprocess_workers'], ledger=ledger,
+                   postprocess_timeout=settings.get('postprocess_timeout', DEFAULT_POSTPROCESS_TIMEOUT),
+                   job_timeout=settings.get('job_timeout', DEFAULT_JOB_TIMEOUT),
+                   idle_timeout=settings.get('idle_timeout', DEFAULT_IDLE_TIMEOUT),
+                   max_retries=settings.get('max_retries', DEFAULT_MAX_RETRIES),
+                   retry_backoff=settings.get('retry_backoff', DEFAULT_RETRY_BACKOFF),
+                   longest_first=settings.get('longest_first', True),
+                   remote_workers=settings.get('remote_workers', ()), **callbacks)
+
+    def settings(self):
+        """Settings stored in the ledger to resume the batch later"""
+        return {
+            'max_jobs': self.max_jobs,
+            'resource_aware': self.resource_aware,
+            'postprocess_options': self.postprocess_options,
+            'postprocess_workers': self.postprocess_workers,
+            'postprocess_timeout': self.postprocess_timeout,
+            'job_timeout': self.job_timeout,
+            'idle_timeout': self.idle_timeout,
+            'max_retries': self.max_retries,
+            'retry_backoff': self.retry_backoff,
+            'longest_first': self.longest_first,
+            'remote_workers': self.remote_workers,
+        }
+
+    def remote_settings(self):
+        """Settings sent with every remote job"""
+        return {
+            'postprocess_options': self.postprocess_options,
+            'postprocess_timeout': self.postprocess_timeout,
+            'job_timeout': self.job_timeout,
+            'idle_timeout': self.idle_timeout,
+            'max_retries': self.max_retries,
+            'retry_backoff': self.retry_backoff,
+        }
+
+    def resume(self, batch_id):
+        """Continue the unfinished jobs of a ledger batch
+
+        Jobs that were queued or solving are solved again; jobs whose solve had
+        already finished only repeat post-processing.
+        """
+        jobs = self.ledger.unfinished_jobs(batch_id)
+        to_solve = [job['file'] for job in jobs if job['state'] != POST_PROCESSING]
+        to_post_process = [job['file'] for job in jobs if job['state'] == POST_PROCESSING]
+        print(f"♻️  Resuming batch {batch_id}: {len(to_solve)} to solve, {len(to_post_process)} to post-process")
+        for file in to_solve:
+            self._record(file, state=QUEUED, batch_id=batch_id)
+        self.start(to_solve, post_process_only=to_post_process, batch_id=batch_id)
+
+    def start(self, files, post_process_only=(), batch_id=None):
+        """Queue the files and start as many as the limit and the available resources allow
+
+        post_process_only lists files already solved (resumed batches) that only
+        need post-processing. Returns at once: connecting the remote workers and
+        predicting the solve times (which reads every script and its STLs) run
+        on a background thread, and the batch reports its start with a STATUS event.
+        """
+        files = list(files)
+        post_process_only = list(post_process_only)
+        if self.ledger is not None and batch_id is None:
+            try:
+                batch_id = self.ledger.create_batch(files, self.fossils_path, self.settings())
+            except sqlite3.Error as e:
+                print(f"⚠️  Job ledger unavailable, this batch will not be resumable: {e}")
+        self.batch_id = batch_id
+
+        with self._lock:
+            # The jobs can be cancelled while the batch is being prepared
+            self.queue = list(files)
+            self.states = {file: QUEUED for file in files}
+            self.states.update({file: POST_PROCESSING for file in post_process_only})
+            self.results = {}
+            self._attempts = {}
+            self.cancelled = False
+            self._finished = False
+            self.workers = []
+            self.scheduler = None
+            self.predictions = {}
+            self._done.clear()
+            self.started_at = time.time()
+            self.metrics = {file: {'queued_at': self.started_at} for file in files + post_process_only}
+            self.metric_records = []
+        self._status(f"🔄 Preparing Fossils ({len(files) + len(post_process_only)} files)...", RUNNING, counts=False)
+        threading.Thread(target=self._launch, args=(files, post_process_only), name="fossils-start",
+                         daemon=True).start()
+
+    def _prepare(self, files):
+        """Connect the remote workers and predict the solve time of every file"""
+        workers = [RemoteWorker(address, self.remote_token) for address in self.remote_workers]
+        remote_slots = sum(worker.slots for worker in workers if worker.connect())
+        max_jobs = self.max_jobs
+        if max_jobs == 0 and not remote_slots:
+            print("⚠️  No remote worker available: running the jobs locally")
+            max_jobs = 1
+        scheduler = AdmissionController(max_jobs, resource_aware=self.resource_aware)
+        runtime_model = RuntimeModel()
+        predictions = {}
+        for file in files:
+            features = runtime_model.features(file, scheduler.estimate(file)['elements'])
+            predictions[file] = (features, runtime_model.predict(features))
+        return workers, remote_slots, max_jobs, scheduler, runtime_model, predictions
+
+    def _launch(self, files, post_process_only):
+        """Prepare the batch and start the first jobs (thread started by start())"""
+        try:
+            workers, remote_slots, max_jobs, scheduler, runtime_model, predictions = self._prepare(files)
+        except Exception as e:
+            print(f"❌ Could not prepare the Fossils batch: {e}")
+            self.cancel()
+
+        with self._lock:
+            cancelled = self.cancelled
+            if not cancelled:
+                self.max_jobs = max_jobs
+                self._solvers = WorkerPool(self.max_jobs, "fossils-solver")
+                self._finishers = WorkerPool(self.postprocess_workers, "fossils-finish")
+                self.workers = workers
+                self._remote = WorkerPool(remote_slots, "fossils-remote")
+                self._remote_jobs = {}
+                self.scheduler = scheduler
+                self.runtime_model = runtime_model
+                self.predictions = predictions
+                if self.longest_first:
+                    # LPT: longest predicted solves first keeps the makespan short
+                    self.queue.sort(key=lambda file: self.predictions[file][1], reverse=True)
+        if cancelled:
+            # cancel() dropped the queue; the resumed post-processing never started
+            for file in post_process_only:
+                self._end_job(file, CANCELLED)
+            return
+
+        remote_text = f" and {remote_slots} remote slots" if remote_slots else ""
+        print(f"🚀 Starting Fossils execution for {len(self.queue)} files with max {self.max_jobs} parallel processes{remote_text}")
+        for file in self.queue:
+            print(f"📐 {os.path.basename(file)}: {self.scheduler.describe(file)}, "
+                  f"~{_format_duration(self.predictions[file][1])} predicted")
+        eta = self.eta()
+        self._status(f"🔄 Starting Fossils ({len(self.queue)} files, max {self.slots()} parallel"
+                     f"{f', ETA ~{_format_duration(eta)}' if eta else ''})...", RUNNING, counts=False)
+
+        # Send start notification to Telegram
+        if telegram.TELEGRAM_ENABLED:
+            start_message = f"🚀 <b>MSH2VTK - Starting Fossils Execution</b>\n📁 {len(self.queue)} files\n⚙️ Max parallel: {self.max_jobs}\n🕐 {_clock()}"
+            telegram.send_telegram_message(start_message)
+
+        for file in post_process_only:
+            self._finishers.submit(self._finish_job, file)
+        if not self.queue and not post_process_only:
+            self._finish()
+            return
+        self.start_next()
+
+    def live_outputs(self):
+        """(file, JobOutput) of every running solve, for live views"""
+        with self._lock:
+            return list(self.outputs.items())
+
+    def slots(self):
+        """Jobs that can solve at once: local slots plus the slots of the connected remote workers"""
+        return self.max_jobs + sum(worker.slots for worker in self.workers)
+
+    def eta(self):
+        """Predicted seconds until every queued and running solve finishes, or None"""
+        with self._lock:
+            if self.scheduler is None or not self.predictions:
+                return None
+            now = time.time()
+            started = [(file, job['start']) for file, job in list(self.scheduler.running.items())]
+            started += list(self._remote_jobs.items())
+            remaining = [max(0.0, self.predictions[file][1] - (now - start))
+                         for file, start in started if file in self.predictions]
+            waiting = list(self._retry_timers) + self.queue
+            predicted = [self.predictions[file][1] for file in waiting if file in self.predictions]
+        if not remaining and not predicted:
+            return None
+        return estimate_makespan(remaining, predicted, self.slots())
+
+    def wait(self, timeout=None):
+        """Block until every job has finished; return False on timeout"""
+        return self._done.wait(timeout)
+
+    def is_running(self):
+        return not self._done.is_set()
+
+    def start_next(self):
+        """Start queued processes while the admission controller finds room for them"""
+        with self._lock:
+            if self.scheduler is None or self.cancelled:
+                return
+
+            while self.queue:
+                worker = next((worker for worker in self.workers if worker.is_free()), None)
+                if worker is not None:
+                    next_file = self.queue.pop(0)
+                    worker.active += 1
+                    self._set_state(next_file, SOLVING)
+                    print(f"🌐 Sending {os.path.basename(next_file)} to remote worker {worker.name}")
+                    self._remote.submit(self.run_remote, next_file, worker)
+                    continue
+                if any(worker.active < worker.slots for worker in self.workers):
+                    # A remote worker is offline for a while: look again later
+                    self._schedule_recheck()
+                if not self.max_jobs:
+                    return
+
+                index, reason = self.scheduler.select(self.queue)
+                if index is None:
+                    # Waiting for resources (not for a free slot): check again later
+                    if self.scheduler.running_count() < self.scheduler.max_jobs and self._recheck_timer is None:
+                        print(f"⏳ Waiting for resources: {reason}")
+                        self._schedule_recheck()
+                    return
+
+                next_file = self.queue.pop(index)
+                self._set_state(next_file, SOLVING)
+                self.scheduler.job_started(next_file)
+                print(f"🔄 Starting next queued process for: {os.path.basename(next_file)} ({self.scheduler.describe(next_file)})")
+                self._solvers.submit(self.run_fossils, next_file)
+
+    def _schedule_recheck(self):
+        if self._recheck_timer is None:
+            self._recheck_timer = threading.Timer(RECHECK_INTERVAL, self._recheck)
+            self._recheck_timer.daemon = True
+            self._recheck_timer.start()
+
+    def _recheck(self):
+        with self._lock:
+            self._recheck_timer = None
+        self.start_next()
+
+    def cancel(self):
+        """Cancel the queued jobs and the retry waits, and kill the running Fossils process trees
+
+        Each running solve is killed with its process tree by its own worker
+        within WATCHDOG_INTERVAL; running post-processing workers are killed.
+        """
+        with self._lock:
+            self.cancelled = True
+            if self._recheck_timer is not None:
+                self._recheck_timer.cancel()
+                self._recheck_timer = None
+            running = sum(1 for state in self.states.values() if state == SOLVING)
+            dropped = self.queue + list(self._retry_timers)
+            for timer in self._retry_timers.values():
+                timer.cancel()
+            self._retry_timers.clear()
+            self.queue = []
+            for file in dropped:
+                self._set_state(file, CANCELLED)
+            postprocess_jobs = list(self._postprocess_jobs.values())
+        self._record(None, error="cancelled")
+
+        # Post-processing that has not started yet is dropped, running workers are killed
+        for job in postprocess_jobs:
+            job.cancel()
+        if running:
+            # The solver workers notice the cancellation and kill their process trees
+            print(f"🛑 Cancelling {running} running Fossils processes")
+        if dropped:
+            print(f"🛑 Cleared {len(dropped)} queued files")
+
+        # Send cancellation notification to Telegram
+        if telegram.TELEGRAM_ENABLED and (running or dropped):
+            message = f"🛑 <b>Fossils Execution Cancelled</b>\n🕐 {_clock()}"
+            telegram.send_telegram_message(message)
+
+        self._status("🛑 Fossils execution cancelled", ERROR, counts=False)
+        self._check_finished()
+
+    def run_fossils(self, file):
+        """Solve one file (on a solver worker); a successful solve is handed to the finishing workers"""
+        name = os.path.basename(file)
+        process = None
+        output = None
+        released = False
+        outcome = FAILED  # state the job moves to when the solve ends
+        error = None
+        execution_time = None
+        with self._lock:
+            attempt = self._attempts[file] = self._attempts.get(file, 0) + 1
+        metrics = self._job_metrics(file)
+
+        try:
+            start_time = time.time()
+            metrics['queue_wait'] = metrics.get('queue_wait', 0.0) + start_time - metrics.pop('queued_at', start_time)
+            metrics['attempts'] = attempt
+            if self.cancelled:
+                # Cancelled between admission and start
+                outcome = CANCELLED
+                return
+            command = [self.fossils_path, file, "--nogui"]
+
+            self._record(file, state=SOLVING)
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                       **session_kwargs())
+            with self._lock:
+                self.processes[file] = process
+            self.scheduler.attach_process(file, process.pid)
+
+            print(f"🔄 Started Fossils process PID: {process.pid} for file: {name}")
+            self._status(f"🔄 Processing: {name}", RUNNING)
+
+            # Stream the solver output to its log while waiting, killing the solver if it hangs or is cancelled
+            output = JobOutput(process, job_log_path(file),
+                               header=f"===== {name} attempt {attempt} started {datetime.datetime.now():%Y-%m-%d %H:%M:%S} =====")
+            with self._lock:
+                self.outputs[file] = output
+            print(f"📄 Solver output of {name}: {output.log.path}")
+            stop_reason = self._watch(process, output, start_time, metrics)
+            stderr = output.join()
+            with self._lock:
+                self.outputs.pop(file, None)
+                self.processes.pop(file, None)
+
+            # The solver's resources are free again: let the next job start while post-processing runs
+            self._release(file, process.returncode == 0 and stop_reason is None)
+            released = True
+
+            execution_time = time.time() - start_time
+            metrics['solve_seconds'] = metrics.get('solve_seconds', 0.0) + execution_time
+            metrics['return_code'] = process.returncode
+
+            if self.cancelled:
+                print(f"🛑 Cancelled: {name}")
+                self._record(file, state=FAILED, finished_at=time.time(), solve_seconds=execution_time,
+                             return_code=process.returncode, error="cancelled")
+                outcome = CANCELLED
+            elif stop_reason is None and process.returncode == 0:
+                print(f"✓ Completed: {name} ({execution_time:.2f}s)")
+                if file in self.predictions:
+                    features, predicted = self.predictions[file]
+                    print(f"⏱️  Predicted {_format_duration(predicted)}, took {_format_duration(execution_time)}")
+                    self.runtime_model.record(features, execution_time)
+                self._record(file, state=POST_PROCESSING, solved_at=time.time(), solve_seconds=execution_time,
+                             return_code=0)
+                outcome = POST_PROCESSING
+            else:
+                if stop_reason is not None:
+                    print(f"⏰ {stop_reason.capitalize()}: {name} (process tree killed)")
+                    error = stop_reason
+                else:
+                    print(f"✗ Error in: {name} (code: {process.returncode})")
+                    if stderr:
+                        print(f"  Error (last lines): {stderr.strip()}")
+                    error = stderr.strip()[-2000:] if stderr else f"exit code {process.returncode}"
+
+                # Hangs and crashes by signal may not happen again; script errors will
+                transient = stop_reason is not None or process.returncode < 0
+                if transient and attempt <= self.max_retries:
+                    outcome = RETRY_WAIT
+                else:
+                    self._record(file, state=FAILED, finished_at=time.time(), solve_seconds=execution_time,
+                                 return_code=process.returncode, error=error)
+                    if stop_reason is not None:
+                        self._status(f"⏰ Timeout: {name}", ERROR)
+                    else:
+                        self._status(f"❌ Error in: {name}", ERROR)
+
+                    # Send error notification to Telegram
+                    if telegram.TELEGRAM_ENABLED:
+                        if stop_reason is not None:
+                            message = f"⏰ <b>Timeout</b>\n📁 {name}\n🕐 {stop_reason}"
+                        else:
+                            message = f"❌ <b>Error in Fossils Analysis</b>\n📁 {name}\n🔢 Code: {process.returncode}"
+                        if attempt > 1:
+                            message += f"\n🔁 {attempt} attempts"
+                        telegram.send_telegram_message(message)
+
+        except Exception as e:
+            print(f"✗ Exception in: {name} - {str(e)}")
+            if process is not None and process.poll() is None:
+                kill_process_tree(process)
+            outcome = FAILED
+            self._record(file, state=FAILED, finished_at=time.time(), error=str(e))
+            self._status(f"💥 Exception: {name}", ERROR)
+
+            # Send exception notification to Telegram
+            if telegram.TELEGRAM_ENABLED:
+                message = f"💥 <b>Exception</b>\n📁 {name}\n⚠️ {str(e)}"
+                telegram.send_telegram_message(message)
+
+        finally:
+            with self._lock:
+                self.outputs.pop(file, None)
+                self.processes.pop(file, None)
+            if not released:
+                self._release(file, False)
+            if outcome == POST_PROCESSING:
+                if self._set_state(file, POST_PROCESSING):
+                    self._finishers.submit(self._finish_job, file, execution_time, output.log)
+            elif outcome == RETRY_WAIT:
+                self._schedule_retry(file, attempt, error)
+            else:
+                self._end_job(file, outcome)
+
+    def _watch(self, process, output, start_time, metrics):
+        """Wait for a solver; kill its process tree on cancellation, timeout or silence and return why (None if it exited)
+
+        The slot goes back to the scheduler as soon as the tree is killed. The
+        memory and CPU time of the solver's process tree are sampled into
+        metrics on every check.
+        """
+        while True:
+            try:
+                process.wait(timeout=WATCHDOG_INTERVAL)
+                return None
+            except subprocess.TimeoutExpired:
+                pass
+
+            rss, cpu_time = process_tree_usage(process.pid)
+            if rss:
+                metrics['solver_peak_rss'] = max(metrics.get('solver_peak_rss') or 0, rss)
+            if cpu_time is not None:
+                metrics['solver_cpu_seconds'] = round(cpu_time, 3)
+
+            now = time.time()
+            if self.cancelled:
+                print(f"🛑 Terminating process tree: {process.pid}")
+                reason = "cancelled"
+            elif self.job_timeout and now - start_time > self.job_timeout:
+                reason = f"timeout after {self.job_timeout / 60:g} min"
+            elif self.idle_timeout and now - output.last_output > self.idle_timeout:
+                reason = f"no output for {self.idle_timeout / 60:g} min"
+            else:
+                continue
+            kill_process_tree(process)
+            process.wait()
+            return reason
+
+    def run_remote(self, file, worker):
+        """Solve one file on a remote worker (on a remote thread) and download its results
+
+        The job is uploaded with its STLs, solved and post-processed on the
+        worker and its output relayed to the local log; the results land in the
+        folder named after the script. A worker that stops answering gets no
+        new jobs for a while and its job is retried.
+        """
+        name = os.path.basename(file)
+        job_id = None
+        output = None
+        outcome = FAILED
+        error = None
+        with self._lock:
+            attempt = self._attempts[file] = self._attempts.get(file, 0) + 1
+        metrics = self._job_metrics(file)
+
+        try:
+            start_time = time.time()
+            metrics['queue_wait'] = metrics.get('queue_wait', 0.0) + start_time - metrics.pop('queued_at', start_time)
+            metrics['attempts'] = attempt
+            metrics['worker'] = worker.name
+            if self.cancelled:
+                outcome = CANCELLED
+                return
+
+            try:
+                job_id = worker.submit(file, self.remote_settings())
+            except RemoteError as e:
+                if e.status != 503:
+                    raise
+                # Busy with the jobs of another coordinator: not an attempt, try elsewhere or later
+                print(f"⏳ {worker.name} is busy, {name} goes back to the queue")
+                worker.set_offline()
+                with self._lock:
+                    self._attempts[file] -= 1
+                outcome = QUEUED
+                return
+            self._record(file, state=SOLVING)
+            with self._lock:
+                self._remote_jobs[file] = start_time
+            print(f"🌐 {name} running on {worker.name} (job {job_id})")
+            self._status(f"🌐 Processing on {worker.name}: {name}", RUNNING)
+
+            # Relay the solver output to the local log and live view
+            output = JobOutput(None, job_log_path(file),
+                               header=f"===== {name} attempt {attempt} on {worker.name} started {datetime.datetime.now():%Y-%m-%d %H:%M:%S} =====")
+            with self._lock:
+                self.outputs[file] = output
+            status = self._follow_remote(worker, job_id, output)
+            output.join()
+            execution_time = time.time() - start_time
+            with self._lock:
+                self.outputs.pop(file, None)
+                self._remote_jobs.pop(file, None)
+
+            if status is None:
+                print(f"🛑 Cancelled: {name}")
+                self._record(file, state=FAILED, finished_at=time.time(), error="cancelled")
+                outcome = CANCELLED
+                return
+            # Timings measured on the worker (its own queue wait aside)
+            metrics.update({key: value for key, value in status['metrics'].items()
+                            if key not in ('type', 'batch_id', 'file', 'name', 'success', 'finished_at',
+                                           'queue_wait', 'attempts')})
+            if not status['success']:
+                error = status['error'] or "failed on the remote worker"
+                print(f"✗ Error in: {name} ({error})")
+                try:
+                    # The complete solver log
+                    worker.download(job_id, os.path.splitext(file)[0])
+                except (RemoteError, OSError, ValueError) as e:
+                    print(f"⚠️  Could not download the solver log of {name}: {e}")
+                self._record(file, state=FAILED, finished_at=time.time(), solve_seconds=execution_time, error=error)
+                self._status(f"❌ Error in: {name}", ERROR)
+                if telegram.TELEGRAM_ENABLED:
+                    telegram.send_telegram_message(f"❌ <b>Error in Fossils Analysis</b>\n📁 {name}\n🌐 {error}")
+                return
+
+            if not self._set_state(file, POST_PROCESSING):
+                outcome = CANCELLED
+                return
+            self._record(file, state=POST_PROCESSING, solved_at=time.time(), solve_seconds=execution_time,
+                         return_code=0)
+            download_start = time.time()
+            output_folder = os.path.splitext(file)[0]
+            count = worker.download(job_id, output_folder)
+            metrics['download_seconds'] = time.time() - download_start
+            print(f"📥 {count} result files of {name} downloaded from {worker.name} into {output_folder}")
+            self._record(file, state=DONE, finished_at=time.time(), output_folder=output_folder)
+            self._status(f"✅ Completed on {worker.name}: {name}", SUCCESS)
+            self._notify_completed(name, execution_time, True)
+            outcome = DONE
+
+        except (RemoteError, OSError, ValueError) as e:
+            # The worker is gone or sent something unusable: another slot may do better
+            print(f"⚠️  Remote job {name} on {worker.name} failed: {e}")
+            worker.set_offline()
+            error = str(e)
+            if self.states.get(file) == SOLVING and attempt <= self.max_retries:
+                outcome = RETRY_WAIT
+            else:
+                self._record(file, state=FAILED, finished_at=time.time(), error=error)
+                self._status(f"💥 Remote worker failed: {name}", ERROR)
+                if telegram.TELEGRAM_ENABLED:
+                    telegram.send_telegram_message(f"💥 <b>Remote worker failed</b>\n📁 {name}\n⚠️ {error}")
+
+        finally:
+            if output is not None:
+                output.join()
+            with self._lock:
+                self.outputs.pop(file, None)
+                self._remote_jobs.pop(file, None)
+                worker.active -= 1
+            if job_id is not None and outcome != RETRY_WAIT:
+                # Deletes the job and its files on the worker
+                worker.cancel(job_id)
+            if outcome == QUEUED:
+                with self._lock:
+                    if self._set_state(file, QUEUED):
+                        self.queue.insert(0, file)
+                        metrics['queued_at'] = time.time()
+                self._record(file, state=QUEUED)
+            elif outcome == RETRY_WAIT:
+                self._schedule_retry(file, attempt, error)
+            else:
+                self._end_job(file, outcome)
+            self.start_next()
+
+    def _follow_remote(self, worker, job_id, output):
+        """Relay the output of a remote job until it finishes; return its last status (None if cancelled)
+
+        Raises RemoteError when the worker has not answered for REMOTE_LOST_TIMEOUT.
+        """
+        seen = 0
+        last_answer = time.time()
+        while True:
+            if self.cancelled:
+                worker.cancel(job_id)
+                return None
+            try:
+                status = worker.poll(job_id, seen)
+            except RemoteError as e:
+                if e.status == 404 or time.time() - last_answer > REMOTE_LOST_TIMEOUT:
+                    raise
+                time.sleep(REMOTE_POLL_INTERVAL)
+                continue
+            last_answer = time.time()
+            for line in status['lines']:
+                output.feed(line)
+            seen = status['seen']
+            if status['finished']:
+                return status
+            time.sleep(REMOTE_POLL_INTERVAL)
+
+    def _schedule_retry(self, file, attempt, reason):
+        """Put a job back in the queue after an exponential backoff"""
+        name = os.path.basename(file)
+        delay = min(self.retry_backoff * 2 ** (attempt - 1), MAX_RETRY_DELAY)
+        timer = threading.Timer(delay, self._requeue, args=(file,))
+        timer.daemon = True
+        with self._lock:
+            if self.cancelled or not self._set_state(file, RETRY_WAIT):
+                cancelled = True
+            else:
+                cancelled = False
+                self._retry_timers[file] = timer
+                timer.start()
+        if cancelled:
+            self._record(file, state=FAILED, finished_at=time.time(), error="cancelled")
+            self._end_job(file, CANCELLED)
+            return
+        print(f"🔁 Retrying {name} in {delay:g}s (attempt {attempt + 1}/{self.max_retries + 1})")
+        self._record(file, state=QUEUED, error=reason)
+        self._status(f"🔁 Retry scheduled: {name}", RUNNING)
+
+    def _requeue(self, file):
+        with self._lock:
+            if self._retry_timers.pop(file, None) is None or not self._set_state(file, QUEUED):
+                # Cancelled meanwhile
+                return
+            self.queue.insert(0, file)
+            self._job_metrics(file)['queued_at'] = time.time()
+        self.start_next()
+
+    def _complete_job(self, file, execution_time=None, log=None):
+        """Rename the workspace of a solved file and post-process it; return True on success"""
+        name = os.path.basename(file)
+
+        # Rename workspace folder to match the Python file name
+        print(f"🔄 Renaming workspace folder for: {name}")
+        rename_start = time.time()
+        renamed = rename_workspace_folder(file)
+        metrics = self._job_metrics(file)
+        metrics['rename_seconds'] = time.time() - rename_start
+        if renamed:
+            print(f"✅ Workspace folder rename completed for: {name}")
+        else:
+            print(f"⚠️  Workspace folder rename failed for: {name}")
+
+        post_start = time.time()
+        success = self._post_process(file)
+        output_folder = find_output_folder(file)
+        if log is not None and output_folder:
+            try:
+                print(f"📄 Solver log: {move_job_logs(log, output_folder)}")
+            except OSError as e:
+                print(f"⚠️  Could not move the solver log of {name}: {e}")
+        if success is None:
+            # Cancelled before it started: the ledger keeps the job for resume() to post-process
+            return False
+        metrics['postprocess_seconds'] = time.time() - post_start
+        self._record(file, state=DONE if success else FAILED, finished_at=time.time(),
+                     postprocess_seconds=metrics['postprocess_seconds'], output_folder=output_folder,
+                     error=None if success else "MSH processing failed")
+        if success:
+            self._status(f"✅ Completed: {name}", SUCCESS)
+        else:
+            self._status(f"⚠️ MSH processing failed: {name}", ERROR)
+
+        self._notify_completed(name, execution_time, success)
+        return success
+
+    def _notify_completed(self, name, execution_time, success):
+        """Per-file Telegram notification: successes are grouped into the periodic digest"""
+        if telegram.TELEGRAM_ENABLED:
+            elapsed = f"\n⏱️ {execution_time:.2f}s" if execution_time is not None else ""
+            if self.postprocess_options is None:
+                message = f"✅ <b>Fossils Analysis Completed</b>\n📁 {name}{elapsed}"
+            elif success:
+                message = f"✅ <b>Fossils Analysis & MSH Processing Completed</b>\n📁 {name}{elapsed}"
+            else:
+                message = f"⚠️ <b>Fossils Analysis Completed, MSH Processing Failed</b>\n📁 {name}{elapsed}"
+            telegram.send_telegram_message(message, silent=success, digest=success)
+
+    def _finish_job(self, file, execution_time=None, log=None):
+        """Rename and post-process a solved file (on a finishing worker), then end the job"""
+        success = False
+        try:
+            success = self._complete_job(file, execution_time, log)
+        except Exception as e:
+            print(f"✗ Exception in: {os.path.basename(file)} - {str(e)}")
+            self._record(file, state=FAILED, finished_at=time.time(), error=str(e))
+        finally:
+            self._end_job(file, DONE if success else CANCELLED if self.cancelled else FAILED)
+
+    def _post_process(self, file):
+        """Process the Fossils output of a file in a post-processing worker
+
+        Returns True on success, False on failure (or timeout) and None when
+        the batch was cancelled before or during the processing.
+        """
+        name = os.path.basename(file)
+        if self.postprocess_options is None:
+            print(f"⚠️ MSH processing skipped (post-processing disabled) for: {name}")
+            return True
+
+        print(f"🔄 Starting MSH processing for: {name}")
+        self._status(f"🔄 MSH processing: {name}", RUNNING)
+        try:
+            with self._lock:
+                if self.cancelled:
+                    print(f"🛑 MSH processing cancelled for: {name}")
+                    return None
+                pool = get_postprocess_pool(self.postprocess_workers, self.postprocess_timeout)
+                job = pool.submit(file, self.postprocess_options)
+                self._postprocess_jobs[file] = job
+            msh_success = job.wait()
+        except Exception as e:
+            print(f"❌ Error during MSH processing for {name}: {e}")
+            return False
+        finally:
+            with self._lock:
+                self._postprocess_jobs.pop(file, None)
+        if job.cancelled and job.error == "cancelled":
+            print(f"🛑 MSH processing cancelled for: {name}")
+            return None
+        if job.error:
+            print(f"❌ Post-processing error for {name}: {job.error}")
+        metrics = self._job_metrics(file)
+        metrics.update(job.metrics.get('counts', {}))
+        metrics['phases'] = job.metrics.get('phases', {})
+
+        if msh_success:
+            print(f"✅ MSH processing completed for: {name}")
+        else:
+            print(f"⚠️ MSH processing failed for: {name}")
+        return msh_success
+
+    def _record(self, file, batch_id=None, **fields):
+        """Persist job fields in the ledger (file None: every queued or solving job fails with `error`)
+
+        Solved jobs waiting for post-processing are left as they are, so
+        resume() only post-processes them. Ledger problems are reported but
+        never stop the batch.
+        """
+        batch_id = batch_id if batch_id is not None else self.batch_id
+        if self.ledger is None or batch_id is None:
+            return
+        try:
+            if file is None:
+                self.ledger.fail_unfinished(batch_id, fields['error'], states=(QUEUED, SOLVING))
+            elif fields.get('state') == SOLVING:
+                self.ledger.start_attempt(batch_id, file)
+            else:
+                self.ledger.update(batch_id, file, **fields)
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not update the job ledger: {e}")
+
+    def _release(self, file, success):
+        """Free the solver slot of a job and start the next queued one"""
+        self.scheduler.job_finished(file, success=success)
+        self.start_next()
+
+    def _job_metrics(self, file):
+        with self._lock:
+            return self.metrics.setdefault(file, {})
+
+    def _write_metrics(self, file, success):
+        """Append the finished job's timings (queue wait, solve, peak RSS/CPU, post-processing phases) to the metrics file"""
+        with self._lock:
+            metrics = self.metrics.pop(file, {})
+        metrics.pop('queued_at', None)
+        record = {'type': 'job', 'batch_id': self.batch_id, 'file': file, 'name': os.path.basename(file),
+                  'success': success, 'finished_at': time.time()}
+        record.update({key: round(value, 4) if isinstance(value, float) else value for key, value in metrics.items()})
+        with self._lock:
+            self.metric_records.append(record)
+        if self.metrics_path:
+            append_metrics(record, self.metrics_path)
+
+    def _set_state(self, file, state):
+        """Move a job to a new state; False when TRANSITIONS does not allow it (e.g. already cancelled)"""
+        with self._lock:
+            current = self.states.get(file)
+            if state not in TRANSITIONS.get(current, ()):
+                return False
+            self.states[file] = state
+            if state in FINAL_STATES:
+                self.results[file] = state == DONE
+        self.events.publish(JOB, file=file, state=state)
+        return True
+
+    def _end_job(self, file, state):
+        """Move a job to a final state, record its metrics and finish the batch after the last one"""
+        if self._set_state(file, state):
+            self._write_metrics(file, state == DONE)
+        self._check_finished()
+
+    def _check_finished(self):
+        with self._lock:
+            finished = all(state in FINAL_STATES for state in self.states.values())
+        if finished:
+            self._finish()
+
+    def _finish(self):
+        """Called once all jobs are complete (or the batch was cancelled)"""
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            if self._recheck_timer is not None:
+                self._recheck_timer.cancel()
+                self._recheck_timer = None
+            for pool in (self._solvers, self._finishers, self._remote):
+                if pool is not None:
+                    pool.shutdown()
+
+        if not self.cancelled:
+            failed = sum(1 for ok in self.results.values() if not ok)
+            if self.postprocess_options is not None:
+                completion_text = "All Fossils processes and MSH processing completed"
+            else:
+                completion_text = "All Fossils processes completed"
+            if failed:
+                self._status(f"⚠️ {completion_text} ({failed} failed)", ERROR, counts=False)
+            else:
+                self._status(f"✅ {completion_text}", SUCCESS, counts=False)
+
+            summary = self._throughput()
+
+            # Send completion notification to Telegram
+            if telegram.TELEGRAM_ENABLED:
+                completion_message = f"🎉 <b>MSH2VTK - {completion_text}</b>\n📁 {len(self.results) - failed}/{len(self.results)} succeeded\n🕐 {_clock()}"
+                if summary is not None:
+                    completion_message += f"\n📈 {format_throughput(summary)}"
+                telegram.send_telegram_message(completion_message)
+
+        if self.ledger is not None and self.batch_id is not None:
+            try:
+                self.ledger.finish_batch(self.batch_id)
+            except sqlite3.Error as e:
+                print(f"⚠️  Could not update the job ledger: {e}")
+        self._done.set()
+        self.events.publish(FINISHED, batch=self)
+
+    def _throughput(self):
+        """Print and record the throughput of the finished batch"""
+        with self._lock:
+            records = list(self.metric_records)
+        if not records or self.started_at is None:
+            return None
+        summary = throughput(records, time.time() - self.started_at)
+        print(f"📈 Throughput: {format_throughput(summary)}")
+        if self.metrics_path:
+            append_metrics(dict(summary, type='batch', batch_id=self.batch_id, finished_at=time.time()),
+                           self.metrics_path)
+        return summary
+
+    def _status(self, text, level, counts=True):
+        if counts:
+            with self._lock:
+                running_count = sum(1 for state in self.states.values() if state == SOLVING)
+                queued_count = len(self.queue)
+            eta = self.eta() if running_count or queued_count else None
+            eta_text = f", ETA ~{_format_duration(eta)}" if eta else ""
+            text = f"{text} ({running_count} running, {queued_count} queued{eta_text})"
+        self.events.publish(STATUS, text=text, level=level)
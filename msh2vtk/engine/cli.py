@@ -0,0 +1,266 @@
+import os
+import time
+import argparse
+from .batch import FossilsBatch
+from .config import load_config, normalize_config, batch_limits, parse_worker_list, CONFIG_FILE
+from .ledger import JobLedger, LEDGER_FILE
+from .metrics import METRICS_FILE
+from .postprocess_pool import shutdown_postprocess_pool
+from .remote import DEFAULT_WORKER_PORT
+from .summary_stats import parse_number_list
+from .streaming import DEFAULT_CHUNK_SIZE
+from .vtk_export import VTU_FORMAT, LEGACY_FORMAT, VTU_COMPRESSORS, DEFAULT_VTU_COMPRESSION
+from .scanner import ScanIndex, find_fossils_scripts
+from .worker import WorkerAgent, serve_worker, WORKER_DIR
+from . import telegram
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="msh2vtk", description="Run Fossils batches without the GUI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Run Fossils on Python scripts and post-process their results.")
+    run.add_argument("paths", nargs='*', help="Fossils Python scripts or folders containing them.")
+    run.add_argument("--recursive", action='store_true', help="Search folders recursively for Python scripts.")
+    run.add_argument("--jobs", "-j", type=int, help=f"Maximum Fossils processes running at once (default: {CONFIG_FILE}).")
+    run.add_argument("--fossils", help=f"Path to the Fossils executable (default: {CONFIG_FILE}).")
+    run.add_argument("--config", default=CONFIG_FILE, help="Fossils configuration file shared with the GUI.")
+    run.add_argument("--no-resource-aware", action='store_true', help="Start jobs up to --jobs without checking free RAM/CPU.")
+    run.add_argument("--keep-order", action='store_true',
+                     help="Start jobs in the given order instead of longest predicted solve first.")
+    run.add_argument("--timeout", type=float, help="Wall-clock limit per Fossils run in minutes, 0 for none (default: config).")
+    run.add_argument("--idle-timeout", type=float, help="Kill a solver silent for this many minutes, 0 for never (default: config).")
+    run.add_argument("--retries", type=int, help="Extra attempts after a timeout or a crash (default: config).")
+    run.add_argument("--retry-backoff", type=float, help="Seconds before the first retry, doubled for each next one (default: config).")
+    run.add_argument("--ledger", help=f"SQLite job ledger recording the state of every job (default: {LEDGER_FILE} in the data folder).")
+    run.add_argument("--metrics",
+                     help=f"JSON-lines file receiving the per-phase timings of every job (default: {METRICS_FILE} in the data folder, '' to disable).")
+    run.add_argument("--resume", action='store_true',
+                     help="Resume the unfinished jobs of the last interrupted batch (with its recorded settings).")
+    run.add_argument("--no-telegram", action='store_true', help="Do not send Telegram notifications.")
+    run.add_argument("--worker", action='append', dest="workers", metavar="HOST:PORT",
+                     help=f"Also send jobs to this worker agent (repeatable, default: {CONFIG_FILE}); "
+                          "with workers --jobs may be 0.")
+    run.add_argument("--worker-token", help=f"Shared secret of the worker agents (default: {CONFIG_FILE}).")
+
+    post = run.add_argument_group("post-processing")
+    post.add_argument("--post-process", action='store_true',
+                      help="Post-process the MSH output of every successful job (default exports: stress summary, stress and forces CSV, VTK).")
+    post.add_argument("--export-von-mises", action='store_true', help="Export Von mises stress results.")
+    post.add_argument("--export-smooth-stress", action='store_true', help="Export smooth stress tensor to CSV.")
+    post.add_argument("--export-vtk", action='store_true', help="Export combined data to VTK.")
+    post.add_argument("--export-columnar", action='store_true', help="Export results to Parquet (or NPZ without pyarrow).")
+    post.add_argument("--legacy-vtk", action='store_true', help="Write legacy combined_data.vtk instead of combined_data.vtu.")
+    post.add_argument("--vtk-compression", choices=VTU_COMPRESSORS, default=DEFAULT_VTU_COMPRESSION, help="Compression of the .vtu appended data.")
+    post.add_argument("--force", action='store_true', help="Reprocess files even if their outputs are up to date.")
+    post.add_argument("--streaming", action='store_true', help="Process results in chunks with bounded memory (large meshes).")
+    post.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Nodes per chunk in streaming mode.")
+    post.add_argument("--postprocess-workers", type=int, help=f"MSH post-processing worker processes (default: {CONFIG_FILE}).")
+    post.add_argument("--postprocess-timeout", type=float, help="Kill a post-processing worker stuck on one job for this many minutes, 0 for never (default: config).")
+    post.add_argument("--trimmed-means", type=parse_number_list,
+                      help="Comma-separated percentages of highest stresses to exclude from trimmed means.")
+    post.add_argument("--percentiles", type=parse_number_list, help="Comma-separated stress percentiles for the summary.")
+
+    worker = subparsers.add_parser("worker", help="Solve jobs sent by `msh2vtk run --worker` on other machines.")
+    worker.add_argument("--host", default="127.0.0.1",
+                        help="Interface to listen on (0.0.0.0: every interface; only on a trusted network).")
+    worker.add_argument("--port", type=int, default=DEFAULT_WORKER_PORT, help="TCP port to listen on.")
+    worker.add_argument("--jobs", "-j", type=int, help=f"Jobs solved at once (default: {CONFIG_FILE}).")
+    worker.add_argument("--fossils", help=f"Path to the Fossils executable (default: {CONFIG_FILE}).")
+    worker.add_argument("--config", default=CONFIG_FILE, help="Fossils configuration file.")
+    worker.add_argument("--workdir", help=f"Folder receiving the job bundles and results (default: {WORKER_DIR} in the data folder).")
+    worker.add_argument("--token", help=f"Shared secret coordinators must send (default: remote_token in {CONFIG_FILE}).")
+    worker.add_argument("--no-resource-aware", action='store_true', help="Do not check free RAM/CPU before solving.")
+    worker.add_argument("--postprocess-workers", type=int, help=f"MSH post-processing worker processes (default: {CONFIG_FILE}).")
+    return parser
+
+
+def collect_scripts(paths, recursive):
+    """Expand folders into the Fossils scripts they contain (files are taken as given), without duplicates"""
+    scripts = []
+    index = ScanIndex()
+    for path in paths:
+        if os.path.isdir(path):
+            found = find_fossils_scripts(path, recursive, index)
+            if not found:
+                print(f"⚠️  No Fossils scripts (defining parms()) found in: {path}")
+            scripts.extend(found)
+        elif os.path.isfile(path):
+            scripts.append(path)
+        else:
+            print(f"⚠️  Not found: {path}")
+    index.save()
+    return list(dict.fromkeys(os.path.abspath(script) for script in scripts))
+
+
+def postprocess_options(args, config):
+    """Options passed to process_fossils_output, or None when post-processing is off"""
+    exports = [args.export_von_mises, args.export_smooth_stress, args.export_vtk, args.export_columnar]
+    if not args.post_process:
+        return None
+    if not any(exports):
+        # Same defaults as the GUI checkboxes
+        args.export_von_mises = args.export_smooth_stress = args.export_vtk = True
+    return {
+        'export_von_mises': args.export_von_mises,
+        'export_smooth_stress': args.export_smooth_stress,
+        'export_vtk': args.export_vtk,
+        'export_columnar': args.export_columnar,
+        'vtk_format': LEGACY_FORMAT if args.legacy_vtk else VTU_FORMAT,
+        'vtk_compression': args.vtk_compression,
+        'force': args.force,
+        'streaming': args.streaming,
+        'chunk_size': args.chunk_size,
+        'trimmed_percents': list(args.trimmed_means or config['summary_trimmed_percents']),
+        'percentiles': list(args.percentiles or config['summary_percentiles']),
+    }
+
+
+# Seconds between progress lines of the running solves
+PROGRESS_INTERVAL = 30
+
+
+def print_progress(batch, shown):
+    """Print the phase/percentage of each running solve that changed since the last call"""
+    for file, output in batch.live_outputs():
+        progress = output.describe()
+        if shown.get(file) != progress:
+            shown[file] = progress
+            print(f"⏳ {os.path.basename(file)}: {progress} ({output.lines} lines)")
+    eta = batch.eta()
+    if shown and eta:
+        print(f"⏱️  Batch ETA: ~{eta / 60:.1f} min")
+
+
+def wait_for(batch):
+    shown = {}
+    last_progress = time.time()
+    try:
+        # Short waits keep Ctrl+C responsive
+        while not batch.wait(0.5):
+            if time.time() - last_progress >= PROGRESS_INTERVAL:
+                last_progress = time.time()
+                print_progress(batch, shown)
+    except KeyboardInterrupt:
+        print("🛑 Interrupted, cancelling the batch...")
+        batch.cancel()
+        batch.wait()
+    finally:
+        shutdown_postprocess_pool()
+        # Notifications are sent in the background: give the last ones time to go out
+        telegram.flush_telegram()
+
+
+def report(batch, total):
+    succeeded = sum(1 for ok in batch.results.values() if ok)
+    print(f"📊 {succeeded}/{total} jobs succeeded")
+    if batch.cancelled:
+        return 130
+    return 0 if batch.succeeded and succeeded == total else 1
+
+
+def resume(args, parser):
+    if args.paths:
+        parser.error("--resume takes no paths: the jobs come from the ledger")
+    ledger = JobLedger(args.ledger)
+    previous = ledger.unfinished_batch()
+    if previous is None:
+        print("✅ No unfinished jobs to resume")
+        return 0
+    if not args.no_telegram:
+        telegram.load_telegram_config()
+
+    batch = FossilsBatch.from_ledger(ledger, previous, on_status=lambda text, level: print(text))
+    if args.fossils:
+        batch.fossils_path = args.fossils
+    if args.metrics is not None:
+        batch.metrics_path = args.metrics
+    batch.remote_token = args.worker_token if args.worker_token is not None else load_config(args.config)['remote_token']
+    total = len(ledger.unfinished_jobs(previous['id']))
+    batch.resume(previous['id'])
+    wait_for(batch)
+    return report(batch, total)
+
+
+def run(args, parser):
+    if args.resume:
+        return resume(args, parser)
+    if not args.paths:
+        parser.error("the following arguments are required: paths")
+    config = load_config(args.config)
+    for option, key in (("timeout", "job_timeout_minutes"), ("idle_timeout", "idle_timeout_minutes"),
+                        ("retries", "max_retries"), ("retry_backoff", "retry_backoff_seconds"),
+                        ("postprocess_timeout", "postprocess_timeout_minutes")):
+        if getattr(args, option) is not None:
+            config[key] = getattr(args, option)
+    config = normalize_config(config)
+    fossils_path = args.fossils or config['fossils_path']
+    if not fossils_path:
+        parser.error(f"no Fossils executable: pass --fossils or set it in {args.config}")
+    workers = parse_worker_list(args.workers) if args.workers else config['remote_workers']
+    if args.jobs is not None and args.jobs < (0 if workers else 1):
+        parser.error("--jobs must be at least 1 (or 0 with remote workers)")
+    if not args.post_process and any([args.export_von_mises, args.export_smooth_stress, args.export_vtk,
+                                      args.export_columnar]):
+        parser.error("export options require --post-process")
+    if args.streaming and args.legacy_vtk:
+        parser.error("--legacy-vtk cannot be combined with --streaming, which writes .vtu files")
+
+    scripts = collect_scripts(args.paths, args.recursive)
+    if not scripts:
+        print("❌ No Python files to run")
+        return 1
+
+    if not args.no_telegram:
+        telegram.load_telegram_config()
+
+    batch = FossilsBatch(
+        fossils_path,
+        max_jobs=args.jobs if args.jobs is not None else config['max_parallel_processes'],
+        resource_aware=config['resource_aware_scheduling'] and not args.no_resource_aware,
+        longest_first=config['longest_job_first'] and not args.keep_order,
+        postprocess_options=postprocess_options(args, config),
+        postprocess_workers=args.postprocess_workers or config['postprocess_workers'],
+        on_status=lambda text, level: print(text),
+        ledger=JobLedger(args.ledger),
+        metrics_path=args.metrics,
+        remote_workers=workers,
+        remote_token=args.worker_token if args.worker_token is not None else config['remote_token'],
+        **batch_limits(config),
+    )
+    batch.start(scripts)
+    wait_for(batch)
+    return report(batch, len(scripts))
+
+
+def worker(args, parser):
+    config = load_config(args.config)
+    fossils_path = args.fossils or config['fossils_path']
+    if not fossils_path:
+        parser.error(f"no Fossils executable: pass --fossils or set it in {args.config}")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    agent = WorkerAgent(
+        fossils_path,
+        slots=args.jobs or config['max_parallel_processes'],
+        workdir=args.workdir,
+        token=args.token if args.token is not None else config['remote_token'],
+        resource_aware=config['resource_aware_scheduling'] and not args.no_resource_aware,
+        postprocess_workers=args.postprocess_workers or config['postprocess_workers'],
+    )
+    try:
+        serve_worker(agent, args.host, args.port)
+    finally:
+        shutdown_postprocess_pool()
+    return 0
+
+
+def main(argv=None):
+    """Entry point of `msh2vtk run` and `msh2vtk worker` (also through main.py and `python -m engine`)"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return run(args, parser)
+    if args.command == "worker":
+        return worker(args, parser)
+    return 2
@@ -0,0 +1,96 @@
+import os
+import json
+from .postprocess_pool import DEFAULT_POSTPROCESS_WORKERS
+from .summary_stats import parse_number_list, DEFAULT_TRIMMED_PERCENTS, DEFAULT_PERCENTILES
+
+# Fossils settings shared by the GUI and the command line
+CONFIG_FILE = "fossils_config.json"
+
+DEFAULT_CONFIG = {
+    "fossils_path": "",
+    "max_parallel_processes": 1,  # Default: run one at a time
+    "postprocess_workers": DEFAULT_POSTPROCESS_WORKERS,  # MSH post-processing worker processes
+    "summary_trimmed_percents": list(DEFAULT_TRIMMED_PERCENTS),  # % highest stresses excluded
+    "summary_percentiles": list(DEFAULT_PERCENTILES),
+    "resource_aware_scheduling": True,  # Check free RAM/CPU before starting each job
+    "longest_job_first": True,  # Start the jobs with the longest predicted solve first
+    "job_timeout_minutes": 0,  # Wall-clock limit per Fossils run (0: none)
+    "idle_timeout_minutes": 30,  # Kill a solver that prints nothing for this long (0: never)
+    "max_retries": 1,  # Extra attempts after a timeout or a crash
+    "retry_backoff_seconds": 30,  # Delay before the first retry, doubled for each next one
+    "postprocess_timeout_minutes": 120,  # Kill and restart a post-processing worker stuck on one job (0: never)
+    "remote_workers": [],  # Worker agents (host:port) solving jobs besides the local slots
+    "remote_token": "",  # Shared secret of the worker agents (their --token)
+    "log_pane_lines": 5000,  # Lines kept in the GUI log pane (everything goes to msh2vtk.log)
+}
+
+# The log pane keeps at least this many lines
+MIN_LOG_PANE_LINES = 100
+
+# Parallel process counts above this may exhaust the RAM of most machines
+HIGH_PARALLEL_WARNING = 10
+
+
+def normalize_config(config):
+    """Fill in defaults and clamp invalid values of a Fossils configuration"""
+    normalized = dict(DEFAULT_CONFIG)
+    normalized.update({key: value for key, value in config.items() if value is not None})
+
+    if normalized["max_parallel_processes"] < 1:
+        normalized["max_parallel_processes"] = 1
+        print("⚠️  Invalid parallel processes value in config, setting to 1")
+    if normalized["max_parallel_processes"] > HIGH_PARALLEL_WARNING:
+        print(f"⚠️  WARNING: High parallel process count ({normalized['max_parallel_processes']}). This may cause system resource issues.")
+
+    normalized["postprocess_workers"] = max(1, int(normalized["postprocess_workers"]))
+    normalized["summary_trimmed_percents"] = list(parse_number_list(normalized["summary_trimmed_percents"]))
+    normalized["summary_percentiles"] = list(parse_number_list(normalized["summary_percentiles"]))
+    normalized["resource_aware_scheduling"] = bool(normalized["resource_aware_scheduling"])
+    normalized["longest_job_first"] = bool(normalized["longest_job_first"])
+    for key in ("job_timeout_minutes", "idle_timeout_minutes", "retry_backoff_seconds", "postprocess_timeout_minutes"):
+        normalized[key] = max(0.0, float(normalized[key]))
+    normalized["max_retries"] = max(0, int(normalized["max_retries"]))
+    normalized["remote_workers"] = parse_worker_list(normalized["remote_workers"])
+    normalized["remote_token"] = str(normalized["remote_token"])
+    normalized["log_pane_lines"] = max(MIN_LOG_PANE_LINES, int(normalized["log_pane_lines"]))
+    return normalized
+
+
+def parse_worker_list(value):
+    """Worker addresses from a list or a comma/space separated string"""
+    if isinstance(value, str):
+        value = value.replace(',', ' ').split()
+    return [str(address).strip() for address in value if str(address).strip()]
+
+
+def batch_limits(config):
+    """FossilsBatch timeout and retry arguments from a configuration"""
+    return {
+        'job_timeout': config["job_timeout_minutes"] * 60,
+        'idle_timeout': config["idle_timeout_minutes"] * 60,
+        'max_retries': config["max_retries"],
+        'retry_backoff': config["retry_backoff_seconds"],
+        'postprocess_timeout': config["postprocess_timeout_minutes"] * 60,
+    }
+
+
+def load_config(path=CONFIG_FILE):
+    """Load the Fossils configuration (defaults when the file is missing or unreadable)"""
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                return normalize_config(json.load(f))
+        except Exception as e:
+            print(f"⚠️  Error reading Fossils configuration: {e}")
+    return dict(DEFAULT_CONFIG)
+
+
+def save_config(config, path=CONFIG_FILE):
+    """Save the Fossils configuration, return True on success"""
+    try:
+        with open(path, 'w') as f:
+            json.dump(normalize_config(config), f, indent=2)
+        return True
+    except Exception as e:
+        print(f"❌ Error saving Fossils configuration: {e}")
+        return False
@@ -0,0 +1,66 @@
+import time
+import queue
+import threading
+import collections
+
+# Event kinds published by FossilsBatch
+STATUS = "status"      # text, level
+JOB = "job"            # file, state (batch.JOB_STATES)
+FINISHED = "finished"  # batch
+
+Event = collections.namedtuple('Event', 'kind data time')
+
+
+class EventBus:
+    """Publish/subscribe hub: handlers are called in the publishing thread
+
+    A failing handler is reported and does not prevent the others from
+    running. Handlers that touch a GUI should not call it directly but
+    forward the events to an EventQueue drained by the GUI thread.
+    """
+
+    def __init__(self):
+        self._handlers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler, kinds=None):
+        """Call handler(event) for the given kinds (all kinds when None)"""
+        with self._lock:
+            self._handlers.append((handler, set(kinds) if kinds else None))
+        return handler
+
+    def unsubscribe(self, handler):
+        with self._lock:
+            self._handlers = [entry for entry in self._handlers if entry[0] is not handler]
+
+    def publish(self, kind, **data):
+        event = Event(kind, data, time.time())
+        with self._lock:
+            handlers = list(self._handlers)
+        for handler, kinds in handlers:
+            if kinds is not None and kind not in kinds:
+                continue
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"⚠️  Event handler failed for '{kind}': {e}")
+
+
+class EventQueue:
+    """Thread-safe inbox of events, drained by a single consumer (e.g. the Tk main loop)"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def __call__(self, event):
+        self._queue.put(event)
+
+    def drain(self, limit=None):
+        """Return the pending events (at most limit) without blocking"""
+        events = []
+        while limit is None or len(events) < limit:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
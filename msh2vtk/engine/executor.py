@@ -0,0 +1,53 @@
+import queue
+import threading
+
+
+class WorkerPool:
+    """Fixed number of daemon threads running submitted calls in order
+
+    Unlike a thread per job, the number of threads stays bounded however
+    many jobs are submitted. Threads are daemons so a closing GUI is not
+    held open by a long solve (the ledger lets the batch be resumed).
+    """
+
+    def __init__(self, size, name="worker"):
+        self.size = max(1, int(size))
+        self.name = name
+        self._tasks = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, function, *args):
+        """Queue function(*args); threads are started as they are needed"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} pool is shut down")
+            if len(self._threads) < self.size:
+                thread = threading.Thread(target=self._run, name=f"{self.name}-{len(self._threads) + 1}",
+                                          daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        self._tasks.put((function, args))
+
+    def _run(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            function, args = task
+            try:
+                function(*args)
+            except Exception as e:
+                # Callers handle their own errors; this only keeps the thread alive
+                print(f"❌ Unhandled error in {threading.current_thread().name}: {e}")
+
+    def shutdown(self):
+        """Let the threads exit once the calls already queued are done"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = len(self._threads)
+        for _ in range(threads):
+            self._tasks.put(None)
@@ -0,0 +1,186 @@
+import os
+import re
+import time
+import shutil
+import threading
+import collections
+
+# Solver output of each job, written next to its results
+JOB_LOG_NAME = "fossils.log"
+LOG_MAX_BYTES = 20 * 1024 ** 2   # rotated beyond this size...
+LOG_BACKUPS = 3                  # ...keeping fossils.log.1 .. fossils.log.3
+TAIL_LINES = 200                 # lines kept in memory per job for the live view
+ERROR_TAIL_LINES = 20            # stderr lines kept for the error message of a failed job
+
+# Progress markers in solver output: gmsh "[ 40%]" / "45 %" and "step 3/10" style counters
+PERCENT_PATTERN = re.compile(r'\[\s*(\d{1,3}(?:\.\d+)?)\s*%\s*\]|(\d{1,3}(?:\.\d+)?)\s*%')
+STEP_PATTERN = re.compile(r'\b(?:step|iteration|iter|increment|archive)\s*[:#=]?\s*(\d+)\s*(?:/|of)\s*(\d+)',
+                          re.IGNORECASE)
+# "Meshing 3D...", "Info    : Solving..." and similar announce a new phase
+PHASE_PATTERN = re.compile(r'^(?:\w+\s*:\s*)?([A-Z][\w ]{2,40}?)\s*\.\.\.\s*$')
+
+
+def job_log_path(python_file):
+    """Log file of a job while it runs: inside the folder named after the script"""
+    return os.path.join(os.path.splitext(python_file)[0], JOB_LOG_NAME)
+
+
+def parse_progress(line):
+    """Return (fraction or None, phase or None) announced by a solver output line"""
+    fraction = None
+    match = STEP_PATTERN.search(line)
+    if match and int(match.group(2)) > 0:
+        fraction = min(1.0, int(match.group(1)) / int(match.group(2)))
+    else:
+        match = PERCENT_PATTERN.search(line)
+        if match:
+            fraction = min(1.0, float(match.group(1) or match.group(2)) / 100)
+    match = PHASE_PATTERN.match(line.strip())
+    return fraction, match.group(1).strip() if match else None
+
+
+class RotatingLogFile:
+    """Append-only text log rotated to path.1, path.2... when it grows past max_bytes"""
+
+    def __init__(self, path, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8', errors='replace', buffering=1)
+        self._size = self._file.tell()
+
+    def write(self, text):
+        with self._lock:
+            if self._file is None:
+                return
+            if self.max_bytes and self._size + len(text) > self.max_bytes and self._size > 0:
+                self._rotate()
+            self._file.write(text)
+            self._size += len(text)
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, 'w', encoding='utf-8', errors='replace', buffering=1)
+        self._size = 0
+
+    def files(self):
+        """The log and its rotated backups that exist"""
+        names = [self.path] + [f"{self.path}.{index}" for index in range(1, self.backups + 1)]
+        return [name for name in names if os.path.exists(name)]
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class JobOutput:
+    """Streams the stdout/stderr of a solver to its log file, line by line
+
+    Reader threads write every line to a RotatingLogFile as it arrives and keep
+    only a bounded tail in memory, the last error lines, the time of the last
+    output (for the watchdog) and the progress parsed from the output.
+    With process None there are no readers: lines are passed to feed()
+    (e.g. output relayed from a remote worker).
+    """
+
+    def __init__(self, process, log_path, header=None):
+        self.log = RotatingLogFile(log_path)
+        if header:
+            self.log.write(header + "\n")
+        self.tail = collections.deque(maxlen=TAIL_LINES)
+        self.error_tail = collections.deque(maxlen=ERROR_TAIL_LINES)
+        self.lines = 0
+        self.progress = None
+        self.phase = None
+        self.last_output = time.time()
+        self._tail_lock = threading.Lock()
+        self._threads = []
+        if process is not None:
+            self._threads = [
+                threading.Thread(target=self._read, args=(process.stdout, False), daemon=True),
+                threading.Thread(target=self._read, args=(process.stderr, True), daemon=True),
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def _read(self, stream, is_stderr):
+        for line in stream:
+            self.feed(line, is_stderr)
+        stream.close()
+
+    def feed(self, line, is_stderr=False):
+        """Log one line of output and update the tail and the progress"""
+        if not line.endswith('\n'):
+            line += '\n'
+        self.log.write("[stderr] " + line if is_stderr else line)
+        line = line.rstrip('\n')
+        with self._tail_lock:
+            self.tail.append(line)
+            if is_stderr:
+                self.error_tail.append(line)
+            self.lines += 1
+        self.last_output = time.time()
+
+        fraction, phase = parse_progress(line)
+        if phase is not None:
+            # A new phase restarts its own progress counter
+            self.phase = phase
+            self.progress = None
+        if fraction is not None:
+            self.progress = fraction
+
+    def recent(self, count=TAIL_LINES):
+        """Copy of the last lines of output (safe while the readers append)"""
+        with self._tail_lock:
+            return list(self.tail)[-count:]
+
+    def since(self, seen):
+        """(lines so far, the lines after the first `seen` that are still in the tail)"""
+        with self._tail_lock:
+            new = min(max(0, self.lines - seen), len(self.tail))
+            return self.lines, list(self.tail)[len(self.tail) - new:]
+
+    def describe(self):
+        """Short progress text: phase and percentage when known"""
+        parts = [self.phase or "running"]
+        if self.progress is not None:
+            parts.append(f"{self.progress * 100:.0f}%")
+        return " ".join(parts)
+
+    def join(self, timeout=5.0):
+        """Wait for the readers to drain the pipes, close the log and return the last error lines"""
+        for thread in self._threads:
+            thread.join(timeout)
+        self.log.close()
+        return "\n".join(self.error_tail)
+
+
+def move_job_logs(log, output_folder):
+    """Move a closed job log and its backups into the output folder; return the new log path"""
+    if not output_folder or os.path.dirname(os.path.abspath(log.path)) == os.path.abspath(output_folder):
+        return log.path
+    for path in log.files():
+        target = os.path.join(output_folder, os.path.basename(path))
+        try:
+            os.replace(path, target)
+        except OSError:
+            # Different drive
+            shutil.copyfile(path, target)
+            os.remove(path)
+    folder = os.path.dirname(log.path)
+    try:
+        # The folder was only created for the log
+        os.rmdir(folder)
+    except OSError:
+        pass
+    return os.path.join(output_folder, JOB_LOG_NAME)
@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from .paths import data_path
+
+# Job ledger kept in the working folder, next to fossils_config.json
+LEDGER_FILE = "fossils_jobs.db"
+
+# Job states
+QUEUED = "queued"
+SOLVING = "solving"
+POST_PROCESSING = "post-processing"
+DONE = "done"
+FAILED = "failed"
+UNFINISHED_STATES = (QUEUED, SOLVING, POST_PROCESSING)
+
+# Columns callers may set through update()
+JOB_FIELDS = ('state', 'attempts', 'started_at', 'solved_at', 'finished_at', 'solve_seconds',
+              'postprocess_seconds', 'return_code', 'output_folder', 'error')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    fossils_path TEXT NOT NULL,
+    settings TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    batch_id INTEGER NOT NULL REFERENCES batches(id),
+    position INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    queued_at REAL NOT NULL,
+    started_at REAL,
+    solved_at REAL,
+    finished_at REAL,
+    solve_seconds REAL,
+    postprocess_seconds REAL,
+    return_code INTEGER,
+    output_folder TEXT,
+    error TEXT,
+    PRIMARY KEY (batch_id, file)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state);
+"""
+
+
+class JobLedger:
+    """Persistent record of every Fossils job (SQLite, one row per job and batch)
+
+    Each state change is committed at once in WAL mode, so after a crash or a
+    reboot the ledger still says which scripts were solved and which were
+    not. Safe to share between the worker threads of a batch.
+    """
+
+    def __init__(self, path=None):
+        self.path = os.path.abspath(path if path is not None else data_path(LEDGER_FILE))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def create_batch(self, files, fossils_path, settings):
+        """Record a new batch with all its files queued; return the batch id"""
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO batches (created_at, fossils_path, settings) VALUES (?, ?, ?)",
+                (now, fossils_path, json.dumps(settings)))
+            batch_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO jobs (batch_id, position, file, state, queued_at) VALUES (?, ?, ?, ?, ?)",
+                [(batch_id, position, file, QUEUED, now) for position, file in enumerate(files)])
+        return batch_id
+
+    def update(self, batch_id, file, **fields):
+        """Set columns of a job (state, timings, return code, output folder, error)"""
+        unknown = set(fields) - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown job fields: {', '.join(sorted(unknown))}")
+        if not fields:
+            return
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE batch_id = ? AND file = ?",
+                               (*fields.values(), batch_id, file))
+
+    def start_attempt(self, batch_id, file):
+        """Mark a job as solving and count the attempt"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, started_at = ?, return_code = NULL, error = NULL "
+                "WHERE batch_id = ? AND file = ?", (SOLVING, time.time(), batch_id, file))
+
+    def fail_unfinished(self, batch_id, error, states=UNFINISHED_STATES):
+        """Mark the jobs of a batch still in one of `states` as failed (cancelled or abandoned)"""
+        placeholders = ", ".join("?" for _ in states)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET state = ?, error = ?, finished_at = ? WHERE batch_id = ? AND state IN ({placeholders})",
+                (FAILED, error, time.time(), batch_id, *states))
+
+    def finish_batch(self, batch_id):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE batches SET finished_at = ? WHERE id = ?", (time.time(), batch_id))
+
+    def jobs(self, batch_id):
+        """All jobs of a batch as dicts, in queue order"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs WHERE batch_id = ? ORDER BY position", (batch_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def batch(self, batch_id):
+        """A batch as a dict (settings decoded), or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM batches WHERE id = ?", (batch_id,)).fetchone()
+        if row is None:
+            return None
+        batch = dict(row)
+        batch['settings'] = json.loads(batch['settings'])
+        return batch
+
+    def unfinished_batch(self):
+        """Most recent batch that still has queued, solving or post-processing jobs, or None"""
+        placeholders = ", ".join("?" for _ in UNFINISHED_STATES)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT batch_id FROM jobs WHERE state IN ({placeholders}) ORDER BY batch_id DESC LIMIT 1",
+                UNFINISHED_STATES).fetchone()
+        return self.batch(row['batch_id']) if row else None
+
+    def unfinished_jobs(self, batch_id):
+        """Jobs of a batch that did not reach done or failed"""
+        return [job for job in self.jobs(batch_id) if job['state'] in UNFINISHED_STATES]
@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import threading
+import contextlib
+from .paths import data_path
+
+# One JSON object per finished job, appended next to fossils_jobs.db
+METRICS_FILE = "job_metrics.jsonl"
+
+# Post-processing phases measured by process_fossils_output
+MSH_LOAD = "msh_load"
+STRESS = "stress"
+WRITE = "write"          # CSV, columnar and VTK outputs
+SUMMARY = "summary"      # von_mises_stress_results.csv
+
+_write_lock = threading.Lock()
+
+
+class PhaseTimer:
+    """Wall-clock seconds spent in named phases, plus counters (nodes, elements...)
+
+    Time spent in a phase accumulates when the phase is entered several times,
+    e.g. once per chunk in streaming mode.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counts = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def iterate(self, name, iterable):
+        """Yield from iterable, counting the time spent producing each item as phase `name`"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(name, time.perf_counter() - start)
+                return
+            self.add(name, time.perf_counter() - start)
+            yield item
+
+    def as_dict(self):
+        return {'phases': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+                'counts': dict(self.counts)}
+
+
+def append_metrics(record, path=None):
+    """Append one job record to the metrics file; problems are reported, never raised"""
+    path = path if path is not None else data_path(METRICS_FILE)
+    try:
+        with _write_lock, open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    except (OSError, TypeError, ValueError) as e:
+        print(f"⚠️  Could not write job metrics to {path}: {e}")
+
+
+def read_metrics(path=None):
+    """All job records of a metrics file (unreadable lines are skipped)"""
+    path = path if path is not None else data_path(METRICS_FILE)
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def throughput(records, wall_seconds):
+    """Aggregate throughput of a batch: jobs/hour and nodes/second over its wall time"""
+    succeeded = [record for record in records if record.get('success')]
+    nodes = sum(record.get('nodes') or 0 for record in succeeded)
+    summary = {'jobs': len(records), 'succeeded': len(succeeded), 'wall_seconds': round(wall_seconds, 3),
+               'jobs_per_hour': None, 'nodes_per_second': None}
+    if wall_seconds > 0:
+        summary['jobs_per_hour'] = round(len(succeeded) * 3600 / wall_seconds, 3)
+        summary['nodes_per_second'] = round(nodes / wall_seconds, 1) if nodes else None
+    for phase in ('queue_wait', 'solve_seconds', 'rename_seconds', 'postprocess_seconds'):
+        values = [record[phase] for record in records if record.get(phase) is not None]
+        summary[f'total_{phase}'] = round(sum(values), 3)
+    return summary
+
+
+def format_throughput(summary):
+    parts = [f"{summary['succeeded']}/{summary['jobs']} jobs in {summary['wall_seconds'] / 60:.1f} min"]
+    if summary['jobs_per_hour'] is not None:
+        parts.append(f"{summary['jobs_per_hour']:.1f} jobs/hour")
+    if summary['nodes_per_second'] is not None:
+        parts.append(f"{summary['nodes_per_second']:,.0f} nodes/s")
+    return ", ".join(parts)
@@ -0,0 +1,745 @@
+import mmap
+import os
+import tempfile
+import numpy as np
+
+# Number of nodes for each gmsh element type
+NODES_PER_ELEMENT = {
+    1: 2, 2: 3, 3: 4, 4: 4, 5: 8, 6: 6, 7: 5, 8: 3, 9: 6, 10: 9,
+    11: 10, 12: 27, 13: 18, 14: 14, 15: 1, 16: 8, 17: 20, 18: 15, 19: 13,
+}
+
+ASCII_BLOCK_BYTES = 8 << 20  # text of an ASCII section parsed at a time
+BLOCK_VALUES = 1 << 20  # numbers copied at a time into the arrays of a section or a tag lookup
+
+
+class MshFormatError(Exception):
+    """Raised when a file cannot be parsed by the native MSH reader"""
+
+
+class MshFile:
+    """Arrays read from a single MSH file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.version = None
+        self.binary = False
+        self.node_tags = None      # (N,) int64
+        self.node_coords = None    # (N, 3) float64
+        self.elements = []         # list of (element_type, element_tags, connectivity (M, n) node tags)
+        self.node_data = []        # list of dicts: name, time, step, num_comp, tags (K,), values (K, num_comp)
+
+
+class _Buffer:
+    """Cursor over the raw bytes of an MSH file"""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.size = len(data)
+
+    def at_end(self):
+        return self.pos >= self.size
+
+    def readline(self):
+        end = self.data.find(b'\n', self.pos)
+        if end == -1:
+            end = self.size
+        line = self.data[self.pos:end]
+        self.pos = end + 1
+        return line.strip()
+
+    def read_section_tokens(self, name):
+        """Return the numbers of an ASCII section (see _Tokens) and move past its end marker"""
+        marker = b'$End' + name
+        end = self.data.find(marker, self.pos)
+        if end == -1:
+            raise MshFormatError(f"Missing {marker.decode()} marker")
+        tokens = _Tokens(self.data, self.pos, end, name.decode())
+        self.pos = end
+        self.readline()
+        return tokens
+
+    def read_array(self, dtype, count):
+        """Read `count` items of `dtype` without copying"""
+        dtype = np.dtype(dtype)
+        nbytes = dtype.itemsize * count
+        if self.pos + nbytes > self.size:
+            raise MshFormatError("Unexpected end of binary block")
+        array = np.frombuffer(self.data, dtype=dtype, count=count, offset=self.pos)
+        self.pos += nbytes
+        return array
+
+    def skip_section(self, name):
+        marker = b'\n$End' + name
+        end = self.data.find(marker, self.pos)
+        if end == -1:
+            raise MshFormatError(f"Missing $End{name.decode()} marker")
+        self.pos = end + 1
+        self.readline()
+
+    def expect_end(self, name):
+        # Binary blocks are followed by a newline before the end marker
+        while not self.at_end():
+            line = self.readline()
+            if line:
+                if line != b'$End' + name:
+                    raise MshFormatError(f"Expected $End{name.decode()}, got {line[:40]!r}")
+                return
+        raise MshFormatError(f"Missing $End{name.decode()} marker")
+
+
+class _Tokens:
+    """Numbers of an ASCII section, parsed from the map one block of lines at a time
+
+    Only the current block is held as text and floats, so reading a section
+    costs the arrays it fills plus about ASCII_BLOCK_BYTES, however large it is.
+    """
+
+    def __init__(self, data, start, end, name):
+        self.data = data
+        self.pos = start
+        self.end = end
+        self.name = name
+        self.pending = np.empty(0)
+
+    def _parse_block(self):
+        stop = min(self.pos + ASCII_BLOCK_BYTES, self.end)
+        if stop < self.end:
+            newline = self.data.find(b'\n', stop, self.end)
+            stop = self.end if newline == -1 else newline + 1
+        text = self.data[self.pos:stop]
+        self.pos = stop
+        if text.isspace():
+            # np.fromstring reads blank text as [-1.0]
+            return np.empty(0)
+        return np.fromstring(text, dtype=np.float64, sep=' ')
+
+    def peek(self, minimum):
+        """The numbers parsed but not yet consumed, at least `minimum` of them"""
+        if len(self.pending) < minimum:
+            parts = [self.pending]
+            available = len(self.pending)
+            while available < minimum:
+                if self.pos >= self.end:
+                    raise MshFormatError(f"Unexpected end of ${self.name} section")
+                parts.append(self._parse_block())
+                available += len(parts[-1])
+            self.pending = np.concatenate(parts)
+        return self.pending
+
+    def skip(self, count):
+        self.pending = self.pending[count:]
+
+    def take(self, count):
+        values = self.peek(count)[:count]
+        self.skip(count)
+        return values
+
+    def rows(self, count, width):
+        """Yield (start, rows) for the next `count` rows of `width` numbers, BLOCK_VALUES at a time"""
+        step = max(1, BLOCK_VALUES // width)
+        for start in range(0, count, step):
+            size = min(step, count - start)
+            yield start, self.take(size * width).reshape(size, width)
+
+
+class _RowStore:
+    """Integer rows appended block by block, kept in memory or in a file of a scratch folder"""
+
+    def __init__(self, width, directory=None):
+        self.width = width
+        self.count = 0
+        self.parts = []
+        self.file = None
+        if directory is not None:
+            fd, self.path = tempfile.mkstemp(suffix='.bin', dir=directory)
+            self.file = os.fdopen(fd, 'wb')
+
+    def append(self, rows):
+        rows = np.ascontiguousarray(rows, dtype=np.int64)
+        self.count += len(rows)
+        if self.file is not None:
+            rows.tofile(self.file)
+        else:
+            self.parts.append(rows)
+
+    def array(self):
+        if self.file is None:
+            return np.concatenate(self.parts) if self.parts else np.empty((0, self.width), dtype=np.int64)
+        self.file.close()
+        if self.count == 0:
+            return np.empty((0, self.width), dtype=np.int64)
+        return np.memmap(self.path, dtype=np.int64, mode='r', shape=(self.count, self.width))
+
+
+def _take_uniform_rows(flat, start, width, element_type, num_tags):
+    """Count consecutive MSH 2.2 element rows sharing the same type and tag count"""
+    max_rows = (len(flat) - start) // width
+    rows = flat[start:start + max_rows * width].reshape(max_rows, width)
+    matches = (rows[:, 1] == element_type) & (rows[:, 2] == num_tags)
+    count = max_rows if matches.all() else int(np.argmin(matches))
+    return rows[:count]
+
+
+class MshReader:
+    """Native NumPy reader for MSH 2.2 and 4.1 files (ASCII and binary)
+
+    With `scratch_dir`, arrays parsed from ASCII sections are disk-backed
+    files in that folder instead of memory, like the memory-mapped views of
+    binary files.
+    """
+
+    def __init__(self, path, scratch_dir=None):
+        self.path = path
+        self.scratch_dir = scratch_dir
+        self.msh = MshFile(path)
+        self.size_t = np.dtype('<u8')
+        self.int_t = np.dtype('<i4')
+        self.float_t = np.dtype('<f8')
+
+    def read(self):
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise MshFormatError(f"Empty MSH file: {self.path}")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse(_Buffer(data))
+        finally:
+            self._normalize_tags()
+            try:
+                data.close()
+            except BufferError:
+                # Coordinates and values are zero-copy views into the map,
+                # which is released once those arrays are garbage collected
+                pass
+        return self.msh
+
+    def _allocate(self, shape, dtype):
+        """Array filled from an ASCII section, in the scratch folder when there is one"""
+        if self.scratch_dir is None or np.prod(shape) == 0:
+            return np.empty(shape, dtype=dtype)
+        fd, path = tempfile.mkstemp(suffix='.npy', dir=self.scratch_dir)
+        os.close(fd)
+        return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+    def _normalize_tags(self):
+        msh = self.msh
+        if msh.node_tags is not None:
+            msh.node_tags = msh.node_tags.astype(np.int64, copy=False)
+        msh.elements = [(etype, tags.astype(np.int64, copy=False), conn.astype(np.int64, copy=False))
+                        for etype, tags, conn in msh.elements]
+        for block in msh.node_data:
+            block['tags'] = block['tags'].astype(np.int64, copy=False)
+
+    def _parse(self, buf):
+        while not buf.at_end():
+            line = buf.readline()
+            if not line.startswith(b'$') or line.startswith(b'$End'):
+                continue
+            name = line[1:]
+            if name == b'MeshFormat':
+                self._read_mesh_format(buf)
+            elif name == b'Nodes':
+                self._read_nodes(buf)
+            elif name == b'Elements':
+                self._read_elements(buf)
+            elif name == b'NodeData':
+                self._read_node_data(buf)
+            else:
+                buf.skip_section(name)
+
+    def _read_mesh_format(self, buf):
+        fields = buf.readline().split()
+        version, file_type, data_size = float(fields[0]), int(fields[1]), int(fields[2])
+        self.msh.version = version
+        self.msh.binary = file_type == 1
+        if not (2.0 <= version < 3.0 or version >= 4.1):
+            raise MshFormatError(f"Unsupported MSH version {version}")
+        if data_size != 8:
+            raise MshFormatError(f"Unsupported data size {data_size}")
+
+        if self.msh.binary:
+            one = buf.read_array('<i4', 1)[0]
+            if one != 1:
+                # File written on a machine with different endianness
+                self.size_t, self.int_t, self.float_t = np.dtype('>u8'), np.dtype('>i4'), np.dtype('>f8')
+        buf.expect_end(b'MeshFormat')
+
+    def _is_v4(self):
+        return self.msh.version is not None and self.msh.version >= 4
+
+    # ----------------------------------------------------------------- nodes
+
+    def _read_nodes(self, buf):
+        if self.msh.binary:
+            tags, coords = self._read_nodes_v4_binary(buf) if self._is_v4() else self._read_nodes_v2_binary(buf)
+            buf.expect_end(b'Nodes')
+        else:
+            tokens = buf.read_section_tokens(b'Nodes')
+            tags, coords = self._read_nodes_v4_ascii(tokens) if self._is_v4() else self._read_nodes_v2_ascii(tokens)
+        self.msh.node_tags = tags
+        self.msh.node_coords = coords
+
+    def _read_nodes_v2_ascii(self, tokens):
+        num_nodes = int(tokens.take(1)[0])
+        tags = self._allocate((num_nodes,), np.int64)
+        coords = self._allocate((num_nodes, 3), np.float64)
+        for start, rows in tokens.rows(num_nodes, 4):
+            tags[start:start + len(rows)] = rows[:, 0]
+            coords[start:start + len(rows)] = rows[:, 1:4]
+        return tags, coords
+
+    def _read_nodes_v2_binary(self, buf):
+        num_nodes = int(buf.readline())
+        node_dtype = np.dtype([('tag', self.int_t), ('xyz', self.float_t, (3,))])
+        records = buf.read_array(node_dtype, num_nodes)
+        return records['tag'], records['xyz']
+
+    def _read_nodes_v4_ascii(self, tokens):
+        header = tokens.take(4)
+        num_blocks, num_nodes = int(header[0]), int(header[1])
+        tags = self._allocate((num_nodes,), np.int64)
+        coords = self._allocate((num_nodes, 3), np.float64)
+        filled = 0
+        for _ in range(num_blocks):
+            entity_dim, _, parametric, count = (int(v) for v in tokens.take(4))
+            for start, rows in tokens.rows(count, 1):
+                tags[filled + start:filled + start + len(rows)] = rows[:, 0]
+            width = 3 + (entity_dim if parametric else 0)
+            for start, rows in tokens.rows(count, width):
+                coords[filled + start:filled + start + len(rows)] = rows[:, :3]
+            filled += count
+        return tags, coords
+
+    def _read_nodes_v4_binary(self, buf):
+        header = buf.read_array(self.size_t, 4)
+        num_blocks, num_nodes = int(header[0]), int(header[1])
+        if num_blocks == 1:
+            return self._read_node_block_v4_binary(buf)
+
+        tags = np.empty(num_nodes, dtype=np.int64)
+        coords = np.empty((num_nodes, 3))
+        filled = 0
+        for _ in range(num_blocks):
+            block_tags, block_coords = self._read_node_block_v4_binary(buf)
+            count = len(block_tags)
+            tags[filled:filled + count] = block_tags
+            coords[filled:filled + count] = block_coords
+            filled += count
+        return tags, coords
+
+    def _read_node_block_v4_binary(self, buf):
+        entity_dim, _, parametric = buf.read_array(self.int_t, 3)
+        count = int(buf.read_array(self.size_t, 1)[0])
+        tags = buf.read_array(self.size_t, count)
+        width = 3 + (int(entity_dim) if parametric else 0)
+        coords = buf.read_array(self.float_t, count * width).reshape(count, width)[:, :3]
+        return tags, coords
+
+    # -------------------------------------------------------------- elements
+
+    def _read_elements(self, buf):
+        if self.msh.binary:
+            blocks = self._read_elements_v4_binary(buf) if self._is_v4() else self._read_elements_v2_binary(buf)
+            buf.expect_end(b'Elements')
+            self.msh.elements = _merge_element_blocks(blocks)
+        else:
+            tokens = buf.read_section_tokens(b'Elements')
+            # (tag, node tags...) rows of each element type, in the order types first appear
+            stores = {}
+            if self._is_v4():
+                self._read_elements_v4_ascii(tokens, stores)
+            else:
+                self._read_elements_v2_ascii(tokens, stores)
+            self.msh.elements = []
+            for element_type, store in stores.items():
+                rows = store.array()
+                self.msh.elements.append((element_type, rows[:, 0], rows[:, 1:]))
+
+    def _element_store(self, stores, element_type):
+        if element_type not in stores:
+            stores[element_type] = _RowStore(1 + _nodes_per_element(element_type), self.scratch_dir)
+        return stores[element_type]
+
+    def _read_elements_v2_ascii(self, tokens, stores):
+        num_elements = int(tokens.take(1)[0])
+        read = 0
+        while read < num_elements:
+            window = tokens.peek(3)
+            element_type, num_tags = int(window[1]), int(window[2])
+            width = 3 + num_tags + _nodes_per_element(element_type)
+            rows = _take_uniform_rows(tokens.peek(width), 0, width, element_type, num_tags)[:num_elements - read]
+            if len(rows) == 0:
+                raise MshFormatError("Malformed $Elements block")
+            self._element_store(stores, element_type).append(rows[:, np.r_[0, 3 + num_tags:width]])
+            tokens.skip(len(rows) * width)
+            read += len(rows)
+
+    def _read_elements_v2_binary(self, buf):
+        num_elements = int(buf.readline())
+        blocks = []
+        read = 0
+        while read < num_elements:
+            element_type, count, num_tags = (int(v) for v in buf.read_array(self.int_t, 3))
+            num_nodes = _nodes_per_element(element_type)
+            rows = buf.read_array(self.int_t, count * (1 + num_tags + num_nodes)).reshape(count, -1)
+            blocks.append((element_type, rows[:, 0], rows[:, 1 + num_tags:]))
+            read += count
+        return blocks
+
+    def _read_elements_v4_ascii(self, tokens, stores):
+        num_blocks = int(tokens.take(4)[0])
+        for _ in range(num_blocks):
+            header = tokens.take(4)
+            element_type, count = int(header[2]), int(header[3])
+            store = self._element_store(stores, element_type)
+            for _, rows in tokens.rows(count, store.width):
+                store.append(rows)
+
+    def _read_elements_v4_binary(self, buf):
+        num_blocks = int(buf.read_array(self.size_t, 4)[0])
+        blocks = []
+        for _ in range(num_blocks):
+            element_type = int(buf.read_array(self.int_t, 3)[2])
+            count = int(buf.read_array(self.size_t, 1)[0])
+            width = 1 + _nodes_per_element(element_type)
+            rows = buf.read_array(self.size_t, count * width).reshape(count, width)
+            blocks.append((element_type, rows[:, 0], rows[:, 1:]))
+        return blocks
+
+    # ------------------------------------------------------------- node data
+
+    def _read_node_data(self, buf):
+        string_tags = [buf.readline().decode(errors='replace').strip('"') for _ in range(int(buf.readline()))]
+        real_tags = [float(buf.readline()) for _ in range(int(buf.readline()))]
+        integer_tags = [int(buf.readline()) for _ in range(int(buf.readline()))]
+        if len(integer_tags) < 3:
+            raise MshFormatError("Incomplete $NodeData integer tags")
+        step, num_comp, count = integer_tags[0], integer_tags[1], integer_tags[2]
+
+        if self.msh.binary:
+            record_dtype = np.dtype([('tag', self.int_t), ('values', self.float_t, (num_comp,))])
+            records = buf.read_array(record_dtype, count)
+            tags, values = records['tag'], records['values']
+            buf.expect_end(b'NodeData')
+        else:
+            tokens = buf.read_section_tokens(b'NodeData')
+            tags = self._allocate((count,), np.int64)
+            values = self._allocate((count, num_comp), np.float64)
+            for start, rows in tokens.rows(count, 1 + num_comp):
+                tags[start:start + len(rows)] = rows[:, 0]
+                values[start:start + len(rows)] = rows[:, 1:]
+
+        self.msh.node_data.append({
+            'name': string_tags[0] if string_tags else '',
+            'time': real_tags[0] if real_tags else 0.0,
+            'step': step,
+            'num_comp': num_comp,
+            'tags': tags,
+            'values': values.reshape(count, num_comp),
+        })
+
+
+def _nodes_per_element(element_type):
+    try:
+        return NODES_PER_ELEMENT[element_type]
+    except KeyError:
+        raise MshFormatError(f"Unsupported element type {element_type}")
+
+
+def _merge_element_blocks(blocks):
+    """Group element blocks by type, preserving the order types first appear"""
+    grouped = {}
+    for element_type, tags, connectivity in blocks:
+        grouped.setdefault(element_type, []).append((tags, connectivity))
+    merged = []
+    for element_type, parts in grouped.items():
+        if len(parts) == 1:
+            tags, connectivity = parts[0]
+        else:
+            tags = np.concatenate([p[0] for p in parts])
+            connectivity = np.concatenate([p[1] for p in parts])
+        merged.append((element_type, tags, connectivity))
+    return merged
+
+
+def read_msh(path, scratch_dir=None):
+    """Read nodes, elements and node data from an MSH file"""
+    return MshReader(path, scratch_dir).read()
+
+
+def node_tag_index(node_tags, max_tag=None):
+    """Build a lookup array mapping node tags to row indices (-1 for unknown tags)"""
+    node_tags = np.asarray(node_tags, dtype=np.int64)
+    if max_tag is None:
+        max_tag = int(node_tags.max(initial=0))
+    index = np.full(max_tag + 1, -1, dtype=np.int64)
+    index[node_tags] = np.arange(len(node_tags))
+    return index
+
+
+def align_node_data(tags, values, node_tags):
+    """Reorder node data values so that row i belongs to node_tags[i]
+
+    Nodes without data get zeros.
+    """
+    tags = np.asarray(tags, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values.reshape(len(tags), -1)
+    if len(tags) == len(node_tags) and np.array_equal(tags, node_tags):
+        return values
+
+    max_tag = int(max(tags.max(initial=0), node_tags.max(initial=0)))
+    rows = node_tag_index(tags, max_tag)[node_tags]
+    aligned = np.zeros((len(node_tags), values.shape[1]))
+    found = rows >= 0
+    aligned[found] = values[rows[found]]
+    if not found.all():
+        print(f"⚠️ {int((~found).sum())} nodes have no data, using zeros")
+    return aligned
+
+
+def node_data_index(tags, node_tags, scratch_dir=None):
+    """Lookup from node tags to rows of node data kept in file order (-1 for nodes without data)
+
+    Returns None when the data already follows node_tags. Lets the data be
+    aligned one chunk of nodes at a time (see take_node_data) instead of
+    copied whole; the lookup goes to `scratch_dir` when given.
+    """
+    if len(tags) == len(node_tags) and all(np.array_equal(tags[start:start + BLOCK_VALUES],
+                                                          node_tags[start:start + BLOCK_VALUES])
+                                           for start in range(0, len(tags), BLOCK_VALUES)):
+        return None
+    max_tag = int(max(tags.max(initial=0), node_tags.max(initial=0)))
+    if scratch_dir is None:
+        index = np.empty(max_tag + 1, dtype=np.int64)
+    else:
+        fd, path = tempfile.mkstemp(suffix='.npy', dir=scratch_dir)
+        os.close(fd)
+        index = np.lib.format.open_memmap(path, mode='w+', dtype=np.int64, shape=(max_tag + 1,))
+    index[:] = -1
+    for start in range(0, len(tags), BLOCK_VALUES):
+        stop = min(start + BLOCK_VALUES, len(tags))
+        index[np.asarray(tags[start:stop], dtype=np.int64)] = np.arange(start, stop)
+    return index
+
+
+def take_node_data(values, index, node_tags):
+    """Rows of `values` for a chunk of node_tags through a node_data_index lookup
+
+    Returns the rows (zeros for nodes without data) and how many nodes had none.
+    """
+    rows = index[np.asarray(node_tags, dtype=np.int64)]
+    found = rows >= 0
+    chunk = np.zeros((len(node_tags), values.shape[1]))
+    chunk[found] = values[rows[found]]
+    return chunk, int(len(found) - found.sum())
+
+
+def read_fossils_results(mesh_file, stress_tensor_file, force_vector_file, scratch_dir=None):
+    """Read the three MSH files written by Fossils with the native reader
+
+    Returns a dict with node_tags, node_coords, elements, and the stress and
+    force payloads aligned to node order together with their component counts.
+    With `scratch_dir` (streaming), ASCII sections are read into disk-backed
+    arrays there and the payloads stay in file order, with a `<key>_index`
+    lookup (see node_data_index) to align them chunk by chunk.
+    """
+    mesh = read_msh(mesh_file, scratch_dir)
+    if mesh.node_tags is None:
+        raise MshFormatError(f"No $Nodes section in {mesh_file}")
+
+    results = {
+        'reader': 'native',
+        'node_tags': mesh.node_tags,
+        'node_coords': mesh.node_coords,
+        'elements': mesh.elements,
+    }
+
+    for key, path in (('stress', stress_tensor_file), ('force', force_vector_file)):
+        view = read_msh(path, scratch_dir)
+        if not view.node_data:
+            raise MshFormatError(f"No $NodeData section in {path}")
+        block = view.node_data[0]
+        if scratch_dir is None:
+            results[key] = align_node_data(block['tags'], block['values'], mesh.node_tags)
+        else:
+            results[key] = block['values']
+            results[key + '_index'] = node_data_index(block['tags'], mesh.node_tags, scratch_dir)
+        results[key + '_num_comp'] = block['num_comp']
+        results[key + '_name'] = block['name']
+
+    return results
+
+
+# ----------------------------------------------------------------- gmsh fallback
+
+def initialize_gmsh_safely(gmsh):
+    """Initialize gmsh with complete cleanup and multiple fallback strategies"""
+    import signal
+
+    # First, try to completely cleanup any existing gmsh instance
+    try:
+        gmsh.finalize()
+    except Exception:
+        pass  # No existing gmsh instance
+
+    # Strategy 1: Complete signal disabling for PyInstaller
+    try:
+        original_handlers = {}
+        for sig in [signal.SIGINT, signal.SIGTERM]:
+            try:
+                original_handlers[sig] = signal.signal(sig, signal.SIG_IGN)
+            except (ValueError, OSError):
+                pass  # Signal not available on this platform or not in main thread
+
+        os.environ['GMSH_NO_SIGNAL'] = '1'
+        os.environ['GMSH_NO_INTERRUPT'] = '1'
+
+        try:
+            gmsh.initialize(['-noenv', '-nopopup', '-notty', '-nosigint', '-batch', '-nt', '-v', '0'])
+            return True
+        finally:
+            for sig, handler in original_handlers.items():
+                try:
+                    signal.signal(sig, handler)
+                except (ValueError, OSError):
+                    pass
+    except Exception as e:
+        print(f"⚠️ gmsh PyInstaller-compatible initialization failed: {e}")
+
+    # Strategy 2: Force-ignore all signal operations
+    try:
+        def null_handler(signum, frame):
+            pass
+
+        original_signal = signal.signal
+
+        def disabled_signal(sig, handler):
+            try:
+                return original_signal(sig, null_handler)
+            except Exception:
+                return signal.SIG_DFL
+
+        signal.signal = disabled_signal
+        try:
+            gmsh.initialize(['-batch', '-nt', '-v', '0'])
+            return True
+        finally:
+            signal.signal = original_signal
+    except Exception as e:
+        print(f"⚠️ gmsh force-ignore signal strategy failed: {e}")
+
+    # Strategy 3: Minimal initialization
+    try:
+        gmsh.initialize()
+        return True
+    except Exception as e:
+        print(f"⚠️ gmsh minimal initialization failed: {e}")
+
+    return False
+
+
+# Set by long-lived worker processes that keep one gmsh session for all jobs
+_keep_gmsh = False
+_persistent_gmsh = False
+
+
+def keep_gmsh_session():
+    """Keep gmsh initialized after the first fallback read, so later ones only need gmsh.clear()
+
+    gmsh itself is still imported and initialized on first use: most files
+    never need the fallback reader.
+    """
+    global _keep_gmsh
+    _keep_gmsh = True
+
+
+def read_fossils_results_with_gmsh(mesh_file, stress_tensor_file, force_vector_file):
+    """Read the Fossils MSH files through the gmsh API (fallback path)"""
+    global _persistent_gmsh
+    import gmsh
+
+    if _persistent_gmsh:
+        gmsh.clear()
+    elif not initialize_gmsh_safely(gmsh):
+        raise RuntimeError("All gmsh initialization strategies failed")
+    else:
+        _persistent_gmsh = _keep_gmsh
+
+    try:
+        try:
+            gmsh.option.setNumber("General.Terminal", 0)
+            gmsh.option.setNumber("General.Verbosity", 1)
+            gmsh.option.setNumber("General.AbortOnError", 0)
+        except Exception as e:
+            print(f"⚠️ Could not set the gmsh options: {e}")
+
+        gmsh.model.add("FossilsOutput")
+        gmsh.merge(mesh_file)
+        gmsh.merge(stress_tensor_file)
+        gmsh.merge(force_vector_file)
+
+        nodeTags, nodeCoords, _ = gmsh.model.mesh.getNodes()
+        node_tags = np.asarray(nodeTags, dtype=np.int64)
+        results = {
+            'reader': 'gmsh',
+            'node_tags': node_tags,
+            'node_coords': np.asarray(nodeCoords, dtype=np.float64).reshape(-1, 3),
+            'elements': [],
+        }
+
+        elementTypes, elementTags, nodeTagsPerElement = gmsh.model.mesh.getElements()
+        for element_type, tags, connectivity in zip(elementTypes, elementTags, nodeTagsPerElement):
+            num_nodes = gmsh.model.mesh.getElementProperties(element_type)[3]
+            results['elements'].append((int(element_type), np.asarray(tags, dtype=np.int64),
+                                        np.asarray(connectivity, dtype=np.int64).reshape(-1, num_nodes)))
+
+        # Identify the stress and force views by their number of components
+        view_tags = gmsh.view.getTags()
+        views = {}
+        for view_tag in view_tags:
+            dataType, tags, data, time, numComp = gmsh.view.getModelData(view_tag, 0)
+            key = 'stress' if len(data) > 0 and len(data[0]) >= 6 else 'force'
+            if key not in views:
+                views[key] = (tags, data, numComp)
+
+        if 'stress' not in views and view_tags:
+            dataType, tags, data, time, numComp = gmsh.view.getModelData(view_tags[0], 0)
+            views['stress'] = (tags, data, numComp)
+        if 'stress' not in views:
+            raise MshFormatError("No stress tensor view found after loading MSH files")
+
+        for key in ('stress', 'force'):
+            if key in views:
+                tags, data, numComp = views[key]
+                results[key] = align_node_data(tags, np.asarray(data, dtype=np.float64), node_tags)
+                results[key + '_num_comp'] = numComp
+            else:
+                results[key] = None
+                results[key + '_num_comp'] = None
+        return results
+    finally:
+        try:
+            gmsh.clear()
+            if not _persistent_gmsh:
+                gmsh.finalize()
+        except Exception as e:
+            print(f"⚠️ gmsh finalization failed: {e}")
+
+
+def load_fossils_results(mesh_file, stress_tensor_file, force_vector_file, allow_gmsh=True, scratch_dir=None):
+    """Read Fossils results natively, falling back to gmsh for unsupported files
+
+    `scratch_dir` is passed to read_fossils_results; the gmsh fallback always
+    reads the files into memory.
+    """
+    try:
+        return read_fossils_results(mesh_file, stress_tensor_file, force_vector_file, scratch_dir)
+    except (MshFormatError, ValueError, IndexError) as e:
+        if not allow_gmsh:
+            raise
+        print(f"⚠️ Native MSH reader could not parse the files ({e}), falling back to gmsh")
+    return read_fossils_results_with_gmsh(mesh_file, stress_tensor_file, force_vector_file)
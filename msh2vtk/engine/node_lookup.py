@@ -0,0 +1,104 @@
+import numpy as np
+from .optional import module_available
+
+# scipy is optional: without it lookups fall back to brute-force masks
+SCIPY_AVAILABLE = module_available('scipy.spatial')
+
+
+class NodeLocator:
+    """Spatial index over node coordinates for tolerance-based coordinate lookups
+
+    A node matches a query point when every coordinate differs by less than
+    `tolerance`, the same box test the summary export always used.
+    """
+
+    def __init__(self, coords, tolerance=1e-4):
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 3)
+        self.tolerance = tolerance
+        self.tree = None
+        if SCIPY_AVAILABLE:
+            from scipy.spatial import cKDTree
+            self.tree = cKDTree(self.coords)
+
+    def find(self, points):
+        """Find the nodes matching each point
+
+        Returns a list with one array of node row indices per point (sorted,
+        empty when nothing matches) and an array with the distance to the
+        nearest node for the points without matches (0.0 for the others).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if self.tree is not None:
+            # Chebyshev ball of radius tolerance == the per-axis box test
+            candidates = self.tree.query_ball_point(points, r=self.tolerance, p=np.inf, return_sorted=True)
+        else:
+            candidates = [np.flatnonzero(np.all(np.abs(self.coords - point) < self.tolerance, axis=1))
+                          for point in points]
+
+        matches = []
+        for point, indices in zip(points, candidates):
+            indices = np.asarray(indices, dtype=np.int64)
+            if len(indices):
+                # query_ball_point includes the boundary, the original test did not
+                indices = indices[np.all(np.abs(self.coords[indices] - point) < self.tolerance, axis=1)]
+            matches.append(indices)
+
+        distances = np.zeros(len(points))
+        missing = np.array([len(indices) == 0 for indices in matches], dtype=bool)
+        if missing.any():
+            distances[missing] = self.nearest_distance(points[missing])
+        return matches, distances
+
+    def nearest_distance(self, points):
+        """Euclidean distance from each point to its nearest node"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if len(self.coords) == 0:
+            return np.full(len(points), np.inf)
+        if self.tree is not None:
+            distances, _ = self.tree.query(points)
+            return distances
+        return np.array([np.sqrt(((self.coords - point) ** 2).sum(axis=1)).min() for point in points])
+
+
+class ChunkedNodeLocator:
+    """NodeLocator for a fixed set of points, fed the node coordinates one chunk at a time
+
+    Streaming mode keeps no index over every node: only the matches of the
+    points and their nearest distances so far. A chunk is only searched for
+    the points inside its bounding box (grown by `tolerance`) or closer to
+    it than their nearest node so far.
+    """
+
+    def __init__(self, points, tolerance=1e-4):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.tolerance = tolerance
+        self.matches = [[] for _ in self.points]  # per point, arrays of node row indices
+        self.nearest = np.full(len(self.points), np.inf)
+        self._rows = {}
+        for row, point in enumerate(self.points):
+            self._rows.setdefault(tuple(point), row)
+
+    def update(self, coords, start=0):
+        """Search the node coordinates of rows start, start + 1, ..."""
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        if len(coords) == 0 or len(self.points) == 0:
+            return
+        low, high = coords.min(axis=0), coords.max(axis=0)
+        inside = np.all((self.points > low - self.tolerance) & (self.points < high + self.tolerance), axis=1)
+        # Distance to the bounding box: no node of the chunk is closer
+        gaps = np.sqrt((np.maximum(0.0, np.maximum(low - self.points, self.points - high)) ** 2).sum(axis=1))
+        for row in np.flatnonzero(inside | (gaps < self.nearest)):
+            offsets = np.abs(coords - self.points[row])
+            indices = np.flatnonzero(np.all(offsets < self.tolerance, axis=1))
+            if len(indices):
+                self.matches[row].append(indices + start)
+            self.nearest[row] = min(self.nearest[row], float(np.sqrt((offsets ** 2).sum(axis=1)).min()))
+
+    def find(self, points):
+        """Same results as NodeLocator.find, for points given to the constructor"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        rows = [self._rows[tuple(point)] for point in points]
+        matches = [np.concatenate(self.matches[row]) if self.matches[row] else np.zeros(0, dtype=np.int64)
+                   for row in rows]
+        distances = np.array([0.0 if len(indices) else self.nearest[row] for row, indices in zip(rows, matches)])
+        return matches, distances
@@ -0,0 +1,19 @@
+import importlib.util
+
+# Heavy optional dependencies are probed with module_available() at import time
+# and only imported by the functions that use them, so the GUI, the command line
+# and the post-processing workers start without paying for libraries a run may
+# never touch (see benchmark_startup.py).
+
+
+def module_available(name):
+    """True when a module can be imported, without importing it (importlib.util.find_spec)
+
+    Only finds the module: one that is installed but fails to load (e.g. gmsh
+    without its shared libraries) is reported when it is first imported.
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # A dotted name whose parent package is missing
+        return False
@@ -0,0 +1,45 @@
+import os
+import sys
+
+
+def app_dir():
+    """Directory of the application: next to the executable, or the msh2vtk folder when run as scripts
+
+    The Fossils workspace and the Convert_to_csv worker live here.
+    """
+    if getattr(sys, 'frozen', False):
+        # Running as compiled executable
+        return os.path.dirname(sys.executable)
+    # Running as script: this module sits in msh2vtk/engine
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+DATA_DIR_ENV = "MSH2VTK_DATA_DIR"  # overrides where the learned and recorded files go
+
+
+def data_dir():
+    """Directory of the files msh2vtk records and learns (job ledger, metrics, runtime models, logs...)
+
+    MSH2VTK_DATA_DIR when set, else the application directory when writable,
+    else a per-user folder (%LOCALAPPDATA%\\msh2vtk on Windows,
+    $XDG_DATA_HOME/msh2vtk or ~/.local/share/msh2vtk elsewhere). Never the
+    current directory, so running from another folder finds the same files.
+    """
+    override = os.environ.get(DATA_DIR_ENV)
+    if override:
+        return os.path.abspath(override)
+    base_dir = app_dir()
+    if os.access(base_dir, os.W_OK):
+        return base_dir
+    if sys.platform == "win32":
+        user_dir = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    else:
+        user_dir = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(user_dir, "msh2vtk")
+
+
+def data_path(name):
+    """Path of a file (or folder) in data_dir(), creating the directory if needed"""
+    folder = data_dir()
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, name)
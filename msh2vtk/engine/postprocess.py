@@ -0,0 +1,490 @@
+import os
+import json
+import time
+import contextlib
+import numpy as np
+from .stress import compute_stress_fields, force_vectors
+from .msh_reader import load_fossils_results
+from .vtk_export import (build_unstructured_grid, save_grid, write_vtu_stream, VTU_FORMAT, LEGACY_FORMAT,
+                        DEFAULT_VTU_COMPRESSION)
+from .summary_stats import StressStats, summary_rows, DEFAULT_TRIMMED_PERCENTS, DEFAULT_PERCENTILES
+from .streaming import RunningStats, ScratchArrays, iter_result_chunks, remove_stale_scratch, DEFAULT_CHUNK_SIZE
+from .node_lookup import NodeLocator, ChunkedNodeLocator
+from .result_cache import cache_options, check_cache, update_manifest, clear_manifest
+from .result_store import build_result_columns, script_metadata, write_result_store, ResultStoreWriter
+from .workspace import find_msh_files
+from .metrics import PhaseTimer, MSH_LOAD, STRESS, WRITE, SUMMARY
+from .optional import module_available
+
+# Optional dependencies for MSH processing, probed without importing them:
+# gmsh is imported by the fallback reader, pyvista by the VTK writers
+GMSH_AVAILABLE = module_available('gmsh')
+if not GMSH_AVAILABLE:
+    print("⚠️  gmsh not available, only the native MSH reader will be used")
+
+PYVISTA_AVAILABLE = module_available('pyvista')
+if not PYVISTA_AVAILABLE:
+    print("⚠️  pyvista not available")
+    print("   Install with: pip install pyvista")
+    print("   VTK export will be disabled")
+
+# Per-axis distance within which a node matches an area of interest or fixation point
+SUMMARY_TOLERANCE = 1e-4
+
+
+def process_fossils_output(selected_file, export_von_mises=True, export_smooth_stress=True, export_vtk=True,
+                           export_columnar=False, vtk_format=VTU_FORMAT, force=False, streaming=False,
+                           chunk_size=DEFAULT_CHUNK_SIZE, vtk_compression=DEFAULT_VTU_COMPRESSION,
+                           trimmed_percents=DEFAULT_TRIMMED_PERCENTS, percentiles=DEFAULT_PERCENTILES, timer=None):
+    """Process Fossils output MSH files and convert them to CSV/VTK
+
+    Folders whose MSH inputs and export options match their cache manifest
+    are skipped unless `force` is set. With `streaming` the results are
+    exported chunk by chunk (see stream_fossils_output), which writes .vtu
+    only: legacy VTK export fails. The time spent loading, computing,
+    writing and summarizing goes to `timer` (PhaseTimer).
+    """
+    import pandas as pd
+
+    timer = timer if timer is not None else PhaseTimer()
+    if streaming and export_vtk and vtk_format == LEGACY_FORMAT:
+        print(f"❌ Cannot export {os.path.basename(selected_file)}: streaming mode writes .vtu, not legacy .vtk")
+        return False
+    try:
+        mesh_file, stress_tensor_file, force_vector_file = find_msh_files(selected_file)
+        
+        if not all([mesh_file, stress_tensor_file, force_vector_file]):
+            print(f"❌ Cannot find required MSH files for {os.path.basename(selected_file)}")
+            return False
+        
+        folder_path = os.path.dirname(mesh_file)
+        input_files = [selected_file, mesh_file, stress_tensor_file, force_vector_file]
+        options = cache_options(export_von_mises, export_smooth_stress, export_vtk, export_columnar, vtk_format,
+                                vtk_compression, trimmed_percents, percentiles, streaming)
+        if not force:
+            up_to_date, reason = check_cache(folder_path, input_files, options)
+            if up_to_date:
+                print(f"⏭️  Skipping {os.path.basename(selected_file)}: {reason}")
+                timer.counts['cached'] = True
+                return True
+        else:
+            reason = "forced"
+        clear_manifest(folder_path)
+        remove_stale_scratch(folder_path)
+        output_files = []
+
+        print(f"\n🔄 Processing MSH files in {os.path.basename(folder_path)} ({reason}):")
+        print(f"   📄 mesh.msh: {os.path.exists(mesh_file)}")
+        print(f"   📄 smooth_stress_tensor.msh: {os.path.exists(stress_tensor_file)}")
+        print(f"   📄 force_vector.msh: {os.path.exists(force_vector_file)}")
+
+        # Streaming reads ASCII sections into disk-backed arrays next to the outputs
+        scratch = ScratchArrays(folder_path) if streaming else None
+        try:
+            # Load MSH files
+            with timer.phase(MSH_LOAD):
+                results = load_fossils_results(mesh_file, stress_tensor_file, force_vector_file,
+                                               allow_gmsh=GMSH_AVAILABLE,
+                                               scratch_dir=scratch.directory if scratch is not None else None)
+            timer.counts['nodes'] = len(results['node_tags'])
+            timer.counts['elements'] = sum(len(tags) for _, tags, _ in results['elements'])
+
+            if streaming:
+                output_files += stream_fossils_output(
+                    selected_file, results, folder_path,
+                    export_von_mises=export_von_mises,
+                    export_smooth_stress=export_smooth_stress,
+                    export_vtk=export_vtk,
+                    export_columnar=export_columnar,
+                    vtk_format=vtk_format,
+                    vtk_compression=vtk_compression,
+                    chunk_size=chunk_size,
+                    trimmed_percents=trimmed_percents,
+                    percentiles=percentiles,
+                    timer=timer,
+                    scratch=scratch,
+                )
+                update_manifest(folder_path, input_files, options, output_files)
+                return True
+        finally:
+            if scratch is not None:
+                # Unmap the arrays read into the scratch folder before it is removed
+                results = None
+                scratch.close()
+
+        # Get node data
+        nodeTags = results['node_tags']
+        nodeCoords = results['node_coords']
+        nodeData = pd.DataFrame({
+            'NodeTag': nodeTags, 
+            'X': nodeCoords[:, 0], 
+            'Y': nodeCoords[:, 1], 
+            'Z': nodeCoords[:, 2]
+        })
+
+        # Process stress tensor data
+        principal = np.full((len(nodeTags), 3), np.nan)
+        max_shear = np.full(len(nodeTags), np.nan)
+        stress_fields = {'layout': None, 'components': np.zeros((len(nodeTags), 0))}
+        try:
+            data, numComp = results['stress'], results['stress_num_comp']
+            
+            # Layout is detected once for the whole view, then computed in one vectorized pass;
+            # principal stresses and max shear are only written to the VTK file
+            with timer.phase(STRESS):
+                stress_fields = compute_stress_fields(data, num_comp=numComp, num_nodes=len(nodeTags),
+                                                      principal=export_vtk)
+            svms = stress_fields['von_mises']
+            principal = stress_fields.get('principal', principal)
+            max_shear = stress_fields.get('max_shear', max_shear)
+            
+            svmData = pd.DataFrame({'Von mises Stress': svms}, index=nodeTags)
+            print(f"✅ Processed {len(svms)} stress values")
+            
+        except Exception as e:
+            print(f"❌ Error processing stress tensor data: {e}")
+            # Create dummy stress data to continue processing
+            svms = np.zeros(len(nodeTags))
+            svmData = pd.DataFrame({'Von mises Stress': svms}, index=nodeTags)
+            print("⚠️ Using dummy stress data to continue processing")
+
+        # Combine node and stress data
+        nodeData.reset_index(drop=True, inplace=True)
+        svmData.reset_index(drop=True, inplace=True)
+        combinedData = pd.concat([nodeData, svmData], axis=1)
+
+        # Process force vector data
+        forces = np.zeros((len(nodeTags), 3))  # Default to zeros
+        
+        if results['force'] is not None:
+            try:
+                with timer.phase(STRESS):
+                    forces = force_vectors(results['force'], num_nodes=len(nodeTags))
+                print(f"✅ Processed {len(forces)} force vectors")
+                
+            except Exception as e:
+                print(f"❌ Error processing force vector data: {e}")
+                forces = np.zeros((len(nodeTags), 3))
+                print("⚠️ Using dummy force data to continue processing")
+        else:
+            print("⚠️ No force view available, using zero forces")
+        
+        combinedData = pd.concat([combinedData, pd.DataFrame(forces, columns=['Fx', 'Fy', 'Fz'])], axis=1)
+
+        output_folder = folder_path
+
+        # Export smooth stress tensor to CSV
+        if export_smooth_stress:
+            csv_file = os.path.join(output_folder, 'smooth_stress_tensor.csv')
+            with timer.phase(WRITE):
+                combinedData.to_csv(csv_file, index=False)
+            output_files.append(csv_file)
+            print(f"✅ Smooth stress tensor exported: {os.path.basename(csv_file)}")
+
+        # Export columnar binary results (Parquet, or NPZ without pyarrow)
+        if export_columnar:
+            columns = build_result_columns(nodeTags, nodeCoords, svms, forces,
+                                           stress_fields['components'], stress_fields['layout'])
+            metadata = script_metadata(selected_file)
+            metadata.update({
+                'stress_layout': stress_fields['layout'],
+                'stress_view': results.get('stress_name'),
+                'force_view': results.get('force_name'),
+                'reader': results['reader'],
+            })
+            with timer.phase(WRITE):
+                store_file = write_result_store(output_folder, columns, metadata)
+            output_files.append(store_file)
+            print(f"✅ Columnar results exported: {os.path.basename(store_file)}")
+
+        # Export to VTK
+        if export_vtk and not PYVISTA_AVAILABLE:
+            print("⚠️ VTK export skipped (pyvista not available)")
+        elif export_vtk:
+            mesh = build_unstructured_grid(nodeCoords, nodeTags, results['elements'])
+            mesh.point_data['Von mises Stress'] = svms
+            mesh.point_data['Principal Stress'] = principal
+            mesh.point_data['Max Shear Stress'] = max_shear
+            mesh.point_data['Forces'] = forces
+            with timer.phase(WRITE):
+                vtk_file_path = save_grid(mesh, output_folder, vtk_format=vtk_format, compression=vtk_compression)
+            output_files.append(vtk_file_path)
+            print(f"✅ VTK file exported: {os.path.basename(vtk_file_path)}")
+
+        # Export Von Mises stress summary
+        if export_von_mises:
+            with timer.phase(SUMMARY):
+                export_von_mises_summary(selected_file, output_folder, nodeCoords, svms, forces,
+                                         trimmed_percents=trimmed_percents, percentiles=percentiles)
+            output_files.append(os.path.join(output_folder, 'von_mises_stress_results.csv'))
+
+        update_manifest(folder_path, input_files, options, output_files)
+        return True
+
+    except Exception as e:
+        print(f"❌ Error processing MSH files for {os.path.basename(selected_file)}: {e}")
+        return False
+
+def stream_fossils_output(selected_file, results, output_folder, export_von_mises=True, export_smooth_stress=True,
+                          export_vtk=True, export_columnar=False, vtk_format=VTU_FORMAT,
+                          vtk_compression=DEFAULT_VTU_COMPRESSION, chunk_size=DEFAULT_CHUNK_SIZE,
+                          trimmed_percents=DEFAULT_TRIMMED_PERCENTS, percentiles=DEFAULT_PERCENTILES, timer=None,
+                          scratch=None):
+    """Export Fossils results chunk by chunk with bounded memory
+
+    Stress and force fields are computed `chunk_size` nodes at a time and
+    appended to the CSV and columnar outputs as they are produced. Per-node
+    fields needed later (VTU arrays, summary values) are kept in disk-backed
+    scratch arrays (in `scratch`, a ScratchArrays, when given), the summary
+    points are matched chunk by chunk and the summary statistics are running
+    approximations. Returns the list of written files.
+    """
+    import pandas as pd
+
+    timer = timer if timer is not None else PhaseTimer()
+    output_files = []
+    num_nodes = len(results['node_tags'])
+    stats = RunningStats()
+
+    if export_vtk and vtk_format == LEGACY_FORMAT:
+        raise ValueError("legacy VTK is not available in streaming mode, only .vtu")
+
+    store = None
+    if export_columnar:
+        metadata = script_metadata(selected_file)
+        metadata.update({
+            'stress_view': results.get('stress_name'),
+            'force_view': results.get('force_name'),
+            'reader': results['reader'],
+        })
+        store = ResultStoreWriter(output_folder, metadata)
+
+    if export_von_mises:
+        # The summary points are matched chunk by chunk, without an index over every node
+        points = summary_points(selected_file)
+        locator = summary_locator(points)
+
+    csv_file = os.path.join(output_folder, 'smooth_stress_tensor.csv')
+    with ScratchArrays(output_folder) if scratch is None else contextlib.nullcontext(scratch) as scratch:
+        von_mises = scratch.create('von_mises', (num_nodes,))
+        forces = scratch.create('forces', (num_nodes, 3))
+        if export_vtk:
+            principal = scratch.create('principal', (num_nodes, 3))
+            max_shear = scratch.create('max_shear', (num_nodes,))
+
+        with open(csv_file, 'w', newline='') if export_smooth_stress else contextlib.nullcontext() as csv:
+            # Chunks are computed lazily: time spent producing them is the stress phase
+            for chunk in timer.iterate(STRESS, iter_result_chunks(results, chunk_size, principal=export_vtk)):
+                start, stop = chunk['start'], chunk['stop']
+                von_mises[start:stop] = chunk['von_mises']
+                forces[start:stop] = chunk['forces']
+                if export_vtk:
+                    principal[start:stop] = chunk['principal']
+                    max_shear[start:stop] = chunk['max_shear']
+                stats.update(chunk['von_mises'], chunk['node_coords'])
+                if export_von_mises:
+                    locator.update(chunk['node_coords'], start)
+
+                if csv is not None:
+                    write_start = time.perf_counter()
+                    coords = chunk['node_coords']
+                    pd.DataFrame({
+                        'NodeTag': chunk['node_tags'],
+                        'X': coords[:, 0],
+                        'Y': coords[:, 1],
+                        'Z': coords[:, 2],
+                        'Von mises Stress': chunk['von_mises'],
+                        'Fx': chunk['forces'][:, 0],
+                        'Fy': chunk['forces'][:, 1],
+                        'Fz': chunk['forces'][:, 2],
+                    }).to_csv(csv, header=start == 0, index=False)
+                    timer.add(WRITE, time.perf_counter() - write_start)
+
+                if store is not None:
+                    store.metadata.setdefault('stress_layout', chunk['layout'])
+                    with timer.phase(WRITE):
+                        store.write(build_result_columns(chunk['node_tags'], chunk['node_coords'], chunk['von_mises'],
+                                                         chunk['forces'], chunk['components'], chunk['layout']))
+                print(f"   🔄 Streamed {stop}/{num_nodes} nodes")
+
+        if export_smooth_stress:
+            output_files.append(csv_file)
+            print(f"✅ Smooth stress tensor exported: {os.path.basename(csv_file)}")
+        if store is not None:
+            output_files.append(store.close())
+            print(f"✅ Columnar results exported: {os.path.basename(store.path)}")
+
+        if export_vtk:
+            with timer.phase(WRITE):
+                vtk_file_path = write_vtu_stream(
+                    os.path.join(output_folder, 'combined_data.vtu'),
+                    results['node_coords'], results['node_tags'], results['elements'],
+                    {
+                        'Von mises Stress': von_mises,
+                        'Principal Stress': principal,
+                        'Max Shear Stress': max_shear,
+                        'Forces': forces,
+                    },
+                    compression=vtk_compression,
+                    chunk_size=chunk_size,
+                )
+            output_files.append(vtk_file_path)
+            print(f"✅ VTK file exported: {os.path.basename(vtk_file_path)}")
+            del principal, max_shear
+
+        if export_von_mises:
+            with timer.phase(SUMMARY):
+                export_von_mises_summary(selected_file, output_folder, results['node_coords'], von_mises, forces,
+                                         stats, trimmed_percents, percentiles, points, locator)
+            output_files.append(os.path.join(output_folder, 'von_mises_stress_results.csv'))
+        del von_mises, forces
+
+    return output_files
+
+def export_von_mises_summary(selected_file, output_folder, coords, stress_values, forces, stats=None,
+                             trimmed_percents=DEFAULT_TRIMMED_PERCENTS, percentiles=DEFAULT_PERCENTILES,
+                             points=None, locator=None):
+    """Export Von Mises stress summary and analysis
+
+    Basic statistics come from `stats` (a RunningStats) when given,
+    otherwise they are computed exactly from `stress_values`. `points` are
+    the summary_points of the script (read when None), looked up with
+    `locator` (a NodeLocator over `coords` when None).
+    """
+    import pandas as pd
+
+    try:
+        # Basic statistics, trimmed means and percentiles
+        if stats is None:
+            stats = StressStats(stress_values, coords, trimmed_percents, percentiles)
+        results_list = summary_rows(stats, trimmed_percents, percentiles)
+
+        areas, fixations = points if points is not None else summary_points(selected_file)
+        if locator is None:
+            # Spatial index over node coordinates, shared by areas of interest and fixations
+            locator = NodeLocator(coords, SUMMARY_TOLERANCE)
+
+        # Areas of interest from the Python file
+        for name, area_points in areas:
+            matches, distances = locator.find(area_points)
+            von_mises_stresses = []
+            for (x, y, z), indices, distance in zip(area_points, matches, distances):
+                if len(indices):
+                    von_mises_stresses.append(stress_values[indices].mean())
+                else:
+                    print(f"   ⚠️  Coordinates ({x:.2f}, {y:.2f}, {z:.2f}) not found in data (nearest node at {distance:.2e})")
+            if von_mises_stresses:
+                results_list.append({
+                    'Value': name,
+                    'Von mises Stress': np.mean(von_mises_stresses),
+                    'Coordinate X': None,
+                    'Coordinate Y': None,
+                    'Coordinate Z': None,
+                    'Number of nodes': len(von_mises_stresses)
+                })
+
+        # Process fixations (if available)
+        process_fixations_data(fixations, forces, results_list, locator)
+
+        # Save results
+        results_df = pd.DataFrame(results_list)
+        results_csv = os.path.join(output_folder, 'von_mises_stress_results.csv')
+        results_df.to_csv(results_csv, index=False)
+        
+        print(f"✅ Von Mises stress summary exported: {os.path.basename(results_csv)}")
+        print(f"   📊 Max stress: {stats.maximum:.2f}")
+        print(f"   📊 Min stress: {stats.minimum:.2f}")
+        print(f"   📊 Avg stress: {stats.mean:.2f}")
+        
+    except Exception as e:
+        print(f"   ❌ Error creating Von Mises summary: {e}")
+
+def summary_points(selected_file):
+    """Points the summary looks up, from the comments and parameters of a Fossils script
+
+    Returns the areas of interest as (name, (k, 3) points) pairs and the
+    fixation dicts (None when the script has none).
+    """
+    areas = []
+    fixations = None
+    if not os.path.exists(selected_file):
+        return areas, fixations
+
+    found_areas_of_interest = False
+    with open(selected_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if found_areas_of_interest and line.startswith("#"):
+                try:
+                    name, coordinates_str = line.strip("#").strip().split(":")
+                    coordinates_list = json.loads(coordinates_str)
+                    points = np.array([[float(str(coord).strip()) for coord in coord_group]
+                                       for coord_group in coordinates_list]).reshape(-1, 3)
+                    areas.append((name.strip(), points))
+                except Exception as e:
+                    print(f"   ⚠️  Error processing coordinates: {e}")
+            elif "# Areas of interest" in line:
+                found_areas_of_interest = True
+
+    accumulating = False
+    json_string = ""
+    with open(selected_file, 'r', encoding='utf-8') as f:
+        previous_line = ''
+        for line in f:
+            if 'p[' in line and 'fixations' in line:
+                accumulating = True
+                json_string = '{"fixations":' + line.split('fixations')[1].split('] = ')[1].strip()
+            elif accumulating:
+                if line.strip().startswith('p') and previous_line.strip().endswith(']'):
+                    json_string += previous_line.strip() + "}"
+                    json_string = json_string[:-3] + "]}"
+
+                    accumulating = False
+                    try:
+                        fixations = (fixations or []) + json.loads(json_string.replace("'", '"'))['fixations']
+                    except json.JSONDecodeError as e:
+                        print(f"   ⚠️  Error decoding fixations JSON: {e}")
+                    json_string = ""
+                else:
+                    json_string += line.strip()
+                    previous_line = line
+    return areas, fixations
+
+def summary_locator(points):
+    """ChunkedNodeLocator for the summary_points of a script, fed chunk by chunk in streaming mode"""
+    areas, fixations = points
+    query = [area_points for _, area_points in areas]
+    for fixation in fixations or ():
+        try:
+            query.append(np.asarray(fixation['nodes'][0], dtype=np.float64).reshape(1, 3))
+        except (KeyError, IndexError, TypeError, ValueError):
+            pass  # Reported by process_fixations_data
+    return ChunkedNodeLocator(np.concatenate(query) if query else np.zeros((0, 3)), SUMMARY_TOLERANCE)
+
+def process_fixations_data(fixations, forces, results_list, locator):
+    """Add the forces at the fixation nodes to the summary rows"""
+    try:
+        if fixations is None:
+            print("   ℹ️  No fixations found in Python file")
+            return
+
+        points = [fixation['nodes'][0] for fixation in fixations]
+        matches, distances = locator.find(points)
+        for fixation, indices, distance in zip(fixations, matches, distances):
+            x, y, z = fixation['nodes'][0]
+            if len(indices):
+                fx, fy, fz = forces[indices[0]]
+                results_list.append({
+                    'Value': fixation['name'],
+                    'Von mises Stress': None,
+                    'Coordinate X': x,
+                    'Coordinate Y': y,
+                    'Coordinate Z': z,
+                    'Fx': fx,
+                    'Fy': fy,
+                    'Fz': fz
+                })
+            else:
+                print(f"   ⚠️  Fixation node ({x:.2f}, {y:.2f}, {z:.2f}) not found (nearest node at {distance:.2e})")
+
+    except Exception as e:
+        print(f"   ⚠️  Error processing fixations: {e}")
@@ -0,0 +1,345 @@
+import os
+import sys
+import json
+import queue
+import platform
+import threading
+import subprocess
+from .paths import app_dir
+from .metrics import PhaseTimer
+
+# Post-processing workers are sized independently of the Fossils slots
+DEFAULT_POSTPROCESS_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+# Seconds a worker process may spend on one job before it is killed and restarted (0: no limit)
+DEFAULT_POSTPROCESS_TIMEOUT = 2 * 3600
+
+SERVE_FLAG = "--serve-postprocess"
+
+
+def postprocess_worker_command():
+    """Command that starts a post-processing worker (frozen executable or script)"""
+    # The converter sits next to the executable, or next to main.py when run as scripts
+    base_dir = app_dir()
+
+    executable_name = 'Convert_to_csv.exe' if platform.system() == "Windows" else 'Convert_to_csv'
+    executable_path = os.path.join(base_dir, executable_name)
+    script_path = os.path.join(base_dir, 'Convert_to_csv.py')
+
+    if os.path.isfile(executable_path):
+        return [executable_path, SERVE_FLAG]
+    if os.path.isfile(script_path):
+        return [sys.executable, script_path, SERVE_FLAG]
+    return None
+
+
+class PostProcessJob:
+    """A post-processing request and its outcome"""
+
+    def __init__(self, job_id, file, options, on_log):
+        self.id = job_id
+        self.file = file
+        self.options = options
+        self.on_log = on_log
+        self.ok = False
+        self.error = None
+        self.metrics = {}  # PhaseTimer.as_dict() of the job (phase seconds, node count)
+        self.cancelled = False
+        self.done = threading.Event()
+        self._stop = None  # set while a worker process runs the job: kills it
+
+    def cancel(self):
+        """Drop the job, or kill the worker process running it (an in-process job still completes)"""
+        self.cancelled = True
+        stop = self._stop
+        if stop is not None:
+            stop("cancelled")
+
+    def finish(self, ok, error=None, metrics=None):
+        self.ok = ok
+        self.error = error
+        self.metrics = metrics or {}
+        self.done.set()
+
+    def wait(self, timeout=None):
+        self.done.wait(timeout)
+        return self.ok
+
+
+class _JobWatch:
+    """Kills the worker process running a job when the job is cancelled or times out"""
+
+    def __init__(self, process, job, timeout):
+        self.process = process
+        self.job = job
+        self.reason = None  # why the worker was killed
+        self._lock = threading.Lock()
+        self._timer = None
+        job._stop = self.stop
+        if job.cancelled:
+            self.stop("cancelled")
+        elif timeout:
+            self._timer = threading.Timer(timeout, self.stop, (f"timed out after {timeout:g} s",))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def stop(self, reason):
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+        print(f"🛑 Stopping post-processing worker (PID: {self.process.pid}) for "
+              f"{os.path.basename(self.job.file)}: {reason}")
+        try:
+            self.process.kill()
+        except OSError:
+            pass
+
+    def close(self):
+        self.job._stop = None
+        if self._timer is not None:
+            self._timer.cancel()
+
+
+class PostProcessPool:
+    """Pool of long-lived worker processes running process_fossils_output
+
+    Each worker imports numpy/pandas/pyvista and initializes gmsh at most once
+    (on first use), then handles jobs one after another. A crashing worker only fails its current
+    job and is restarted for the next one, as is a worker killed because its
+    job ran longer than `job_timeout` seconds or was cancelled. Without a
+    worker executable the same `size` slots run the jobs in this process
+    instead, without timeout.
+    """
+
+    def __init__(self, size=DEFAULT_POSTPROCESS_WORKERS, command=None, job_timeout=DEFAULT_POSTPROCESS_TIMEOUT):
+        self.size = max(1, int(size))
+        self.job_timeout = job_timeout
+        self.command = command if command is not None else postprocess_worker_command()
+        self.tasks = queue.Queue()
+        self.processes = {}
+        self.active_jobs = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._threads = []
+
+        loop = self._worker_loop
+        if self.command is None:
+            print("⚠️  Post-processing worker not found, MSH processing will run in-process")
+            loop = self._in_process_loop
+
+        for slot in range(self.size):
+            thread = threading.Thread(target=loop, args=(slot,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, file, options, on_log=print):
+        """Queue a file for post-processing and return its PostProcessJob"""
+        with self._lock:
+            self._next_id += 1
+            job = PostProcessJob(self._next_id, file, options, on_log)
+            self.active_jobs += 1
+        self.tasks.put(job)
+        return job
+
+    def process(self, file, on_log=print, **options):
+        """Post-process a file and block until it is done"""
+        job = self.submit(file, options, on_log)
+        job.wait()
+        if job.error:
+            print(f"❌ Post-processing error for {os.path.basename(file)}: {job.error}")
+        return job.ok
+
+    def is_idle(self):
+        with self._lock:
+            return self.active_jobs == 0
+
+    def shutdown(self):
+        """Stop all workers"""
+        for _ in self._threads:
+            self.tasks.put(None)
+        with self._lock:
+            processes = list(self.processes.values())
+            self.processes.clear()
+        for process in processes:
+            try:
+                process.stdin.close()
+                process.wait(timeout=5)
+            except Exception:
+                process.kill()
+
+    def _finish(self, job, ok, error=None, metrics=None):
+        with self._lock:
+            self.active_jobs -= 1
+        job.finish(ok, error, metrics)
+
+    def _in_process_loop(self, slot):
+        """Slot thread without a worker process: runs the queued jobs in this process"""
+        while True:
+            job = self.tasks.get()
+            if job is None:
+                break
+            self._run_in_process(job)
+
+    def _run_in_process(self, job):
+        from .postprocess import process_fossils_output
+        if job.cancelled:
+            self._finish(job, False, "cancelled")
+            return
+        timer = PhaseTimer()
+        try:
+            ok = bool(process_fossils_output(job.file, timer=timer, **job.options))
+            self._finish(job, ok, metrics=timer.as_dict())
+        except Exception as e:
+            self._finish(job, False, str(e), timer.as_dict())
+
+    def _start_worker(self, slot):
+        process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+        )
+        with self._lock:
+            self.processes[slot] = process
+        print(f"🔧 Started post-processing worker {slot + 1} (PID: {process.pid})")
+        return process
+
+    def _worker_loop(self, slot):
+        process = None
+        while True:
+            job = self.tasks.get()
+            if job is None:
+                break
+            if job.cancelled:
+                self._finish(job, False, "cancelled")
+                continue
+
+            # A worker that died while idle is only noticed when the job is sent:
+            # restart it once if it exits before answering anything
+            for attempt in range(2):
+                try:
+                    if process is None or process.poll() is not None:
+                        process = self._start_worker(slot)
+                    request = {'id': job.id, 'file': job.file, 'options': job.options}
+                    process.stdin.write(json.dumps(request) + '\n')
+                    process.stdin.flush()
+                except OSError as e:
+                    process = None
+                    if attempt == 0:
+                        continue
+                    self._finish(job, False, f"could not start worker: {e}")
+                    break
+
+                watch = _JobWatch(process, job, self.job_timeout)
+                try:
+                    finished, answered = self._read_job_output(process, job)
+                finally:
+                    watch.close()
+                if finished:
+                    break
+                code = process.wait()
+                process = None
+                if watch.reason is not None:
+                    self._finish(job, False, watch.reason)
+                    break
+                if answered or attempt == 1:
+                    self._finish(job, False, f"worker exited with code {code}")
+                    break
+
+    def _read_job_output(self, process, job):
+        """Forward worker output for a job; return (finished, answered)"""
+        answered = False
+        for line in process.stdout:
+            answered = True
+            line = line.rstrip('\n')
+            try:
+                message = json.loads(line)
+            except ValueError:
+                # Output written straight to the file descriptor (e.g. by gmsh)
+                job.on_log(line)
+                continue
+            if not isinstance(message, dict):
+                job.on_log(line)
+            elif message.get('type') == 'log':
+                job.on_log(message.get('text', ''))
+            elif message.get('type') == 'result' and message.get('id') == job.id:
+                self._finish(job, bool(message.get('ok')), message.get('error'), message.get('metrics'))
+                return True, answered
+        return False, answered
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_postprocess_pool(size=DEFAULT_POSTPROCESS_WORKERS, job_timeout=DEFAULT_POSTPROCESS_TIMEOUT):
+    """Return the shared pool, resizing it when idle; `job_timeout` applies to the jobs started from now on"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool.size != size and _pool.is_idle():
+            _pool.shutdown()
+            _pool = None
+        if _pool is None:
+            _pool = PostProcessPool(size, job_timeout=job_timeout)
+        _pool.job_timeout = job_timeout
+        return _pool
+
+
+def shutdown_postprocess_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+class _ProtocolLogWriter:
+    """stdout replacement in workers that forwards complete lines as log messages"""
+
+    def __init__(self, send):
+        self.send = send
+        self.buffer = ""
+
+    def write(self, string):
+        self.buffer += string
+        while '\n' in self.buffer:
+            line, self.buffer = self.buffer.split('\n', 1)
+            self.send({'type': 'log', 'text': line})
+        return len(string)
+
+    def flush(self):
+        pass
+
+
+def serve_worker():
+    """Worker loop: read jobs from stdin, stream logs and results to stdout"""
+    protocol = sys.stdout
+    lock = threading.Lock()
+
+    def send(message):
+        with lock:
+            protocol.write(json.dumps(message) + '\n')
+            protocol.flush()
+
+    sys.stdout = sys.stderr = _ProtocolLogWriter(send)
+
+    # Libraries are imported on first use and stay loaded for the next jobs,
+    # as does gmsh once the fallback reader needs it
+    from .postprocess import process_fossils_output
+    from .msh_reader import keep_gmsh_session
+    keep_gmsh_session()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        timer = PhaseTimer()
+        try:
+            ok = process_fossils_output(job['file'], timer=timer, **job.get('options', {}))
+            send({'type': 'result', 'id': job['id'], 'ok': bool(ok), 'metrics': timer.as_dict()})
+        except Exception as e:
+            send({'type': 'result', 'id': job['id'], 'ok': False, 'error': str(e), 'metrics': timer.as_dict()})
@@ -0,0 +1,63 @@
+import os
+import signal
+import platform
+import subprocess
+
+# psutil is optional: without it process trees are killed through their
+# process group (POSIX) or taskkill /T (Windows)
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Seconds a process tree gets to exit after SIGTERM before it is killed
+TERMINATE_GRACE = 10.0
+
+
+def session_kwargs():
+    """Popen arguments that put a child in its own process group, so its whole tree can be killed"""
+    if platform.system() == "Windows":
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def kill_process_tree(process, grace=TERMINATE_GRACE):
+    """Terminate a Popen process and all its descendants, killing whatever survives the grace period"""
+    if PSUTIL_AVAILABLE:
+        try:
+            parent = psutil.Process(process.pid)
+            tree = parent.children(recursive=True) + [parent]
+        except psutil.Error:
+            tree = []
+        for child in tree:
+            try:
+                child.terminate()
+            except psutil.Error:
+                pass
+        _, alive = psutil.wait_procs(tree, timeout=grace)
+        for child in alive:
+            try:
+                child.kill()
+            except psutil.Error:
+                pass
+        return
+
+    if platform.system() == "Windows":
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+
+    # POSIX: the child leads its own session (session_kwargs), signal the whole group
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        return
+    try:
+        process.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import zipfile
+import tempfile
+import urllib.parse
+from .joblog import JOB_LOG_NAME
+
+# Coordinator/worker protocol (HTTP + JSON, job bundles and results as zip archives):
+#   GET    /status               -> {"protocol", "host", "slots", "active"}
+#   POST   /jobs?script=NAME.py  body: job bundle, X-Job-Settings header -> {"id"} (503 when every slot is busy)
+#   GET    /jobs/ID?since=N      -> {"state", "finished", "success", "lines", "seen", "metrics", "error"}
+#   GET    /jobs/ID/results      -> zip of the output folder (after "finished")
+#   DELETE /jobs/ID              -> cancel a running job, or delete a finished one and its files
+PROTOCOL_VERSION = 1
+DEFAULT_WORKER_PORT = 8750
+TOKEN_HEADER = "X-Worker-Token"     # shared secret, required when the worker was started with --token
+SETTINGS_HEADER = "X-Job-Settings"  # JSON: post-processing options, timeouts and retries of the job
+
+REMOTE_POLL_INTERVAL = 1.0    # seconds between status requests for a remote job
+REMOTE_LOST_TIMEOUT = 60      # a worker unreachable this long has lost its job (which is retried)
+REMOTE_OFFLINE_DELAY = 60     # seconds a lost worker gets no new jobs
+REQUEST_TIMEOUT = 30
+CHUNK_SIZE = 1024 ** 2
+
+# Files of a script folder that are results of an earlier run, not inputs
+RESULT_EXTENSIONS = ('.msh', '.csv', '.vtu', '.vtk', '.npz', '.parquet')
+
+
+class RemoteError(Exception):
+    """A worker could not be reached or refused a request (status is the HTTP code, if any)"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def job_inputs(script):
+    """(path, name in the bundle) of the files a Fossils script needs
+
+    The script itself and the folder named after it, where the exporter
+    writes the STLs that p['bone'] and p['muscles'] refer to.
+    """
+    files = [(script, os.path.basename(script))]
+    folder = os.path.splitext(script)[0]
+    base_name = os.path.basename(folder)
+    for root, dirs, filenames in os.walk(folder):
+        for filename in sorted(filenames):
+            if filename.startswith(JOB_LOG_NAME) or filename.lower().endswith(RESULT_EXTENSIONS):
+                continue
+            path = os.path.join(root, filename)
+            files.append((path, f"{base_name}/{os.path.relpath(path, folder).replace(os.sep, '/')}"))
+    return files
+
+
+def write_zip(files, target):
+    """Write (path, name) pairs to a zip archive (a path or a binary file object)"""
+    with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for path, name in files:
+            archive.write(path, name)
+
+
+def folder_files(folder, exclude=()):
+    """(path, relative name) of every file below folder, except the names in exclude"""
+    files = []
+    for root, dirs, filenames in os.walk(folder):
+        for filename in sorted(filenames):
+            path = os.path.join(root, filename)
+            name = os.path.relpath(path, folder).replace(os.sep, '/')
+            if name not in exclude:
+                files.append((path, name))
+    return files
+
+
+def extract_zip(source, folder):
+    """Extract a zip archive into folder and return the number of files
+
+    Entries with absolute paths or '..' are refused: archives come from the network.
+    """
+    root = os.path.realpath(folder)
+    with zipfile.ZipFile(source) as archive:
+        members = archive.infolist()
+        for member in members:
+            target = os.path.realpath(os.path.join(root, member.filename))
+            if os.path.commonpath([root, target]) != root or target == root:
+                raise ValueError(f"unsafe path in archive: {member.filename}")
+        os.makedirs(root, exist_ok=True)
+        archive.extractall(root)
+    return sum(1 for member in members if not member.is_dir())
+
+
+class RemoteWorker:
+    """Coordinator side of a worker agent: its job slots and the requests of the protocol
+
+    All requests go through one requests.Session, so the connection to the
+    worker is reused. Network problems and refused requests raise RemoteError.
+    """
+
+    def __init__(self, address, token=""):
+        url = address if "://" in address else f"http://{address}"
+        self.url = url.rstrip('/')
+        self.name = urllib.parse.urlsplit(self.url).netloc or address
+        self.token = token
+        self.slots = 0  # reported by the worker on connect()
+        self.active = 0  # jobs of this batch running there
+        self.offline_until = 0.0
+        # requests is only imported by batches that use remote workers
+        import requests
+        self._session = requests.Session()
+
+    def _request(self, method, path, timeout=REQUEST_TIMEOUT, headers=None, **kwargs):
+        import requests
+
+        headers = dict(headers or {})
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        try:
+            response = self._session.request(method, self.url + path, headers=headers, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            raise RemoteError(f"{self.name} unreachable: {e}") from e
+        if response.status_code >= 400:
+            try:
+                reason = response.json().get('error', '')
+            except ValueError:
+                reason = response.reason
+            response.close()
+            raise RemoteError(f"{self.name}: HTTP {response.status_code} {reason}", response.status_code)
+        return response
+
+    def connect(self):
+        """Ask the worker how many jobs it runs at once; False when it is unavailable"""
+        try:
+            status = self._request('GET', '/status', timeout=5).json()
+        except (RemoteError, ValueError) as e:
+            print(f"⚠️  Remote worker {self.name} unavailable: {e}")
+            self.slots = 0
+            return False
+        if status.get('protocol') != PROTOCOL_VERSION:
+            print(f"⚠️  Remote worker {self.name} speaks protocol {status.get('protocol')}, expected {PROTOCOL_VERSION}")
+            self.slots = 0
+            return False
+        self.slots = max(0, int(status.get('slots', 0)))
+        print(f"🌐 Remote worker {self.name} ({status.get('host', '?')}): {self.slots} slots")
+        return True
+
+    def is_free(self):
+        return self.active < self.slots and time.time() >= self.offline_until
+
+    def set_offline(self):
+        """Send no new jobs for REMOTE_OFFLINE_DELAY seconds"""
+        self.offline_until = time.time() + REMOTE_OFFLINE_DELAY
+
+    def submit(self, script, settings):
+        """Upload the bundle of a script and return the id of the job on the worker"""
+        with tempfile.TemporaryFile() as bundle:
+            write_zip(job_inputs(script), bundle)
+            bundle.seek(0)
+            response = self._request('POST', '/jobs', params={'script': os.path.basename(script)}, data=bundle,
+                                     headers={'Content-Type': 'application/zip', SETTINGS_HEADER: json.dumps(settings)})
+        return response.json()['id']
+
+    def poll(self, job_id, seen=0):
+        """State of a job and the output lines after the first `seen` ones"""
+        try:
+            return self._request('GET', f'/jobs/{job_id}', params={'since': seen}).json()
+        except ValueError as e:
+            raise RemoteError(f"{self.name}: invalid answer: {e}") from e
+
+    def download(self, job_id, folder):
+        """Stream the results of a finished job into folder; return the number of files"""
+        import requests
+
+        with tempfile.TemporaryFile() as archive:
+            with self._request('GET', f'/jobs/{job_id}/results', stream=True) as response:
+                try:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        archive.write(chunk)
+                except requests.RequestException as e:
+                    raise RemoteError(f"{self.name}: download interrupted: {e}") from e
+            archive.seek(0)
+            return extract_zip(archive, folder)
+
+    def cancel(self, job_id):
+        """Cancel a running job, or delete a finished one; problems are reported, not raised"""
+        try:
+            self._request('DELETE', f'/jobs/{job_id}', timeout=5).close()
+        except RemoteError as e:
+            print(f"⚠️  Could not cancel job {job_id} on {self.name}: {e}")
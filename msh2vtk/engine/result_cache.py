@@ -0,0 +1,140 @@
+import os
+import json
+import hashlib
+
+# Manifest written next to the outputs of every post-processed job
+CACHE_MANIFEST_NAME = '.bfex_cache.json'
+CACHE_VERSION = 1
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_hash(path):
+    """Fast content hash (BLAKE2b) of a file read in 1 MiB chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path, previous=None):
+    """Size, mtime and content hash of a file
+
+    The hash of `previous` is reused when size and mtime did not change, so
+    unchanged inputs are never read again.
+    """
+    stat = os.stat(path)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if previous and previous.get('size') == stat.st_size and previous.get('mtime_ns') == stat.st_mtime_ns:
+        fingerprint['hash'] = previous.get('hash')
+    else:
+        fingerprint['hash'] = file_hash(path)
+    return fingerprint
+
+
+def cache_options(export_von_mises, export_smooth_stress, export_vtk, export_columnar, vtk_format, vtk_compression,
+                  trimmed_percents, percentiles, streaming):
+    """Export options recorded in the manifest: outputs are reused only when they match"""
+    return {
+        'export_von_mises': export_von_mises,
+        'export_smooth_stress': export_smooth_stress,
+        'export_vtk': export_vtk,
+        'export_columnar': export_columnar,
+        'vtk_format': vtk_format,
+        'vtk_compression': vtk_compression,
+        'trimmed_percents': list(trimmed_percents),
+        'percentiles': list(percentiles),
+        # Streamed summaries hold approximate trimmed means and percentiles
+        'streaming': streaming,
+    }
+
+
+def _manifest_path(output_folder):
+    return os.path.join(output_folder, CACHE_MANIFEST_NAME)
+
+
+def load_manifest(output_folder):
+    """Read the cache manifest of an output folder (None if missing or unreadable)"""
+    try:
+        with open(_manifest_path(output_folder), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get('version') != CACHE_VERSION:
+        return None
+    return manifest
+
+
+def check_cache(output_folder, input_files, options):
+    """Return (up_to_date, reason) for a job with the given inputs and export options"""
+    manifest = load_manifest(output_folder)
+    if manifest is None:
+        return False, "no cache manifest"
+    if manifest.get('options') != options:
+        return False, "export options changed"
+
+    recorded_inputs = manifest.get('inputs', {})
+    touched = False
+    for path in input_files:
+        name = os.path.basename(path)
+        previous = recorded_inputs.get(name)
+        if previous is None or not os.path.exists(path):
+            return False, f"{name} not recorded"
+        stat = os.stat(path)
+        if previous.get('size') != stat.st_size:
+            return False, f"{name} changed"
+        if previous.get('mtime_ns') != stat.st_mtime_ns:
+            if file_hash(path) != previous.get('hash'):
+                return False, f"{name} changed"
+            # Same content, new mtime (copied or touched): remember it so the file is not hashed again
+            previous['mtime_ns'] = stat.st_mtime_ns
+            touched = True
+
+    for name, recorded in manifest.get('outputs', {}).items():
+        path = os.path.join(output_folder, name)
+        if not os.path.exists(path):
+            return False, f"{name} missing"
+        if os.stat(path).st_size != recorded.get('size'):
+            return False, f"{name} modified"
+
+    if touched:
+        try:
+            _write_manifest(output_folder, manifest)
+        except OSError as e:
+            print(f"⚠️  Could not update the cache manifest: {e}")
+    return True, "outputs are up to date"
+
+
+def update_manifest(output_folder, input_files, options, output_files):
+    """Record the inputs, export options and outputs of a finished job"""
+    previous = load_manifest(output_folder) or {}
+    recorded_inputs = previous.get('inputs', {})
+
+    inputs = {}
+    for path in input_files:
+        name = os.path.basename(path)
+        inputs[name] = file_fingerprint(path, recorded_inputs.get(name))
+
+    outputs = {}
+    for path in output_files:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            outputs[os.path.basename(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    _write_manifest(output_folder, {'version': CACHE_VERSION, 'options': options, 'inputs': inputs,
+                                    'outputs': outputs})
+
+
+def _write_manifest(output_folder, manifest):
+    temp_path = _manifest_path(output_folder) + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, _manifest_path(output_folder))
+
+
+def clear_manifest(output_folder):
+    """Remove the cache manifest so the next run reprocesses the folder"""
+    try:
+        os.remove(_manifest_path(output_folder))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,197 @@
+import os
+import re
+import io
+import json
+import shutil
+import zipfile
+import datetime
+import tempfile
+import numpy as np
+from .optional import module_available
+
+# pyarrow is optional: without it results are stored as compressed NPZ
+PYARROW_AVAILABLE = module_available('pyarrow')
+
+RESULT_STORE_NAME = 'smooth_stress_tensor'
+METADATA_KEY = 'bfex'
+NPZ_METADATA_ARRAY = '__metadata__'
+COPY_CHUNK_SIZE = 1 << 20
+
+
+def script_metadata(selected_file):
+    """Collect metadata about the Fossils script that produced the results"""
+    metadata = {'source_script': os.path.abspath(selected_file)}
+    try:
+        with open(selected_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                match = re.match(r"\s*p\['(Young|Poisson|density)'\]\s*=\s*([-+0-9.eE]+)", line)
+                if match:
+                    key = {'Young': 'young_modulus', 'Poisson': 'poisson_ratio', 'density': 'density'}[match.group(1)]
+                    metadata[key] = float(match.group(2))
+    except (OSError, ValueError) as e:
+        print(f"   ⚠️  Could not read script parameters: {e}")
+    return metadata
+
+
+def build_result_columns(node_tags, node_coords, von_mises, forces, components, layout):
+    """Assemble the standard result columns for one Fossils job"""
+    from .stress import component_names
+
+    columns = {
+        'NodeTag': np.asarray(node_tags),
+        'X': node_coords[:, 0],
+        'Y': node_coords[:, 1],
+        'Z': node_coords[:, 2],
+        'Von mises Stress': von_mises,
+        'Fx': forces[:, 0],
+        'Fy': forces[:, 1],
+        'Fz': forces[:, 2],
+    }
+    for name, values in zip(component_names(layout, components.shape[1]), components.T):
+        columns[name] = values
+    return columns
+
+
+def write_result_store(output_folder, columns, metadata=None, base_name=RESULT_STORE_NAME):
+    """Write result columns to Parquet (zstd) or, without pyarrow, a compressed NPZ
+
+    `columns` maps column names to 1-D arrays of equal length. Returns the
+    path of the written file.
+    """
+    metadata = dict(metadata or {})
+    metadata.setdefault('created', datetime.datetime.now().isoformat(timespec='seconds'))
+    metadata['columns'] = list(columns)
+
+    if PYARROW_AVAILABLE:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = os.path.join(output_folder, base_name + '.parquet')
+        table = pa.table({name: np.asarray(values) for name, values in columns.items()})
+        table = table.replace_schema_metadata({METADATA_KEY: json.dumps(metadata)})
+        pq.write_table(table, path, compression='zstd')
+    else:
+        path = os.path.join(output_folder, base_name + '.npz')
+        arrays = {name: np.asarray(values) for name, values in columns.items()}
+        arrays[NPZ_METADATA_ARRAY] = np.array(json.dumps(metadata))
+        np.savez_compressed(path, **arrays)
+    return path
+
+
+class ResultStoreWriter:
+    """Write a result store chunk by chunk with bounded memory
+
+    With pyarrow every chunk becomes a Parquet row group. The NPZ fallback
+    spools each column to a scratch file and packs them into the archive
+    one column at a time when the writer is closed.
+    """
+
+    def __init__(self, output_folder, metadata=None, base_name=RESULT_STORE_NAME):
+        self.output_folder = output_folder
+        self.base_name = base_name
+        self.metadata = dict(metadata or {})
+        self.metadata.setdefault('created', datetime.datetime.now().isoformat(timespec='seconds'))
+        self.columns = None
+        self.num_rows = 0
+        self._parquet = None
+        self._spool_dir = None
+        self._spools = {}
+        self._dtypes = {}
+        extension = '.parquet' if PYARROW_AVAILABLE else '.npz'
+        self.path = os.path.join(output_folder, base_name + extension)
+
+    def write(self, columns):
+        """Append a chunk given as a dict of equal-length 1-D arrays"""
+        if self.columns is None:
+            self.columns = list(columns)
+            self.metadata['columns'] = self.columns
+        arrays = {name: np.asarray(columns[name]) for name in self.columns}
+        self.num_rows += len(next(iter(arrays.values()))) if arrays else 0
+
+        if PYARROW_AVAILABLE:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.table(arrays)
+            if self._parquet is None:
+                schema = table.schema.with_metadata({METADATA_KEY: json.dumps(self.metadata)})
+                self._parquet = pq.ParquetWriter(self.path, schema, compression='zstd')
+            self._parquet.write_table(table.replace_schema_metadata(self._parquet.schema.metadata))
+            return
+
+        if self._spool_dir is None:
+            self._spool_dir = tempfile.mkdtemp(prefix='.bfex_store_', dir=self.output_folder)
+        for index, (name, values) in enumerate(arrays.items()):
+            if name not in self._spools:
+                self._dtypes[name] = values.dtype
+                self._spools[name] = open(os.path.join(self._spool_dir, f'{index}.bin'), 'wb')
+            self._spools[name].write(np.ascontiguousarray(values, dtype=self._dtypes[name]).tobytes())
+
+    def close(self):
+        """Finish the file and return its path"""
+        if PYARROW_AVAILABLE:
+            if self._parquet is not None:
+                self._parquet.close()
+            return self.path
+
+        try:
+            with zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                for name, spool in self._spools.items():
+                    spool.close()
+                    header = {
+                        'descr': np.lib.format.dtype_to_descr(self._dtypes[name]),
+                        'fortran_order': False,
+                        'shape': (self.num_rows,),
+                    }
+                    with archive.open(name + '.npy', 'w', force_zip64=True) as member, open(spool.name, 'rb') as data:
+                        np.lib.format.write_array_header_2_0(member, header)
+                        shutil.copyfileobj(data, member, COPY_CHUNK_SIZE)
+                archive.writestr(NPZ_METADATA_ARRAY + '.npy', _npy_bytes(np.array(json.dumps(self.metadata))))
+        finally:
+            if self._spool_dir is not None:
+                shutil.rmtree(self._spool_dir, ignore_errors=True)
+        return self.path
+
+
+def _npy_bytes(array):
+    """Serialize a small array in .npy format"""
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+
+def find_result_store(output_folder, base_name=RESULT_STORE_NAME):
+    """Return the path of an existing result store in a folder, or None"""
+    for extension in ('.parquet', '.npz'):
+        path = os.path.join(output_folder, base_name + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def read_result_metadata(path):
+    """Read only the metadata of a result store"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        schema_metadata = pq.read_schema(path).metadata or {}
+        return json.loads(schema_metadata.get(METADATA_KEY.encode(), b'{}'))
+    with np.load(path) as store:
+        return json.loads(str(store[NPZ_METADATA_ARRAY]))
+
+
+def read_result_store(path, columns=None):
+    """Load selected columns (all by default) from a result store
+
+    Only the requested columns are decoded: Parquet reads them by column
+    chunk and NPZ members are decompressed one at a time.
+    """
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path, columns=columns)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+
+    with np.load(path) as store:
+        names = columns if columns is not None else [name for name in store.files if name != NPZ_METADATA_ARRAY]
+        return {name: store[name] for name in names}
@@ -0,0 +1,167 @@
+import os
+import json
+import re
+import time
+import threading
+from .paths import data_path
+
+# Index of the scripts found per directory, reused while the directory is unchanged
+SCAN_INDEX_FILE = "scan_index.json"
+MAX_INDEXED_DIRS = 50000  # the index forgets the directories scanned longest ago beyond this
+HEADER_BYTES = 4096  # scripts written by the Blender exporter define parms() in their first lines
+PARMS_PATTERN = re.compile(r"^def parms\(", re.MULTILINE)
+SKIPPED_DIRS = ('__pycache__', 'node_modules')  # besides hidden directories
+
+
+def is_fossils_script(path):
+    """True when a .py file defines parms() near its top, like the scripts Fossils runs"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return PARMS_PATTERN.search(f.read(HEADER_BYTES)) is not None
+    except OSError:
+        return False
+
+
+class ScanIndex:
+    """Fossils scripts and subdirectories of every scanned directory, keyed on the directory mtime
+
+    Adding, removing or renaming an entry changes the mtime of its directory,
+    so an unchanged tree is re-scanned with one stat per directory and no
+    file reads. A script edited in place (without being re-created) keeps its
+    cached verdict until something else changes in its directory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path = path if path is not None else data_path(SCAN_INDEX_FILE)
+        self.dirs = {}  # directory -> {'mtime', 'scripts', 'subdirs'} (names, not paths)
+        self.changed = False
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r') as f:
+                self.dirs = json.load(f).get('dirs', {})
+        except (OSError, ValueError, AttributeError):
+            self.dirs = {}
+
+    def lookup(self, directory, mtime):
+        with self._lock:
+            entry = self.dirs.get(directory)
+            if entry is not None and entry.get('mtime') == mtime:
+                # Most recently used last, so save() keeps it
+                self.dirs[directory] = self.dirs.pop(directory)
+                return entry
+        return None
+
+    def store(self, directory, mtime, scripts, subdirs):
+        with self._lock:
+            self.dirs.pop(directory, None)
+            self.dirs[directory] = {'mtime': mtime, 'scripts': scripts, 'subdirs': subdirs}
+            self.changed = True
+
+    def save(self):
+        with self._lock:
+            if not self.changed:
+                return
+            dirs = dict(list(self.dirs.items())[-MAX_INDEXED_DIRS:])
+            self.changed = False
+        try:
+            with open(self.path, 'w') as f:
+                json.dump({'dirs': dirs}, f)
+        except OSError as e:
+            print(f"⚠️  Could not save the scan index: {e}")
+
+
+def _scan_directory(directory, index):
+    """(scripts, subdirs) of one directory, from the index when its mtime is unchanged"""
+    mtime = os.stat(directory).st_mtime_ns
+    entry = index.lookup(directory, mtime) if index is not None else None
+    if entry is not None:
+        return entry['scripts'], entry['subdirs']
+    scripts, subdirs = [], []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIPPED_DIRS:
+                        subdirs.append(entry.name)
+                elif entry.name.endswith('.py') and entry.is_file() and is_fossils_script(entry.path):
+                    scripts.append(entry.name)
+            except OSError:
+                continue
+    scripts.sort()
+    subdirs.sort()
+    if index is not None:
+        index.store(directory, mtime, scripts, subdirs)
+    return scripts, subdirs
+
+
+def scan_scripts(directory, recursive=True, index=None, cancelled=None):
+    """Yield the Fossils scripts below directory, one list per directory, as they are found
+
+    Directories are visited depth-first in name order; unreadable ones are
+    skipped. Stops early once cancelled (a threading.Event) is set.
+    """
+    pending = [os.path.abspath(directory)]
+    while pending:
+        if cancelled is not None and cancelled.is_set():
+            return
+        folder = pending.pop()
+        try:
+            scripts, subdirs = _scan_directory(folder, index)
+        except OSError:
+            continue
+        if scripts:
+            yield [os.path.join(folder, name) for name in scripts]
+        if recursive:
+            pending.extend(os.path.join(folder, name) for name in reversed(subdirs))
+
+
+def find_fossils_scripts(directory, recursive=True, index=None):
+    """All the Fossils scripts below directory (see scan_scripts)"""
+    return [script for scripts in scan_scripts(directory, recursive, index) for script in scripts]
+
+
+class DirectoryScanner:
+    """Scans folders for Fossils scripts on a background thread, streaming what it finds
+
+    on_found(scripts) is called from the scanner thread for every directory
+    that holds scripts, on_done(count, seconds) once a scan completes. Starting
+    a new scan cancels the running one, whose results are no longer reported.
+    """
+
+    def __init__(self, on_found, on_done=None, index_path=None):
+        self.on_found = on_found
+        self.on_done = on_done
+        self.index = ScanIndex(index_path)
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, directory, recursive=True):
+        with self._lock:
+            self._cancelled.set()
+            self._cancelled = cancelled = threading.Event()
+        threading.Thread(target=self._run, args=(directory, recursive, cancelled), name="scanner",
+                         daemon=True).start()
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled.set()
+
+    def _run(self, directory, recursive, cancelled):
+        start = time.perf_counter()
+        count = 0
+        try:
+            for scripts in scan_scripts(directory, recursive, self.index, cancelled):
+                with self._lock:
+                    # Checked under the lock: a newer scan may have started meanwhile
+                    if cancelled.is_set():
+                        return
+                    self.on_found(scripts)
+                count += len(scripts)
+        except Exception as e:
+            print(f"❌ Error scanning {directory}: {e}")
+        finally:
+            self.index.save()
+        if not cancelled.is_set() and self.on_done is not None:
+            self.on_done(count, time.perf_counter() - start)
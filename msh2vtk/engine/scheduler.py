@@ -0,0 +1,444 @@
+import os
+import re
+import json
+import mmap
+import time
+import heapq
+import threading
+import numpy as np
+from .paths import data_path
+
+# psutil is optional: without it memory is read from /proc on Linux and
+# per-process measurements (used to calibrate the estimates) are disabled
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+RESOURCE_MODEL_FILE = "resource_model.json"
+RUNTIME_HISTORY_FILE = "runtime_history.json"
+
+# Priors for the memory model, refined from measured peaks of finished jobs
+BASE_JOB_MEMORY = 600 * 1024 ** 2       # Fossils/Metafor process without a model
+DEFAULT_BYTES_PER_ELEMENT = 4096       # solver memory per volume element
+ELEMENTS_PER_TRIANGLE = 4              # volume elements generated per STL surface triangle
+DEFAULT_CORES_PER_JOB = 1.0
+
+MEMORY_RESERVE_FRACTION = 0.10         # RAM kept free for the OS and the GUI
+CPU_OVERSUBSCRIPTION = 1.0             # extra cores allowed on top of the logical count
+SWAP_IN_THRASHING = 20 * 1024 ** 2     # bytes/s swapped in that pause admissions
+MONITOR_INTERVAL = 2.0
+CALIBRATION_WEIGHT = 0.3               # weight of a new measurement in the running average
+
+# Priors for the runtime model, replaced by a regression on the recorded runs
+BASE_JOB_SECONDS = 60.0                # Fossils start-up, meshing and output of a tiny model
+DEFAULT_SECONDS_PER_ELEMENT = 0.004    # solver time per volume element
+MIN_FIT_SAMPLES = 8                    # recorded runs before the regression replaces the prior
+MAX_RUNTIME_SAMPLES = 500              # most recent runs kept in the history
+RIDGE_PENALTY = 0.1                    # keeps the fit stable with few or similar samples
+
+
+def _meminfo():
+    """Total and available memory in bytes from /proc/meminfo (Linux)"""
+    values = {}
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                values[key] = int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        return None, None
+    return values.get('MemTotal'), values.get('MemAvailable')
+
+
+def _swapped_in_bytes():
+    """Cumulative bytes swapped in since boot, or None if unknown"""
+    if PSUTIL_AVAILABLE:
+        try:
+            return psutil.swap_memory().sin
+        except Exception:
+            return None
+    try:
+        with open('/proc/vmstat', 'r') as f:
+            for line in f:
+                if line.startswith('pswpin '):
+                    return int(line.split()[1]) * 4096
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def system_memory():
+    """Return (total, available) memory in bytes; None values when unknown"""
+    if PSUTIL_AVAILABLE:
+        memory = psutil.virtual_memory()
+        return memory.total, memory.available
+    return _meminfo()
+
+
+def process_tree_usage(pid):
+    """Return (rss bytes, cpu seconds) of a process and its children, or (None, None)"""
+    if PSUTIL_AVAILABLE:
+        try:
+            parent = psutil.Process(pid)
+            processes = [parent] + parent.children(recursive=True)
+        except psutil.Error:
+            return None, None
+        rss, cpu = 0, 0.0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+                times = process.cpu_times()
+                cpu += times.user + times.system
+            except psutil.Error:
+                continue
+        return rss, cpu
+    try:
+        # Linux fallback: resident memory of the main process only
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024, None
+    except (OSError, ValueError):
+        pass
+    return None, None
+
+
+def count_msh_elements(mesh_file):
+    """Read the element count from the $Elements header of an MSH file"""
+    try:
+        with open(mesh_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header = data.find(b'$MeshFormat')
+            start = data.find(b'$Elements')
+            if header < 0 or start < 0:
+                return None
+            version, file_type, data_size = data[header:header + 64].split(b'\n')[1].split()[:3]
+            position = data.find(b'\n', start) + 1
+            if float(version) >= 4 and int(file_type) == 1:
+                # MSH 4.x binary: numEntityBlocks numElements as size_t
+                size = int(data_size)
+                return int.from_bytes(data[position + size:position + 2 * size], 'little')
+            fields = data[position:position + 256].split(b'\n')[0].split()
+            # MSH 4.x: numEntityBlocks numElements ..., MSH 2.x: numElements
+            return int(fields[1]) if len(fields) >= 2 else int(fields[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def stl_triangle_count(stl_file):
+    """Triangle count of a binary or ASCII STL file"""
+    size = os.path.getsize(stl_file)
+    with open(stl_file, 'rb') as f:
+        header = f.read(84)
+        if len(header) == 84:
+            count = int.from_bytes(header[80:84], 'little')
+            if 84 + 50 * count == size:
+                return count
+    # ASCII STL: roughly 250 bytes per facet
+    return max(1, size // 250)
+
+
+def find_bone_stl(script_path):
+    """Locate the bone STL referenced by p['bone'] in a Fossils script"""
+    folder = os.path.splitext(script_path)[0]
+    try:
+        with open(script_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                match = re.search(r"p\['bone'\]\s*=\s*f?['\"](.+?)['\"]", line)
+                if match:
+                    target = match.group(1).replace('{path}/', '').replace('{path}\\', '')
+                    candidates = [target, os.path.join(folder, target), os.path.join(folder, os.path.basename(target))]
+                    for candidate in candidates:
+                        if os.path.isfile(candidate):
+                            return candidate
+                    return None
+    except OSError:
+        pass
+    return None
+
+
+def count_muscles(script_path):
+    """Number of muscle entries in the p['muscles'] list of a Fossils script"""
+    try:
+        with open(script_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return 0
+    start = text.find("p['muscles']")
+    if start < 0:
+        return 0
+    end = text.find("p['", start + 1)
+    return text[start:end if end > 0 else len(text)].count("'file'")
+
+
+def estimate_makespan(remaining, predicted, slots):
+    """Seconds until running jobs (remaining seconds) and queued jobs (predicted, in start order) finish on slots"""
+    slots = max(1, slots)
+    finish_times = sorted(remaining)[-slots:]
+    finish_times += [0.0] * (slots - len(finish_times))
+    heapq.heapify(finish_times)
+    for seconds in predicted:
+        # Each queued job takes the first slot to free up
+        heapq.heappush(finish_times, heapq.heappop(finish_times) + seconds)
+    return max(finish_times)
+
+
+class RuntimeModel:
+    """Predicts Fossils solve times from model features, learned from finished runs
+
+    Every successful solve records (elements, muscles, bone STL size, seconds)
+    in a history file. Until MIN_FIT_SAMPLES runs are recorded the prediction
+    is the per-element prior scaled by the median ratio of recorded runs;
+    afterwards it is a ridge regression of log(seconds) on the log features.
+    """
+
+    def __init__(self, path=None):
+        self.path = path = path if path is not None else data_path(RUNTIME_HISTORY_FILE)
+        self.samples = []
+        self._coefficients = None
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r') as f:
+                self.samples = json.load(f).get('samples', [])[-MAX_RUNTIME_SAMPLES:]
+        except (OSError, ValueError, AttributeError):
+            self.samples = []
+        self._fit()
+
+    @staticmethod
+    def features(script_path, elements=None):
+        """Model features of a Fossils script (elements as estimated by the ResourceModel)"""
+        stl_file = find_bone_stl(script_path)
+        return {
+            'elements': elements or 0,
+            'muscles': count_muscles(script_path),
+            'size': os.path.getsize(stl_file) if stl_file else 0,
+        }
+
+    @staticmethod
+    def _prior(features):
+        return BASE_JOB_SECONDS + features['elements'] * DEFAULT_SECONDS_PER_ELEMENT
+
+    @staticmethod
+    def _row(features):
+        return [1.0, np.log1p(features['elements']), np.log1p(features['muscles']), np.log1p(features['size'])]
+
+    def _fit(self):
+        samples = [sample for sample in self.samples if sample.get('seconds', 0) > 0]
+        self._ratio = float(np.median([sample['seconds'] / self._prior(sample) for sample in samples])) if samples else 1.0
+        self._coefficients = None
+        if len(samples) < MIN_FIT_SAMPLES:
+            return
+        rows = np.array([self._row(sample) for sample in samples])
+        targets = np.log([sample['seconds'] for sample in samples])
+        penalty = RIDGE_PENALTY * np.eye(rows.shape[1])
+        penalty[0, 0] = 0.0  # intercept is not penalized
+        self._coefficients = np.linalg.solve(rows.T @ rows + penalty, rows.T @ targets)
+        self._range = (min(sample['seconds'] for sample in samples), max(sample['seconds'] for sample in samples))
+
+    def predict(self, features):
+        """Predicted solve time in seconds"""
+        with self._lock:
+            if self._coefficients is None:
+                return self._prior(features) * self._ratio
+            seconds = float(np.exp(np.dot(self._row(features), self._coefficients)))
+            # Extrapolation beyond the recorded models stays within reason
+            return min(max(seconds, self._range[0] / 10), self._range[1] * 10)
+
+    def record(self, features, seconds):
+        """Add a finished solve to the history and refit"""
+        with self._lock:
+            self.samples.append(dict(features, seconds=round(seconds, 3), recorded_at=time.time()))
+            self.samples = self.samples[-MAX_RUNTIME_SAMPLES:]
+            self._fit()
+            try:
+                with open(self.path, 'w') as f:
+                    json.dump({'samples': self.samples}, f, indent=1)
+            except OSError as e:
+                print(f"⚠️  Could not save runtime history: {e}")
+
+
+class ResourceModel:
+    """Memory and CPU coefficients, calibrated from finished jobs and kept on disk"""
+
+    def __init__(self, path=None):
+        self.path = path = path if path is not None else data_path(RESOURCE_MODEL_FILE)
+        self.bytes_per_element = DEFAULT_BYTES_PER_ELEMENT
+        self.cores_per_job = DEFAULT_CORES_PER_JOB
+        self.samples = 0
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            self.bytes_per_element = float(data.get('bytes_per_element', self.bytes_per_element))
+            self.cores_per_job = float(data.get('cores_per_job', self.cores_per_job))
+            self.samples = int(data.get('samples', 0))
+        except (OSError, ValueError):
+            pass
+
+    def estimate(self, script_path):
+        """Estimate memory (bytes) and cores for a Fossils script"""
+        elements, source = None, 'default'
+        mesh_file = os.path.join(os.path.splitext(script_path)[0], 'mesh.msh')
+        if os.path.isfile(mesh_file):
+            elements = count_msh_elements(mesh_file)
+            if elements is not None:
+                source = 'mesh.msh'
+        if elements is None:
+            stl_file = find_bone_stl(script_path)
+            if stl_file:
+                elements = stl_triangle_count(stl_file) * ELEMENTS_PER_TRIANGLE
+                source = os.path.basename(stl_file)
+        memory = BASE_JOB_MEMORY + (elements or 0) * self.bytes_per_element
+        return {'memory': int(memory), 'cores': self.cores_per_job, 'elements': elements, 'source': source}
+
+    def calibrate(self, elements, peak_rss, cores_used=None):
+        """Blend a measured job into the coefficients"""
+        if elements and peak_rss and peak_rss > BASE_JOB_MEMORY:
+            measured = (peak_rss - BASE_JOB_MEMORY) / elements
+            self.bytes_per_element += CALIBRATION_WEIGHT * (measured - self.bytes_per_element)
+        if cores_used:
+            self.cores_per_job += CALIBRATION_WEIGHT * (max(0.5, cores_used) - self.cores_per_job)
+        self.samples += 1
+        try:
+            with open(self.path, 'w') as f:
+                json.dump({'bytes_per_element': self.bytes_per_element, 'cores_per_job': self.cores_per_job,
+                           'samples': self.samples}, f, indent=2)
+        except OSError as e:
+            print(f"⚠️  Could not save resource model: {e}")
+
+
+class AdmissionController:
+    """Decide which queued Fossils job may start given live system headroom
+
+    A job is admitted when the running count is under `max_jobs` (0 = number
+    of logical cores), its estimated memory fits in the available memory
+    minus what running jobs are still expected to allocate and a safety
+    reserve, and the estimated cores fit the CPU budget. Smaller jobs may
+    start ahead of a large one that does not fit yet, but only a limited
+    number of times so the large job is not starved. Admissions pause while
+    the system is swapping heavily. With resource_aware=False only the
+    job count is checked.
+    """
+
+    def __init__(self, max_jobs=0, resource_aware=True, model=None):
+        self.cpu_count = os.cpu_count() or 1
+        self.max_jobs = max_jobs if max_jobs and max_jobs > 0 else self.cpu_count
+        self.resource_aware = resource_aware
+        self.model = model or ResourceModel()
+        self.estimates = {}
+        self.running = {}
+        self.head_bypassed = 0
+        self._lock = threading.Lock()
+        self._swap_sample = (time.time(), _swapped_in_bytes())
+        self._monitor = None
+
+    def estimate(self, file):
+        if file not in self.estimates:
+            self.estimates[file] = self.model.estimate(file)
+        return self.estimates[file]
+
+    def running_count(self):
+        with self._lock:
+            return len(self.running)
+
+    def _swap_rate(self):
+        now, swapped = time.time(), _swapped_in_bytes()
+        last_time, last_swapped = self._swap_sample
+        self._swap_sample = (now, swapped)
+        if swapped is None or last_swapped is None or now <= last_time:
+            return 0.0
+        return (swapped - last_swapped) / (now - last_time)
+
+    def _pending_memory(self):
+        """Memory running jobs are still expected to allocate"""
+        pending = 0
+        for job in self.running.values():
+            expected = job['estimate']['memory']
+            pending += max(0, expected - job['peak_rss']) if job['peak_rss'] else expected
+        return pending
+
+    def _fits(self, estimate):
+        total, available = system_memory()
+        if total and available is not None:
+            reserve = total * MEMORY_RESERVE_FRACTION
+            headroom = available - self._pending_memory() - reserve
+            if estimate['memory'] > headroom:
+                return False, (f"needs ~{estimate['memory'] / 1024 ** 3:.1f} GB, "
+                               f"{max(0, headroom) / 1024 ** 3:.1f} GB free")
+        cores = sum(job['estimate']['cores'] for job in self.running.values())
+        if cores + estimate['cores'] > self.cpu_count + CPU_OVERSUBSCRIPTION:
+            return False, f"CPU budget in use ({cores:.1f}/{self.cpu_count} cores)"
+        return True, ""
+
+    def select(self, queue):
+        """Return (index in queue of the job to start, reason when None)"""
+        with self._lock:
+            if not queue:
+                return None, "queue empty"
+            if len(self.running) >= self.max_jobs:
+                return None, f"{len(self.running)}/{self.max_jobs} jobs running"
+            if not self.running:
+                # Always make progress, even if the job looks too large
+                self.head_bypassed = 0
+                return 0, ""
+            if not self.resource_aware:
+                return 0, ""
+
+            if self._swap_rate() > SWAP_IN_THRASHING:
+                return None, "system is swapping"
+
+            reason = ""
+            for index, file in enumerate(queue):
+                if index > 0 and self.head_bypassed >= self.cpu_count:
+                    break
+                fits, why = self._fits(self.estimate(file))
+                if fits:
+                    self.head_bypassed = self.head_bypassed + 1 if index > 0 else 0
+                    return index, ""
+                if index == 0:
+                    reason = f"{os.path.basename(file)} {why}"
+            return None, reason
+
+    def job_started(self, file, pid=None):
+        """Register a job admitted by select (pid may be attached later)"""
+        with self._lock:
+            self.running[file] = {'estimate': self.estimate(file), 'pid': pid, 'peak_rss': 0,
+                                  'cpu_time': None, 'start': time.time()}
+            if self._monitor is None and self.resource_aware:
+                self._monitor = threading.Thread(target=self._monitor_loop, daemon=True)
+                self._monitor.start()
+
+    def attach_process(self, file, pid):
+        with self._lock:
+            if file in self.running:
+                self.running[file]['pid'] = pid
+
+    def job_finished(self, file, success=True):
+        """Release a job's resources and learn from its measured usage"""
+        with self._lock:
+            job = self.running.pop(file, None)
+        if job is None or not success or not self.resource_aware:
+            return
+        elapsed = time.time() - job['start']
+        cores_used = job['cpu_time'] / elapsed if job['cpu_time'] and elapsed > 0 else None
+        if job['peak_rss'] or cores_used:
+            self.model.calibrate(job['estimate']['elements'], job['peak_rss'], cores_used)
+            # Queued estimates pick up the new coefficients
+            self.estimates.clear()
+
+    def _monitor_loop(self):
+        while True:
+            time.sleep(MONITOR_INTERVAL)
+            with self._lock:
+                jobs = [job for job in self.running.values() if job['pid']]
+            for job in jobs:
+                rss, cpu_time = process_tree_usage(job['pid'])
+                if rss:
+                    job['peak_rss'] = max(job['peak_rss'], rss)
+                if cpu_time is not None:
+                    job['cpu_time'] = cpu_time
+
+    def describe(self, file):
+        estimate = self.estimate(file)
+        elements = f"{estimate['elements']:,} elements" if estimate['elements'] else "size unknown"
+        return f"~{estimate['memory'] / 1024 ** 3:.1f} GB, {elements} ({estimate['source']})"
@@ -0,0 +1,128 @@
+import os
+import fnmatch
+import threading
+from .ledger import DONE, FAILED
+
+# Characters that make a filter a glob pattern instead of a plain substring
+GLOB_CHARS = set('*?[')
+
+# Row states shown by the file list (the final states of Fossils jobs)
+ROW_STATES = (DONE, FAILED)
+
+
+def matches(pattern, file):
+    """True when file matches a filter: glob on the file name (or path, with '/'), else a substring
+
+    Case-insensitive; an empty pattern matches everything.
+    """
+    if not pattern:
+        return True
+    pattern = pattern.lower()
+    name = file.replace(os.sep, '/').lower()
+    if GLOB_CHARS & set(pattern):
+        return fnmatch.fnmatchcase(name if '/' in pattern else os.path.basename(name), pattern)
+    return pattern in name
+
+
+class ScriptSelection:
+    """Scripts found in a folder, which of them are selected and which are shown
+
+    A plain model for the GUI file list: the list widget only draws the rows of
+    `visible` that are on screen, so the number of scripts does not matter.
+    Files keep the order they were added in; selection and status survive
+    filtering. Methods are thread-safe (files may be added by a scanner thread).
+    """
+
+    def __init__(self):
+        self.files = []
+        self.selected = set()
+        self.status = {}  # file -> one of ROW_STATES
+        self.widest = 0  # characters of the longest file name (horizontal scrolling)
+        self.pattern = ""
+        self.visible = []  # files matching the filter, in order
+        self.version = 0  # changes whenever the rows to draw change
+        self._known = set()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.files)
+
+    def _changed(self):
+        self.version += 1
+
+    def clear(self):
+        with self._lock:
+            self.files = []
+            self.selected = set()
+            self.status = {}
+            self.visible = []
+            self.widest = 0
+            self._known = set()
+            self._changed()
+
+    def add(self, files):
+        """Append new files (duplicates are ignored)"""
+        with self._lock:
+            new = []
+            for file in files:
+                if file not in self._known:
+                    self._known.add(file)
+                    new.append(file)
+            self.files.extend(new)
+            self.visible.extend(file for file in new if matches(self.pattern, file))
+            if new:
+                self.widest = max(self.widest, max(len(file) for file in new))
+                self._changed()
+            return len(new)
+
+    def set_filter(self, pattern):
+        """Show only the files matching pattern (see matches)"""
+        with self._lock:
+            self.pattern = pattern.strip()
+            self.visible = [file for file in self.files if matches(self.pattern, file)]
+            self._changed()
+
+    def select(self, pattern=None, selected=True):
+        """(De)select the visible files matching a glob/substring (all visible files when None); return how many"""
+        with self._lock:
+            files = [file for file in self.visible if pattern is None or matches(pattern.strip(), file)]
+            if selected:
+                self.selected.update(files)
+            else:
+                self.selected.difference_update(files)
+            self._changed()
+            return len(files)
+
+    def toggle(self, file):
+        with self._lock:
+            self.selected.symmetric_difference_update((file,))
+            self._changed()
+
+    def set_range(self, first, last, selected=True):
+        """(De)select the visible rows first..last (inclusive, any order)"""
+        with self._lock:
+            first, last = sorted((first, last))
+            files = self.visible[max(0, first):last + 1]
+            if selected:
+                self.selected.update(files)
+            else:
+                self.selected.difference_update(files)
+            self._changed()
+
+    def is_selected(self, file):
+        return file in self.selected
+
+    def selected_files(self):
+        """Selected files in list order (hidden ones included)"""
+        with self._lock:
+            return [file for file in self.files if file in self.selected]
+
+    def mark(self, file, status):
+        with self._lock:
+            self.status[file] = status
+            self._changed()
+
+    def rows(self, first, count):
+        """(index, file) of the visible rows first..first+count-1"""
+        with self._lock:
+            return list(enumerate(self.visible[first:first + count], first))
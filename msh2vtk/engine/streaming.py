@@ -0,0 +1,193 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+from .msh_reader import take_node_data
+from .stress import compute_stress_fields, force_vectors
+
+# Nodes processed per chunk in streaming mode (~1 GB of working memory at most)
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Log-spaced histogram used for approximate trimmed means and percentiles
+HISTOGRAM_DECADES = (-12, 12)
+HISTOGRAM_BINS_PER_DECADE = 400
+
+# Scratch folders of ScratchArrays and of the columnar store spools
+SCRATCH_PREFIX = '.bfex_stream_'
+SCRATCH_PREFIXES = (SCRATCH_PREFIX, '.bfex_store_')
+
+
+class RunningStats:
+    """Streaming summary of a non-negative scalar field
+
+    Keeps count, sum, minimum and maximum (with its coordinates) exactly, and
+    a log-spaced histogram with per-bin sums for trimmed means and
+    percentiles. Values inside a bin differ by less than 0.6%, which bounds
+    the error of the approximate statistics.
+    """
+
+    def __init__(self, decades=HISTOGRAM_DECADES, bins_per_decade=HISTOGRAM_BINS_PER_DECADE):
+        self.low, high = decades
+        self.bins_per_decade = bins_per_decade
+        self.num_bins = (high - self.low) * bins_per_decade
+        self.counts = np.zeros(self.num_bins, dtype=np.int64)
+        self.sums = np.zeros(self.num_bins)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.max_location = None
+
+    def update(self, values, coords=None):
+        """Add a chunk of values (and their node coordinates)"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.minimum = min(self.minimum, float(values.min()))
+
+        max_index = int(values.argmax())
+        if values[max_index] > self.maximum:
+            self.maximum = float(values[max_index])
+            if coords is not None:
+                self.max_location = np.array(coords[max_index], dtype=np.float64)
+
+        bins = self._bin_index(values)
+        self.counts += np.bincount(bins, minlength=self.num_bins)
+        self.sums += np.bincount(bins, weights=values, minlength=self.num_bins)
+
+    def _bin_index(self, values):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            position = (np.log10(values) - self.low) * self.bins_per_decade
+        position = np.nan_to_num(position, nan=0.0, neginf=0.0, posinf=self.num_bins - 1)
+        return np.clip(position.astype(np.int64), 0, self.num_bins - 1)
+
+    def _bin_edges(self, index):
+        lower = 10.0 ** (self.low + index / self.bins_per_decade)
+        upper = 10.0 ** (self.low + (index + 1) / self.bins_per_decade)
+        return lower, upper
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else np.nan
+
+    def trimmed_mean(self, fraction):
+        """Approximate mean excluding the `fraction` highest values"""
+        exclude = int(self.count * fraction)
+        keep = self.count - exclude
+        if keep <= 0:
+            return np.nan
+        if exclude == 0:
+            return self.mean
+
+        # Drop whole bins from the top, then part of the bin holding the cut
+        cumulative = np.cumsum(self.counts[::-1])
+        cut = int(np.searchsorted(cumulative, exclude))
+        cut_bin = self.num_bins - 1 - cut
+        removed_above = int(cumulative[cut - 1]) if cut > 0 else 0
+        kept_sum = float(self.sums[:cut_bin].sum())
+        partial = int(self.counts[cut_bin]) - (exclude - removed_above)
+        if partial > 0:
+            kept_sum += self.sums[cut_bin] / self.counts[cut_bin] * partial
+        return kept_sum / keep
+
+    def percentile(self, q):
+        """Approximate q-th percentile (0-100), interpolated inside its bin"""
+        if self.count == 0:
+            return np.nan
+        if q >= 100:
+            return self.maximum
+        if q <= 0:
+            return self.minimum
+        rank = q / 100 * (self.count - 1) + 1
+        cumulative = np.cumsum(self.counts)
+        index = int(np.searchsorted(cumulative, rank))
+        before = int(cumulative[index - 1]) if index > 0 else 0
+        lower, upper = self._bin_edges(index)
+        lower, upper = max(lower, self.minimum), min(upper, self.maximum)
+        fraction = (rank - before) / self.counts[index]
+        return lower + (upper - lower) * fraction
+
+
+def iter_chunks(num_rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (start, stop) row ranges covering num_rows"""
+    chunk_size = max(1, int(chunk_size))
+    for start in range(0, num_rows, chunk_size):
+        yield start, min(start + chunk_size, num_rows)
+
+
+def iter_result_chunks(results, chunk_size=DEFAULT_CHUNK_SIZE, principal=True):
+    """Compute stress and force fields of a Fossils job chunk by chunk
+
+    `results` is the dict returned by load_fossils_results. Binary MSH views
+    stay memory-mapped and ASCII sections read with a scratch folder are
+    disk-backed, so only the current chunk is ever materialized; payloads in
+    file order are aligned to the nodes of each chunk through their
+    `<key>_index` lookup.
+    """
+    node_tags = results['node_tags']
+    node_coords = results['node_coords']
+    num_nodes = len(node_tags)
+    missing = {'stress': 0, 'force': 0}
+
+    def payload(key, start, stop):
+        index = results.get(key + '_index')
+        if index is None:
+            return results[key][start:stop]
+        chunk, count = take_node_data(results[key], index, node_tags[start:stop])
+        missing[key] += count
+        return chunk
+
+    for start, stop in iter_chunks(num_nodes, chunk_size):
+        fields = compute_stress_fields(payload('stress', start, stop), num_comp=results['stress_num_comp'],
+                                       num_nodes=stop - start, principal=principal)
+        if results['force'] is not None:
+            forces = force_vectors(payload('force', start, stop), num_nodes=stop - start)
+        else:
+            forces = np.zeros((stop - start, 3))
+        fields.update({
+            'start': start,
+            'stop': stop,
+            'node_tags': node_tags[start:stop],
+            'node_coords': node_coords[start:stop],
+            'forces': forces,
+        })
+        yield fields
+
+    for key, count in missing.items():
+        if count:
+            print(f"⚠️ {count} nodes have no {key} data, using zeros")
+
+
+def remove_stale_scratch(output_folder):
+    """Delete scratch folders left in an output folder by a killed post-processing worker"""
+    for entry in os.scandir(output_folder):
+        if entry.name.startswith(SCRATCH_PREFIXES) and entry.is_dir():
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+class ScratchArrays:
+    """Disk-backed arrays for per-node fields, removed when closed"""
+
+    def __init__(self, output_folder):
+        self.directory = tempfile.mkdtemp(prefix=SCRATCH_PREFIX, dir=output_folder)
+        self.arrays = {}
+
+    def create(self, name, shape):
+        path = os.path.join(self.directory, name + '.npy')
+        self.arrays[name] = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=shape)
+        return self.arrays[name]
+
+    def close(self):
+        for array in self.arrays.values():
+            array.flush()
+        # Files still mapped by other references are left for the OS on Windows
+        self.arrays.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,138 @@
+import numpy as np
+
+# Column layouts of the tensor payload returned by gmsh.view.getModelData
+FULL_TENSOR = "full"          # xx, xy, xz, yx, yy, yz, zx, zy, zz
+SYMMETRIC_TENSOR = "symmetric"  # xx, yy, zz, xy, yz, zx
+PRINCIPAL = "principal"       # s1, s2, s3
+SCALAR = "scalar"             # already computed von Mises
+
+LAYOUTS_BY_WIDTH = {9: FULL_TENSOR, 6: SYMMETRIC_TENSOR, 3: PRINCIPAL, 1: SCALAR}
+
+# Column names used when the raw components are exported
+COMPONENT_NAMES = {
+    FULL_TENSOR: ['Sxx', 'Sxy', 'Sxz', 'Syx', 'Syy', 'Syz', 'Szx', 'Szy', 'Szz'],
+    SYMMETRIC_TENSOR: ['Sxx', 'Syy', 'Szz', 'Sxy', 'Syz', 'Szx'],
+    PRINCIPAL: ['S1', 'S2', 'S3'],
+    SCALAR: ['S'],
+}
+
+
+def to_component_array(data, num_nodes=None):
+    """Convert a getModelData payload into an (N, k) float64 array"""
+    if isinstance(data, np.ndarray):
+        array = data.astype(np.float64, copy=False)
+    elif len(data) == 0:
+        array = np.zeros((0, 1))
+    else:
+        try:
+            array = np.asarray(data, dtype=np.float64)
+        except ValueError:
+            # Ragged payload: keep rows with the dominant width, zero the others
+            width = len(data[0])
+            array = np.zeros((len(data), width))
+            for i, row in enumerate(data):
+                if len(row) == width:
+                    array[i] = row
+                else:
+                    print(f"⚠️ Unexpected data format at index {i}: {len(row)} components (expected {width})")
+
+    if array.ndim == 1:
+        array = array.reshape(-1, 1)
+
+    if num_nodes is not None and len(array) != num_nodes:
+        print(f"⚠️ Adjusting data array length from {len(array)} to {num_nodes}")
+        if len(array) > num_nodes:
+            array = array[:num_nodes]
+        else:
+            padding = np.zeros((num_nodes - len(array), array.shape[1]))
+            array = np.vstack([array, padding])
+
+    return array
+
+
+def detect_layout(array, num_comp=None):
+    """Pick the tensor layout once for the whole view"""
+    width = array.shape[1]
+    layout = LAYOUTS_BY_WIDTH.get(width)
+    if layout == PRINCIPAL and num_comp == 3:
+        # gmsh reports 3 components for vector views: treat the first one as von Mises
+        layout = SCALAR
+    return layout
+
+
+def _symmetric_components(array, layout):
+    """Return xx, yy, zz, xy, yz, zx column views for tensor layouts"""
+    if layout == FULL_TENSOR:
+        return array[:, 0], array[:, 4], array[:, 8], array[:, 1], array[:, 5], array[:, 6]
+    return array[:, 0], array[:, 1], array[:, 2], array[:, 3], array[:, 4], array[:, 5]
+
+
+def von_mises(array, layout):
+    """Compute von Mises stress for every row of a component array"""
+    if layout in (FULL_TENSOR, SYMMETRIC_TENSOR):
+        xx, yy, zz, xy, yz, zx = _symmetric_components(array, layout)
+        return np.sqrt(((xx - yy) ** 2 + (yy - zz) ** 2 + (zz - xx) ** 2) / 2 + 3 * (xy * xy + yz * yz + zx * zx))
+    if layout == PRINCIPAL:
+        s1, s2, s3 = array[:, 0], array[:, 1], array[:, 2]
+        return np.sqrt(((s1 - s2) ** 2 + (s2 - s3) ** 2 + (s3 - s1) ** 2) / 2)
+    if layout == SCALAR:
+        return array[:, 0].copy()
+    print(f"⚠️ Unexpected stress data format: {array.shape[1]} components (expected 1, 3, 6, or 9)")
+    return np.zeros(len(array))
+
+
+def principal_stresses(array, layout):
+    """Compute principal stresses (s1 >= s2 >= s3) for every row of a component array"""
+    if layout in (FULL_TENSOR, SYMMETRIC_TENSOR):
+        xx, yy, zz, xy, yz, zx = _symmetric_components(array, layout)
+        tensors = np.empty((len(array), 3, 3))
+        tensors[:, 0, 0], tensors[:, 1, 1], tensors[:, 2, 2] = xx, yy, zz
+        tensors[:, 0, 1] = tensors[:, 1, 0] = xy
+        tensors[:, 1, 2] = tensors[:, 2, 1] = yz
+        tensors[:, 0, 2] = tensors[:, 2, 0] = zx
+        return np.linalg.eigvalsh(tensors)[:, ::-1]
+    if layout == PRINCIPAL:
+        return -np.sort(-array[:, :3], axis=1)
+    return np.full((len(array), 3), np.nan)
+
+
+def compute_stress_fields(data, num_comp=None, num_nodes=None, principal=True):
+    """Compute von Mises, principal stresses and max shear for a whole stress view
+
+    Returns a dict with 'von_mises' (N,), 'principal' (N, 3), 'max_shear' (N,),
+    the raw (N, k) 'components' and the detected 'layout'. Principal values
+    are NaN for scalar views.
+    """
+    array = to_component_array(data, num_nodes)
+    layout = detect_layout(array, num_comp)
+    fields = {'layout': layout, 'components': array, 'von_mises': von_mises(array, layout)}
+
+    if principal:
+        principals = principal_stresses(array, layout)
+        fields['principal'] = principals
+        fields['max_shear'] = (principals[:, 0] - principals[:, 2]) / 2
+
+    return fields
+
+
+def force_vectors(data, num_nodes=None):
+    """Convert a force view payload into an (N, 3) array"""
+    array = to_component_array(data, num_nodes)
+    if array.shape[1] >= 3:
+        return np.ascontiguousarray(array[:, :3])
+
+    forces = np.zeros((len(array), 3))
+    if array.shape[1] == 1:
+        # Single component, assume it's magnitude
+        forces[:, 0] = array[:, 0]
+    else:
+        print(f"⚠️ Unexpected force data format: {array.shape[1]} components (expected 1 or 3+)")
+    return forces
+
+
+def component_names(layout, width):
+    """Column names for the raw components of a stress view"""
+    names = COMPONENT_NAMES.get(layout)
+    if names is None or len(names) != width:
+        names = [f'S{i}' for i in range(width)]
+    return names
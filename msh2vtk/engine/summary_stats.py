@@ -0,0 +1,109 @@
+import numpy as np
+
+# Extra rows written to von_mises_stress_results.csv by default
+DEFAULT_TRIMMED_PERCENTS = (1, 2, 5)
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+def parse_number_list(text, upper=100):
+    """Parse '1, 2, 5' into a tuple of floats in [0, upper]"""
+    if isinstance(text, (list, tuple)):
+        values = [float(value) for value in text]
+    else:
+        values = [float(value) for value in str(text).replace(';', ',').split(',') if value.strip()]
+    for value in values:
+        if not 0 <= value <= upper:
+            raise ValueError(f"{value:g} is outside 0-{upper:g}")
+    return tuple(values)
+
+
+class StressStats:
+    """Exact summary statistics of a stress array without sorting it
+
+    Trimmed means and percentiles are order statistics: all the positions
+    they need are selected with a single np.partition call on a copy of the
+    stress column, which is O(N) instead of the O(N log N) sort of the whole
+    frame. Same interface as streaming.RunningStats.
+    """
+
+    def __init__(self, values, coords=None, trimmed_percents=DEFAULT_TRIMMED_PERCENTS,
+                 percentiles=DEFAULT_PERCENTILES):
+        values = np.asarray(values, dtype=np.float64)
+        self.count = len(values)
+        self._trimmed = {}
+        self._percentiles = {}
+        if self.count == 0:
+            self.maximum = self.minimum = self.mean = np.nan
+            self.max_location = None
+            self._values = values
+            return
+
+        max_index = int(values.argmax())
+        self.maximum = float(values[max_index])
+        self.max_location = np.asarray(coords[max_index], dtype=np.float64) if coords is not None else None
+        self.minimum = float(values.min())
+        self.mean = float(values.mean())
+
+        excluded = {self._excluded(percent / 100) for percent in trimmed_percents}
+        positions = {q: q / 100 * (self.count - 1) for q in percentiles}
+        kth = {self.count - k for k in excluded if 0 < k < self.count}
+        for position in positions.values():
+            kth.update((int(np.floor(position)), int(np.ceil(position))))
+        partitioned = np.partition(values, sorted(kth)) if kth else values
+
+        for k in excluded:
+            self._trimmed[k] = self._kept_mean(partitioned, k)
+        for q, position in positions.items():
+            self._percentiles[q] = self._interpolate(partitioned, position)
+        self._values = values
+
+    def _excluded(self, fraction):
+        return int(self.count * fraction)
+
+    def _kept_mean(self, partitioned, k):
+        """Mean of the count - k smallest values (partitioned around count - k)"""
+        if k >= self.count:
+            return np.nan
+        return float(partitioned[:self.count - k].mean())
+
+    @staticmethod
+    def _interpolate(partitioned, position):
+        lower, upper = int(np.floor(position)), int(np.ceil(position))
+        low, high = partitioned[lower], partitioned[upper]
+        return float(low + (high - low) * (position - lower))
+
+    def trimmed_mean(self, fraction):
+        """Mean excluding the `fraction` highest values"""
+        k = self._excluded(fraction)
+        if k not in self._trimmed:
+            partitioned = np.partition(self._values, self.count - k) if 0 < k < self.count else self._values
+            self._trimmed[k] = self._kept_mean(partitioned, k)
+        return self._trimmed[k]
+
+    def percentile(self, q):
+        """q-th percentile (0-100) with linear interpolation"""
+        if q not in self._percentiles:
+            self._percentiles[q] = float(np.percentile(self._values, q)) if self.count else np.nan
+        return self._percentiles[q]
+
+
+def summary_rows(stats, trimmed_percents=DEFAULT_TRIMMED_PERCENTS, percentiles=DEFAULT_PERCENTILES):
+    """Rows of von_mises_stress_results.csv describing the whole model"""
+    location = stats.max_location if stats.max_location is not None else (None, None, None)
+    rows = [
+        {
+            'Value': 'Maximum',
+            'Von mises Stress': stats.maximum,
+            'Coordinate X': location[0],
+            'Coordinate Y': location[1],
+            'Coordinate Z': location[2]
+        },
+        {'Value': 'Minimum', 'Von mises Stress': stats.minimum},
+        {'Value': 'Average', 'Von mises Stress': stats.mean},
+    ]
+    for percent in trimmed_percents:
+        rows.append({'Value': f'Average (excluding {percent:g}% highest)',
+                     'Von mises Stress': stats.trimmed_mean(percent / 100)})
+    for q in percentiles:
+        rows.append({'Value': f'Percentile {q:g}', 'Von mises Stress': stats.percentile(q)})
+    return rows
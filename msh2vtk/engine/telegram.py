@@ -0,0 +1,290 @@
+import os
+import json
+import time
+import queue
+import threading
+
+# Telegram Configuration
+TELEGRAM_CONFIG_FILE = "telegram_config.json"
+TELEGRAM_BOT_TOKEN = ""
+TELEGRAM_CHAT_ID = ""
+TELEGRAM_ENABLED = False
+# Bot API server; point "api_url" in telegram_config.json at a local stand-in server to test
+DEFAULT_API_URL = "https://api.telegram.org"
+TELEGRAM_API_URL = DEFAULT_API_URL
+
+# Dispatcher limits (Telegram allows about 20 messages per minute in a group)
+MESSAGES_PER_MINUTE = 20
+DIGEST_INTERVAL = 60.0        # seconds per-file updates are collected before a digest is sent
+MAX_MESSAGE_LENGTH = 4000     # Telegram rejects texts above 4096 characters
+SEND_ATTEMPTS = 3
+REQUEST_TIMEOUT = 10
+FLUSH_TIMEOUT = 30            # seconds waited at exit for queued messages
+
+
+def configure(bot_token, chat_id, api_url=None):
+    """Use the given bot and chat for notifications (empty values disable them)"""
+    global TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_ENABLED, TELEGRAM_API_URL
+    TELEGRAM_BOT_TOKEN = bot_token
+    TELEGRAM_CHAT_ID = chat_id
+    TELEGRAM_ENABLED = bool(bot_token and chat_id)
+    if api_url is not None:
+        TELEGRAM_API_URL = (api_url or DEFAULT_API_URL).rstrip('/')
+
+
+def _read_config_file():
+    if os.path.exists(TELEGRAM_CONFIG_FILE):
+        try:
+            with open(TELEGRAM_CONFIG_FILE, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️  Error reading Telegram configuration: {e}")
+    return {}
+
+
+def read_telegram_config():
+    """Return (bot_token, chat_id) stored in the configuration file"""
+    config = _read_config_file()
+    return config.get('bot_token', ''), config.get('chat_id', '')
+
+
+def load_telegram_config():
+    """Load Telegram configuration from file"""
+    config = _read_config_file()
+    configure(config.get('bot_token', ''), config.get('chat_id', ''), config.get('api_url', ''))
+    return TELEGRAM_ENABLED
+
+
+def save_telegram_config(bot_token, chat_id):
+    """Save Telegram configuration to file"""
+    config = {
+        "bot_token": bot_token,
+        "chat_id": chat_id
+    }
+    if TELEGRAM_API_URL != DEFAULT_API_URL:
+        config["api_url"] = TELEGRAM_API_URL
+    
+    try:
+        with open(TELEGRAM_CONFIG_FILE, 'w') as f:
+            json.dump(config, f, indent=2)
+        return True
+    except Exception as e:
+        print(f"❌ Error saving configuration: {e}")
+        return False
+
+
+def clear_telegram_config():
+    """Disable notifications and remove the configuration file"""
+    configure("", "")
+    discard_pending_messages()
+    if os.path.exists(TELEGRAM_CONFIG_FILE):
+        os.remove(TELEGRAM_CONFIG_FILE)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _http():
+    """Shared requests.Session, so every message reuses the pooled HTTPS connection"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            # Imported on the first message: startup does not pay for requests when Telegram is off
+            import requests
+            _session = requests.Session()
+        return _session
+
+
+def _post_message(bot_token, chat_id, text, silent=False):
+    """POST sendMessage and return the response (raises on network errors)"""
+    url = f"{TELEGRAM_API_URL}/bot{bot_token}/sendMessage"
+    data = {
+        'chat_id': chat_id,
+        'text': text,
+        'parse_mode': 'HTML',
+        'disable_notification': silent
+    }
+    return _http().post(url, data=data, timeout=REQUEST_TIMEOUT)
+
+
+def test_telegram_connection(bot_token, chat_id):
+    """Test Telegram connection"""
+    try:
+        response = _post_message(bot_token, chat_id, '🧪 Connection test - MSH2VTK configured correctly!')
+        return response.status_code == 200
+        
+    except Exception as e:
+        print(f"❌ Error connecting to Telegram: {e}")
+        return False
+
+
+def _split_digest(entries):
+    """Group digest entries into texts that fit in a Telegram message"""
+    texts, current = [], []
+    for entry in entries:
+        entry = entry[:MAX_MESSAGE_LENGTH - 100]
+        if current and len("\n".join(current)) + len(entry) + 1 > MAX_MESSAGE_LENGTH - 100:
+            texts.append(current)
+            current = []
+        current.append(entry)
+    if current:
+        texts.append(current)
+    return texts
+
+
+class TelegramDispatcher:
+    """Sends notifications from a background thread, never blocking the caller
+
+    Messages are sent in order, at most MESSAGES_PER_MINUTE, through one
+    pooled HTTP session; a message that fails is retried a few times (a 429
+    answer is retried after the delay Telegram asks for) and then dropped.
+    Digest messages (per-file completions) are collected and sent together
+    every DIGEST_INTERVAL seconds, or before the next regular message so
+    the order of events is preserved.
+    """
+
+    def __init__(self, messages_per_minute=MESSAGES_PER_MINUTE, digest_interval=DIGEST_INTERVAL):
+        self.min_interval = 60.0 / messages_per_minute
+        self.digest_interval = digest_interval
+        self._queue = queue.Queue()
+        self._digest = []
+        self._digest_silent = True
+        self._digest_since = None
+        self._last_send = 0.0
+        self._idle = threading.Event()
+        self._idle.set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="telegram-dispatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, message, silent=False, digest=False):
+        with self._lock:
+            self._idle.clear()
+            self._queue.put((message, silent, digest))
+
+    def flush(self, timeout=None):
+        """Send the pending digest now and wait until nothing is left to send; False on timeout"""
+        self.submit(None)
+        return self._idle.wait(timeout)
+
+    def discard(self):
+        """Drop everything not sent yet"""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._digest = []
+            self._digest_since = None
+            self._idle.set()
+
+    def _run(self):
+        while True:
+            timeout = None
+            if self._digest_since is not None:
+                timeout = max(0.0, self._digest_since + self.digest_interval - time.time())
+            try:
+                message, silent, digest = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._send_digest()
+                continue
+
+            if message is None:
+                # flush()
+                self._send_digest()
+            elif digest:
+                with self._lock:
+                    self._digest.append(message.replace("\n", " "))
+                    self._digest_silent = self._digest_silent and silent
+                    if self._digest_since is None:
+                        self._digest_since = time.time()
+            else:
+                self._send_digest()
+                self._send(message, silent)
+
+            with self._lock:
+                if self._queue.empty() and not self._digest:
+                    self._idle.set()
+
+    def _send_digest(self):
+        with self._lock:
+            entries, silent = self._digest, self._digest_silent
+            self._digest, self._digest_silent, self._digest_since = [], True, None
+        if not entries:
+            return
+        if len(entries) == 1:
+            self._send(entries[0], silent)
+            return
+        for group in _split_digest(entries):
+            self._send(f"📬 <b>{len(group)} updates</b>\n" + "\n".join(group), silent)
+
+    def _send(self, text, silent):
+        bot_token, chat_id = TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+        if not (bot_token and chat_id):
+            return False
+        for attempt in range(SEND_ATTEMPTS):
+            # Rate limit shared by every message
+            wait = self._last_send + self.min_interval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_send = time.time()
+            try:
+                response = _post_message(bot_token, chat_id, text, silent)
+            except Exception as e:
+                print(f"⚠️  Error sending Telegram message: {e}")
+                time.sleep(2 ** attempt)
+                continue
+            if response.status_code == 200:
+                return True
+            if response.status_code == 429:
+                try:
+                    retry_after = float(response.json()['parameters']['retry_after'])
+                except (ValueError, KeyError, TypeError):
+                    retry_after = 2 ** attempt
+                time.sleep(retry_after)
+                continue
+            print(f"⚠️  Telegram rejected a message: HTTP {response.status_code}")
+            return False
+        return False
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def _get_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = TelegramDispatcher()
+        return _dispatcher
+
+
+def send_telegram_message(message, silent=False, digest=False):
+    """Queue a message for Telegram; returns at once (False when notifications are off)
+
+    digest=True marks per-file updates that may be grouped with others into
+    a periodic digest.
+    """
+    if not TELEGRAM_ENABLED:
+        return False
+    _get_dispatcher().submit(message, silent, digest)
+    return True
+
+
+def flush_telegram(timeout=FLUSH_TIMEOUT):
+    """Send the pending notifications before exiting; False if they could not all be sent in time"""
+    with _dispatcher_lock:
+        dispatcher = _dispatcher
+    if dispatcher is None:
+        return True
+    return dispatcher.flush(timeout)
+
+
+def discard_pending_messages():
+    with _dispatcher_lock:
+        dispatcher = _dispatcher
+    if dispatcher is not None:
+        dispatcher.discard()
@@ -0,0 +1,291 @@
+import os
+import zlib
+import struct
+import numpy as np
+from .msh_reader import node_tag_index
+from .optional import module_available
+
+# Output formats for the combined mesh: XML .vtu by default, legacy .vtk on request
+VTU_FORMAT = "vtu"
+LEGACY_FORMAT = "legacy"
+VTU_COMPRESSORS = ("zlib", "lz4", "none")
+DEFAULT_VTU_COMPRESSION = "zlib"
+
+# gmsh element type -> VTK cell type
+GMSH_TO_VTK_CELL_TYPE = {
+    1: 3,    # 2-node line -> VTK_LINE
+    2: 5,    # 3-node triangle -> VTK_TRIANGLE
+    3: 9,    # 4-node quadrangle -> VTK_QUAD
+    4: 10,   # 4-node tetrahedron -> VTK_TETRA
+    5: 12,   # 8-node hexahedron -> VTK_HEXAHEDRON
+    6: 13,   # 6-node prism -> VTK_WEDGE
+    7: 14,   # 5-node pyramid -> VTK_PYRAMID
+    8: 21,   # 3-node line -> VTK_QUADRATIC_EDGE
+    9: 22,   # 6-node triangle -> VTK_QUADRATIC_TRIANGLE
+    11: 24,  # 10-node tetrahedron -> VTK_QUADRATIC_TETRA
+    15: 1,   # 1-node point -> VTK_VERTEX
+    16: 23,  # 8-node quadrangle -> VTK_QUADRATIC_QUAD
+    17: 25,  # 20-node hexahedron -> VTK_QUADRATIC_HEXAHEDRON
+}
+
+# Node order differences between gmsh and VTK for higher order elements
+GMSH_TO_VTK_NODE_ORDER = {
+    11: [0, 1, 2, 3, 4, 5, 6, 7, 9, 8],
+    17: [0, 1, 2, 3, 4, 5, 6, 7, 8, 11, 13, 9, 16, 18, 19, 17, 10, 12, 14, 15],
+}
+
+
+def build_cells(elements, node_tags):
+    """Build the VTK cell array and cell types with one vectorized pass per element type
+
+    `elements` is a list of (element_type, element_tags, connectivity) tuples
+    where connectivity holds node tags with shape (M, nodes_per_element).
+    """
+    tag_to_index = node_tag_index(node_tags)
+    cell_blocks = []
+    cell_types = []
+
+    for element_type, _, connectivity in elements:
+        vtk_type = GMSH_TO_VTK_CELL_TYPE.get(int(element_type))
+        if vtk_type is None:
+            print(f"⚠️ Skipping {len(connectivity)} elements of unsupported gmsh type {element_type}")
+            continue
+        if len(connectivity) == 0:
+            continue
+
+        if connectivity.min() < 0 or connectivity.max() >= len(tag_to_index):
+            raise ValueError(f"Elements of type {element_type} reference unknown node tags")
+        indices = tag_to_index[connectivity]
+        if (indices < 0).any():
+            raise ValueError(f"Elements of type {element_type} reference unknown node tags")
+
+        order = GMSH_TO_VTK_NODE_ORDER.get(int(element_type))
+        if order is not None:
+            indices = indices[:, order]
+
+        counts = np.full(len(indices), indices.shape[1], dtype=np.int64)
+        cell_blocks.append(np.column_stack([counts, indices]).ravel())
+        cell_types.append(np.full(len(indices), vtk_type, dtype=np.uint8))
+
+    if not cell_blocks:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+    return np.concatenate(cell_blocks), np.concatenate(cell_types)
+
+
+def build_unstructured_grid(node_coords, node_tags, elements):
+    """Create a pyvista UnstructuredGrid from MSH nodes and elements"""
+    import pyvista as pv
+
+    cells, cell_types = build_cells(elements, node_tags)
+    return pv.UnstructuredGrid(cells, cell_types, np.asarray(node_coords, dtype=np.float64))
+
+
+def save_grid(mesh, output_folder, base_name='combined_data', vtk_format=VTU_FORMAT,
+              compression=DEFAULT_VTU_COMPRESSION):
+    """Save a mesh as compressed appended-binary .vtu or as legacy .vtk
+
+    Returns the path of the written file.
+    """
+    if vtk_format == LEGACY_FORMAT:
+        path = os.path.join(output_folder, base_name + '.vtk')
+        mesh.save(path)
+        return path
+
+    from vtkmodules.vtkIOXML import vtkXMLUnstructuredGridWriter
+
+    if compression not in VTU_COMPRESSORS:
+        raise ValueError(f"Unknown VTU compression '{compression}' (expected one of {', '.join(VTU_COMPRESSORS)})")
+
+    path = os.path.join(output_folder, base_name + '.vtu')
+    writer = vtkXMLUnstructuredGridWriter()
+    writer.SetFileName(path)
+    writer.SetInputData(mesh)
+    # Raw appended data: no base64 step, arrays are written as compressed blocks
+    writer.SetDataModeToAppended()
+    writer.EncodeAppendedDataOff()
+    writer.SetHeaderTypeToUInt64()
+    if compression == "zlib":
+        writer.SetCompressorTypeToZLib()
+    elif compression == "lz4":
+        writer.SetCompressorTypeToLZ4()
+    else:
+        writer.SetCompressorTypeToNone()
+    if not writer.Write():
+        raise OSError(f"Could not write {path}")
+    return path
+
+
+# ------------------------------------------------------------ streaming writer
+
+# LZ4 compression of .vtu files written block by block needs the lz4 package
+LZ4_AVAILABLE = module_available('lz4')
+
+VTU_BLOCK_SIZE = 1 << 20
+VTU_COMPRESSOR_NAMES = {"zlib": "vtkZLibDataCompressor", "lz4": "vtkLZ4DataCompressor"}
+_VTU_TYPE_NAMES = {np.dtype('<f8'): "Float64", np.dtype('<i8'): "Int64", np.dtype('u1'): "UInt8"}
+_OFFSET_WIDTH = 20
+
+
+def _block_compressor(compression):
+    """Function compressing one block of appended data (None: stored uncompressed)"""
+    if compression == "zlib":
+        return lambda block: zlib.compress(block, 6)
+    if compression == "lz4":
+        import lz4.block
+        return lambda block: lz4.block.compress(block, store_size=False)
+    return None
+
+
+def _write_appended_array(f, chunks, total_bytes, compress):
+    """Write one appended array from an iterator of arrays, block by block"""
+    if compress is None:
+        f.write(struct.pack('<Q', total_bytes))
+        for chunk in chunks:
+            f.write(chunk.tobytes())
+        return
+
+    # Header: block count, block size, size of the last partial block and the
+    # compressed size of every block, filled in once the blocks are written
+    num_blocks = max(1, -(-total_bytes // VTU_BLOCK_SIZE))
+    last_block = total_bytes % VTU_BLOCK_SIZE
+    header_position = f.tell()
+    f.write(bytes(8 * (3 + num_blocks)))
+
+    compressed_sizes = []
+
+    def write_block(block):
+        compressed = compress(block)
+        f.write(compressed)
+        compressed_sizes.append(len(compressed))
+
+    pending = b''
+    for chunk in chunks:
+        data = memoryview(chunk.tobytes())
+        if pending:
+            fill = VTU_BLOCK_SIZE - len(pending)
+            pending += bytes(data[:fill])
+            data = data[fill:]
+            if len(pending) < VTU_BLOCK_SIZE:
+                continue
+            write_block(pending)
+        full = len(data) - len(data) % VTU_BLOCK_SIZE
+        for start in range(0, full, VTU_BLOCK_SIZE):
+            write_block(data[start:start + VTU_BLOCK_SIZE])
+        pending = bytes(data[full:])
+    if pending or not compressed_sizes:
+        write_block(pending)
+
+    end_position = f.tell()
+    f.seek(header_position)
+    f.write(struct.pack(f'<{3 + num_blocks}Q', num_blocks, VTU_BLOCK_SIZE, last_block, *compressed_sizes))
+    f.seek(end_position)
+
+
+def _iter_rows(array, dtype, chunk_size):
+    for start in range(0, len(array), chunk_size):
+        yield np.ascontiguousarray(array[start:start + chunk_size], dtype=dtype)
+
+
+def write_vtu_stream(path, node_coords, node_tags, elements, point_data, compression=DEFAULT_VTU_COMPRESSION,
+                     chunk_size=1_000_000):
+    """Write a .vtu file piece by piece without building a vtkUnstructuredGrid
+
+    `point_data` maps array names to (N,) or (N, k) arrays, typically
+    disk-backed memmaps; they are read `chunk_size` rows at a time. Offsets in
+    the XML header are padded placeholders patched once the appended data
+    has been written, so the file is produced in a single pass.
+    """
+    if compression not in VTU_COMPRESSORS:
+        raise ValueError(f"Unknown VTU compression '{compression}' (expected one of {', '.join(VTU_COMPRESSORS)})")
+    if compression == "lz4" and not LZ4_AVAILABLE:
+        print("⚠️ lz4 package not available, compressing with zlib")
+        compression = "zlib"
+
+    tag_to_index = node_tag_index(node_tags)
+    blocks = []
+    for element_type, _, connectivity in elements:
+        vtk_type = GMSH_TO_VTK_CELL_TYPE.get(int(element_type))
+        if vtk_type is None:
+            print(f"⚠️ Skipping {len(connectivity)} elements of unsupported gmsh type {element_type}")
+        elif len(connectivity):
+            blocks.append((int(element_type), vtk_type, connectivity))
+    # Check every node tag before writing, not halfway through the appended data
+    for element_type, _, connectivity in blocks:
+        for rows in _iter_rows(connectivity, np.int64, chunk_size):
+            if rows.min() < 0 or rows.max() >= len(tag_to_index) or (tag_to_index[rows] < 0).any():
+                raise ValueError(f"Elements of type {element_type} reference unknown node tags")
+    num_points = len(node_tags)
+    num_cells = sum(len(connectivity) for _, _, connectivity in blocks)
+    num_connectivity = sum(connectivity.size for _, _, connectivity in blocks)
+
+    def connectivity_chunks():
+        for element_type, _, connectivity in blocks:
+            order = GMSH_TO_VTK_NODE_ORDER.get(element_type)
+            for rows in _iter_rows(connectivity, np.int64, chunk_size):
+                indices = tag_to_index[rows]
+                yield np.ascontiguousarray(indices[:, order] if order is not None else indices)
+
+    def offset_chunks():
+        end = 0
+        for _, _, connectivity in blocks:
+            width = connectivity.shape[1]
+            for start in range(0, len(connectivity), chunk_size):
+                count = min(chunk_size, len(connectivity) - start)
+                yield end + width * np.arange(1, count + 1, dtype=np.int64)
+                end += width * count
+
+    def type_chunks():
+        for _, vtk_type, connectivity in blocks:
+            for start in range(0, len(connectivity), chunk_size):
+                yield np.full(min(chunk_size, len(connectivity) - start), vtk_type, dtype=np.uint8)
+
+    # (section, name, components, dtype, chunk iterator, uncompressed size)
+    arrays = []
+    for name, values in point_data.items():
+        components = 1 if values.ndim == 1 else values.shape[1]
+        arrays.append(('PointData', name, components, np.dtype('<f8'),
+                       _iter_rows(values, '<f8', chunk_size), 8 * num_points * components))
+    arrays.append(('Points', 'Points', 3, np.dtype('<f8'), _iter_rows(node_coords, '<f8', chunk_size), 8 * num_points * 3))
+    arrays.append(('Cells', 'connectivity', 1, np.dtype('<i8'), connectivity_chunks(), 8 * num_connectivity))
+    arrays.append(('Cells', 'offsets', 1, np.dtype('<i8'), offset_chunks(), 8 * num_cells))
+    arrays.append(('Cells', 'types', 1, np.dtype('u1'), type_chunks(), num_cells))
+
+    compressor = f' compressor="{VTU_COMPRESSOR_NAMES[compression]}"' if compression != "none" else ''
+    header = [
+        '<?xml version="1.0"?>',
+        f'<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" header_type="UInt64"{compressor}>',
+        '  <UnstructuredGrid>',
+        f'    <Piece NumberOfPoints="{num_points}" NumberOfCells="{num_cells}">',
+    ]
+    placeholders = []
+    section = None
+    for array_section, name, components, dtype, _, _ in arrays:
+        if array_section != section:
+            if section is not None:
+                header.append(f'      </{section}>')
+            header.append(f'      <{array_section}>')
+            section = array_section
+        placeholder = f'@{len(placeholders)}@'.ljust(_OFFSET_WIDTH)
+        placeholders.append(placeholder)
+        name_attribute = f' Name="{name}"' if array_section != 'Points' else ''
+        header.append(f'        <DataArray type="{_VTU_TYPE_NAMES[dtype]}"{name_attribute} '
+                      f'NumberOfComponents="{components}" format="appended" offset="{placeholder}"/>')
+    header += [f'      </{section}>', '    </Piece>', '  </UnstructuredGrid>', '  <AppendedData encoding="raw">', '   _']
+    header_text = '\n'.join(header)
+
+    compress = _block_compressor(compression)
+    with open(path, 'wb') as f:
+        f.write(header_text.encode('ascii'))
+        data_start = f.tell()
+        offsets = []
+        for _, _, _, _, chunks, total_bytes in arrays:
+            offsets.append(f.tell() - data_start)
+            _write_appended_array(f, chunks, total_bytes, compress)
+        f.write(b'\n  </AppendedData>\n</VTKFile>\n')
+
+        # Patch the offsets in place: placeholders and values have the same width
+        for placeholder, offset in zip(placeholders, offsets):
+            position = header_text.index(placeholder)
+            f.seek(position)
+            f.write(str(offset).ljust(_OFFSET_WIDTH).encode('ascii'))
+    return path
@@ -0,0 +1,362 @@
+import os
+import hmac
+import json
+import time
+import uuid
+import shutil
+import socket
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .batch import FossilsBatch, FINAL_STATES
+from .ledger import QUEUED, DONE
+from .events import JOB, FINISHED
+from .metrics import METRICS_FILE
+from .paths import data_path
+from .postprocess_pool import DEFAULT_POSTPROCESS_WORKERS, DEFAULT_POSTPROCESS_TIMEOUT
+from .workspace import find_output_folder
+from .remote import (PROTOCOL_VERSION, DEFAULT_WORKER_PORT, TOKEN_HEADER, SETTINGS_HEADER, CHUNK_SIZE,
+                     extract_zip, folder_files, write_zip)
+
+# Folder of a worker agent receiving the job bundles
+WORKER_DIR = "remote_jobs"
+RESULTS_NAME = "results.zip"
+RESULT_TTL = 24 * 3600  # finished jobs never fetched by their coordinator are deleted after this long
+# Numeric fields of the X-Job-Settings header
+NUMERIC_SETTINGS = ('job_timeout', 'idle_timeout', 'max_retries', 'retry_backoff', 'postprocess_timeout')
+
+
+def parse_settings(header):
+    """Settings of a job from its X-Job-Settings header, ValueError when they are malformed"""
+    settings = json.loads(header or '{}')
+    if not isinstance(settings, dict):
+        raise ValueError("job settings must be a JSON object")
+    for name in NUMERIC_SETTINGS:
+        value = settings.get(name, 0)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"invalid job setting {name}: {value!r}")
+    if not isinstance(settings.get('postprocess_options') or {}, dict):
+        raise ValueError("invalid job setting postprocess_options")
+    return settings
+
+
+class RemoteJob:
+    """A job received by a worker agent: its folder, its FossilsBatch and, once finished, its results"""
+
+    def __init__(self, job_id, folder, script):
+        self.id = job_id
+        self.folder = folder
+        self.script = script
+        self.inputs = set()  # paths of the bundle files, left out of the results
+        self.batch = None
+        self.cancelled = False  # by the coordinator, which wants no results
+        self.state = QUEUED
+        self.finished_at = None
+        self.record = {}  # job_metrics.jsonl record of the job
+        self.results = None  # zip of the output folder
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+
+class WorkerAgent:
+    """Runs the Fossils jobs sent by coordinators, at most `slots` at once
+
+    Every job runs as a one-file FossilsBatch in its own folder, with the
+    post-processing options, timeouts and retries chosen by the coordinator,
+    so the solver watchdog, the logs and the post-processing are the same as
+    in a local batch. When the batch ends, the output folder and the solver
+    log are packed into results.zip for the coordinator to download.
+    """
+
+    def __init__(self, fossils_path, slots=1, workdir=None, token="", resource_aware=True,
+                 postprocess_workers=DEFAULT_POSTPROCESS_WORKERS):
+        self.fossils_path = fossils_path
+        self.slots = max(1, int(slots))
+        self.workdir = os.path.abspath(workdir if workdir is not None else data_path(WORKER_DIR))
+        self.token = token
+        self.resource_aware = resource_aware
+        self.postprocess_workers = postprocess_workers
+        self.jobs = {}  # id -> RemoteJob
+        self._lock = threading.Lock()
+        os.makedirs(self.workdir, exist_ok=True)
+
+    def active(self):
+        with self._lock:
+            return sum(1 for job in self.jobs.values() if not job.finished)
+
+    def status(self):
+        return {'protocol': PROTOCOL_VERSION, 'host': socket.gethostname(), 'slots': self.slots,
+                'active': self.active()}
+
+    def reserve(self, script_name):
+        """New job for a script, or None when every slot is busy"""
+        script_name = os.path.basename(script_name)
+        if not script_name.endswith('.py'):
+            raise ValueError(f"not a Python script: {script_name}")
+        self._purge()
+        with self._lock:
+            if sum(1 for job in self.jobs.values() if not job.finished) >= self.slots:
+                return None
+            job_id = uuid.uuid4().hex[:12]
+            folder = os.path.join(self.workdir, job_id)
+            job = self.jobs[job_id] = RemoteJob(job_id, folder, os.path.join(folder, script_name))
+        os.makedirs(folder)
+        return job
+
+    def start(self, job, bundle, settings):
+        """Unpack the bundle of a reserved job and start its batch
+
+        On any error the job and its folder are deleted, freeing the slot.
+        """
+        try:
+            extract_zip(bundle, job.folder)
+            if not os.path.isfile(job.script):
+                raise ValueError(f"{os.path.basename(job.script)} missing from the bundle")
+            job.inputs = {os.path.abspath(path) for path, name in folder_files(job.folder)}
+
+            batch = FossilsBatch(
+                self.fossils_path,
+                max_jobs=1,
+                resource_aware=self.resource_aware,
+                longest_first=False,
+                postprocess_options=settings.get('postprocess_options'),
+                postprocess_workers=self.postprocess_workers,
+                postprocess_timeout=settings.get('postprocess_timeout', DEFAULT_POSTPROCESS_TIMEOUT),
+                job_timeout=settings.get('job_timeout', 0),
+                idle_timeout=settings.get('idle_timeout', 0),
+                max_retries=settings.get('max_retries', 0),
+                retry_backoff=settings.get('retry_backoff', 0),
+                metrics_path=os.path.join(self.workdir, METRICS_FILE),
+            )
+            batch.events.subscribe(lambda event: self._on_state(job, event), (JOB,))
+            batch.events.subscribe(lambda event: self._on_finished(job), (FINISHED,))
+            job.batch = batch
+            print(f"📦 Job {job.id}: {os.path.basename(job.script)} ({len(job.inputs)} files)")
+            batch.start([job.script])
+        except Exception:
+            if job.batch is not None:
+                job.cancelled = True
+                job.batch.cancel()
+            self.delete(job.id)
+            raise
+
+    def _on_state(self, job, event):
+        job.state = event.data['state']
+
+    def _on_finished(self, job):
+        """Pack the results of a finished job"""
+        if job.cancelled:
+            self.delete(job.id)
+            print(f"🛑 Job {job.id} cancelled")
+            return
+        batch = job.batch
+        success = bool(batch.results.get(job.script))
+        job.record = dict(batch.metric_records[0]) if batch.metric_records else {}
+        if job.state not in FINAL_STATES:
+            job.state = DONE if success else batch.states.get(job.script, job.state)
+        # The output folder, or only the solver log (next to the inputs) when there is none
+        folder = find_output_folder(job.script) or os.path.splitext(job.script)[0]
+        files = [(path, name) for path, name in folder_files(folder) if os.path.abspath(path) not in job.inputs]
+        try:
+            results = os.path.join(job.folder, RESULTS_NAME)
+            write_zip(files, results)
+            job.results = results
+        except OSError as e:
+            print(f"⚠️  Could not pack the results of job {job.id}: {e}")
+        job.finished_at = time.time()
+        print(f"{'✅' if success else '❌'} Job {job.id} {job.state}: {os.path.basename(job.script)} "
+              f"({len(files)} result files)")
+
+    def poll(self, job_id, seen=0):
+        """State of a job and its output lines after the first `seen` (none after it finished)"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        answer = {'id': job.id, 'state': job.state, 'finished': job.finished, 'success': None,
+                  'lines': [], 'seen': seen, 'metrics': {}, 'error': None}
+        if job.batch is not None:
+            for file, output in job.batch.live_outputs():
+                if seen > output.lines:
+                    # A new attempt restarted the output
+                    seen = 0
+                answer['seen'], answer['lines'] = output.since(seen)
+        if job.finished:
+            answer['success'] = job.state == DONE
+            answer['metrics'] = job.record
+            if not answer['success']:
+                return_code = job.record.get('return_code')
+                answer['error'] = f"{job.state} on {socket.gethostname()}" + (
+                    f" (exit code {return_code})" if return_code is not None else "")
+        return answer
+
+    def cancel(self, job_id):
+        """Cancel a running job; a finished one is deleted. False when unknown"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        if job.finished or job.batch is None:
+            self.delete(job_id)
+        else:
+            print(f"🛑 Job {job.id} cancelled by the coordinator")
+            job.cancelled = True
+            job.batch.cancel()
+        return True
+
+    def delete(self, job_id):
+        with self._lock:
+            job = self.jobs.pop(job_id, None)
+        if job is not None:
+            shutil.rmtree(job.folder, ignore_errors=True)
+
+    def _purge(self):
+        """Delete the finished jobs nobody fetched within RESULT_TTL"""
+        now = time.time()
+        with self._lock:
+            expired = [job.id for job in self.jobs.values() if job.finished and now - job.finished_at > RESULT_TTL]
+        for job_id in expired:
+            self.delete(job_id)
+
+    def shutdown(self):
+        """Cancel the running jobs"""
+        with self._lock:
+            running = [job for job in self.jobs.values() if not job.finished and job.batch is not None]
+        for job in running:
+            job.batch.cancel()
+
+
+class WorkerRequestHandler(BaseHTTPRequestHandler):
+    """HTTP side of a WorkerAgent (server.agent)"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive: coordinators reuse their connection
+    server_version = f"msh2vtk-worker/{PROTOCOL_VERSION}"
+
+    def _send_json(self, code, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _refuse(self, code, error):
+        # The request body, if any, was not read: the connection cannot be reused
+        self.close_connection = True
+        self._send_json(code, {'error': error})
+
+    def _route(self):
+        """(path parts, query) of an authorized request, or None once refused"""
+        agent = self.server.agent
+        if agent.token and not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ''), agent.token):
+            self._refuse(401, "invalid token")
+            return None
+        url = urllib.parse.urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        return parts, urllib.parse.parse_qs(url.query)
+
+    def do_GET(self):
+        route = self._route()
+        if route is None:
+            return
+        parts, query = route
+        agent = self.server.agent
+        if parts == ['status']:
+            self._send_json(200, agent.status())
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            answer = agent.poll(parts[1], int(query.get('since', ['0'])[0]))
+            if answer is None:
+                self._send_json(404, {'error': "unknown job"})
+            else:
+                self._send_json(200, answer)
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'results':
+            job = agent.jobs.get(parts[1])
+            if job is None or not job.finished or job.results is None:
+                self._send_json(404, {'error': "no results"})
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/zip')
+            self.send_header('Content-Length', str(os.path.getsize(job.results)))
+            self.end_headers()
+            with open(job.results, 'rb') as f:
+                shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+        else:
+            self._send_json(404, {'error': "not found"})
+
+    def do_POST(self):
+        route = self._route()
+        if route is None:
+            return
+        parts, query = route
+        agent = self.server.agent
+        if parts != ['jobs']:
+            self._refuse(404, "not found")
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            settings = parse_settings(self.headers.get(SETTINGS_HEADER))
+            job = agent.reserve(query.get('script', [''])[0])
+        except ValueError as e:
+            self._refuse(400, str(e))
+            return
+        if job is None:
+            self._refuse(503, f"all {agent.slots} slots busy")
+            return
+
+        # Store the bundle on disk: STLs can be large
+        bundle = os.path.join(job.folder, "bundle.zip")
+        try:
+            with open(bundle, 'wb') as f:
+                while length > 0:
+                    chunk = self.rfile.read(min(CHUNK_SIZE, length))
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    length -= len(chunk)
+            agent.start(job, bundle, settings)
+        except Exception as e:
+            # start() already deleted the job, not when the bundle could not be stored
+            agent.delete(job.id)
+            print(f"❌ Could not start job {job.id}: {e}")
+            self._send_json(400, {'error': str(e)})
+            return
+        os.remove(bundle)
+        self._send_json(202, {'id': job.id})
+
+    def do_DELETE(self):
+        route = self._route()
+        if route is None:
+            return
+        parts, query = route
+        if len(parts) == 2 and parts[0] == 'jobs' and self.server.agent.cancel(parts[1]):
+            self._send_json(200, {'id': parts[1]})
+        else:
+            self._send_json(404, {'error': "unknown job"})
+
+    def log_message(self, format, *args):
+        # Jobs are reported by the agent, requests are not
+        pass
+
+
+def make_worker_server(agent, host="127.0.0.1", port=DEFAULT_WORKER_PORT):
+    """HTTP server of a worker agent (port 0 picks a free port: server.server_address)"""
+    server = ThreadingHTTPServer((host, port), WorkerRequestHandler)
+    server.daemon_threads = True
+    server.agent = agent
+    return server
+
+
+def serve_worker(agent, host="127.0.0.1", port=DEFAULT_WORKER_PORT):
+    """Serve coordinators until interrupted, then cancel the running jobs"""
+    server = make_worker_server(agent, host, port)
+    host, port = server.server_address[:2]
+    print(f"🌐 Worker listening on http://{host}:{port} ({agent.slots} slots, jobs in {agent.workdir})")
+    if not agent.token:
+        print("⚠️  No --token: anyone who can reach this port can run scripts on this machine")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Worker stopping, cancelling running jobs...")
+    finally:
+        agent.shutdown()
+        server.server_close()
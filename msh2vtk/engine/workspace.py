@@ -0,0 +1,189 @@
+import os
+import shutil
+from .paths import app_dir
+
+
+MSH_OUTPUT_FILES = ('mesh.msh', 'smooth_stress_tensor.msh', 'force_vector.msh')
+
+
+def _workspace_dirs(python_file):
+    return [
+        os.path.join(os.path.dirname(python_file), "workspace"),
+        os.path.join(app_dir(), "workspace")
+    ]
+
+
+def msh_search_locations(python_file):
+    """Folders where Fossils may have written the MSH files of a Python file, most likely first"""
+    base_name = os.path.splitext(os.path.basename(python_file))[0]
+    parent_dir = os.path.dirname(python_file)
+    
+    # List of possible locations to search for MSH files
+    possible_locations = []
+    
+    # 1. Same folder as python file (original expected location)
+    possible_locations.append(os.path.splitext(python_file)[0])
+    
+    # 2. Workspace folder in the same directory as python file
+    possible_locations.append(os.path.join(parent_dir, "workspace", base_name))
+    
+    # 3. Workspace folder in the script directory (where main.py is)
+    possible_locations.append(os.path.join(app_dir(), "workspace", base_name))
+    
+    # 4. Search for folders that contain part of the python file name in workspace directories
+    for workspace_dir in _workspace_dirs(python_file):
+        if os.path.exists(workspace_dir):
+            try:
+                for folder_name in os.listdir(workspace_dir):
+                    folder_path = os.path.join(workspace_dir, folder_name)
+                    if os.path.isdir(folder_path):
+                        # Check if the folder name contains the base name of our python file
+                        # or if our base name contains part of the folder name
+                        if (base_name.lower() in folder_name.lower() or 
+                            folder_name.lower() in base_name.lower() or
+                            any(word in folder_name.lower() for word in base_name.lower().split('_') if len(word) > 3)):
+                            possible_locations.append(folder_path)
+            except Exception as e:
+                print(f"   ⚠️  Error scanning workspace directory {workspace_dir}: {e}")
+    
+    # Remove duplicates while preserving order
+    return list(dict.fromkeys(possible_locations))
+
+
+def find_output_folder(python_file):
+    """Folder holding all the MSH output of a Python file, or None (no logging)"""
+    for folder_path in msh_search_locations(python_file):
+        if all(os.path.exists(os.path.join(folder_path, name)) for name in MSH_OUTPUT_FILES):
+            return folder_path
+    return None
+
+
+def find_msh_files(python_file):
+    """Find MSH files generated by Fossils with enhanced search pattern"""
+    base_name = os.path.splitext(os.path.basename(python_file))[0]
+    unique_locations = msh_search_locations(python_file)
+    workspace_dirs = _workspace_dirs(python_file)
+    
+    print(f"🔍 Searching for MSH files for: {base_name}")
+    print(f"   Checking {len(unique_locations)} possible locations...")
+    
+    # Check each possible location
+    for i, folder_path in enumerate(unique_locations, 1):
+        print(f"   {i}. Checking: {folder_path}")
+        
+        if not os.path.exists(folder_path):
+            print(f"      ❌ Directory does not exist")
+            continue
+            
+        mesh_file = os.path.join(folder_path, 'mesh.msh')
+        stress_tensor_file = os.path.join(folder_path, 'smooth_stress_tensor.msh')
+        force_vector_file = os.path.join(folder_path, 'force_vector.msh')
+
+        # Check if all required files exist
+        files_exist = [
+            os.path.exists(mesh_file),
+            os.path.exists(stress_tensor_file),
+            os.path.exists(force_vector_file)
+        ]
+        
+        print(f"      📄 mesh.msh: {'✅' if files_exist[0] else '❌'}")
+        print(f"      📄 smooth_stress_tensor.msh: {'✅' if files_exist[1] else '❌'}")
+        print(f"      📄 force_vector.msh: {'✅' if files_exist[2] else '❌'}")
+
+        if all(files_exist):
+            print(f"   ✅ Found all MSH files in: {folder_path}")
+            return mesh_file, stress_tensor_file, force_vector_file
+    
+    # If no files found, show what's in the workspace for debugging
+    print(f"❌ MSH files not found in any of the {len(unique_locations)} locations checked")
+    
+    # Show workspace contents for debugging
+    for workspace_dir in workspace_dirs:
+        if os.path.exists(workspace_dir):
+            print(f"📁 Contents of workspace folder ({workspace_dir}):")
+            try:
+                for item in os.listdir(workspace_dir):
+                    item_path = os.path.join(workspace_dir, item)
+                    if os.path.isdir(item_path):
+                        print(f"   📂 {item}")
+                        # Show MSH files in this folder
+                        try:
+                            msh_files = [f for f in os.listdir(item_path) if f.endswith('.msh')]
+                            if msh_files:
+                                print(f"      MSH files: {', '.join(msh_files)}")
+                            else:
+                                print(f"      No MSH files found")
+                        except Exception as e:
+                            print(f"      Error listing folder contents: {e}")
+            except Exception as e:
+                print(f"   Error listing workspace contents: {e}")
+    
+    return None, None, None
+
+
+def rename_workspace_folder(python_file):
+    """Rename the workspace folder to match the Python file name"""
+    try:
+        base_name = os.path.splitext(os.path.basename(python_file))[0]
+        # Fossils writes its workspace next to the application
+        workspace_dir = os.path.join(app_dir(), "workspace")
+        
+        if not os.path.exists(workspace_dir):
+            print(f"⚠️  Workspace directory not found: {workspace_dir}")
+            return False
+        
+        # Find folders that might be the output from this python file
+        target_folder = None
+        longest_match = 0
+        
+        for folder_name in os.listdir(workspace_dir):
+            folder_path = os.path.join(workspace_dir, folder_name)
+            if os.path.isdir(folder_path):
+                # Look for folders that contain parts of the base name
+                # or where the base name contains parts of the folder name
+                if base_name.lower() in folder_name.lower():
+                    match_length = len(base_name)
+                    if match_length > longest_match:
+                        longest_match = match_length
+                        target_folder = folder_path
+                elif any(word in folder_name.lower() for word in base_name.lower().split('_') if len(word) > 3):
+                    # Check for word matches in underscored names
+                    words_matched = sum(1 for word in base_name.lower().split('_') if len(word) > 3 and word in folder_name.lower())
+                    if words_matched > longest_match:
+                        longest_match = words_matched
+                        target_folder = folder_path
+        
+        if target_folder:
+            expected_folder_name = base_name
+            expected_folder_path = os.path.join(workspace_dir, expected_folder_name)
+            
+            # Only rename if it's not already correctly named
+            if os.path.basename(target_folder) != expected_folder_name:
+                # If target already exists, remove it first
+                if os.path.exists(expected_folder_path):
+                    print(f"🗑️  Removing existing folder: {expected_folder_path}")
+                    shutil.rmtree(expected_folder_path)
+                
+                print(f"📁 Renaming workspace folder:")
+                print(f"   From: {os.path.basename(target_folder)}")
+                print(f"   To: {expected_folder_name}")
+                
+                os.rename(target_folder, expected_folder_path)
+                print(f"✅ Workspace folder renamed successfully")
+                return True
+            else:
+                print(f"✅ Workspace folder already has correct name: {expected_folder_name}")
+                return True
+        else:
+            print(f"⚠️  Could not find workspace folder for: {base_name}")
+            # List available folders for debugging
+            print("📂 Available workspace folders:")
+            for folder_name in os.listdir(workspace_dir):
+                folder_path = os.path.join(workspace_dir, folder_name)
+                if os.path.isdir(folder_path):
+                    print(f"   📂 {folder_name}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Error renaming workspace folder for {os.path.basename(python_file)}: {e}")
+        return False
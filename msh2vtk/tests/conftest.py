@@ -0,0 +1,57 @@
+import os
+import sys
+import stat
+
+import pytest
+
+# The engine package sits next to main.py, which is not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.workspace import MSH_OUTPUT_FILES  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Keep the ledger, metrics and learned models of every test in its own folder"""
+    folder = tmp_path / "data"
+    monkeypatch.setenv("MSH2VTK_DATA_DIR", str(folder))
+    return folder
+
+
+# Stand-in for Fossils: checks the bundle brought the bone STL, then writes the MSH outputs
+FAKE_FOSSILS = f"""#!{sys.executable}
+import os, sys, time
+script = sys.argv[1]
+folder = os.path.splitext(script)[0]
+for step in range(1, 4):
+    print(f"Solving step {{step}}/3", flush=True)
+    time.sleep(2.0 if "slow" in os.path.basename(script) else 0.1)
+if not os.path.isfile(os.path.join(folder, "bone.stl")):
+    sys.exit("no bone.stl")
+os.makedirs(folder, exist_ok=True)
+for name in {MSH_OUTPUT_FILES!r}:
+    with open(os.path.join(folder, name), "w") as f:
+        f.write(f"{{name}} of {{os.path.basename(script)}}\\n")
+"""
+
+
+@pytest.fixture
+def fossils(tmp_path):
+    path = tmp_path / "fake_fossils"
+    path.write_text(FAKE_FOSSILS)
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+@pytest.fixture
+def make_script():
+    """make_script(folder, name): a Fossils script with its STL folder, as written by the Blender exporter"""
+    return _make_script
+
+
+def _make_script(folder, name):
+    script = folder / f"{name}.py"
+    script.write_text("#! /usr/bin/env python3\n\n\ndef parms(d={}):\n    p = {}\n    return p\n")
+    (folder / name).mkdir()
+    (folder / name / "bone.stl").write_bytes(b"solid bone\nendsolid bone\n")
+    return str(script)
@@ -0,0 +1,58 @@
+import threading
+import time
+
+from engine import postprocess, postprocess_pool
+from engine.batch import FossilsBatch
+from engine.ledger import JobLedger, POST_PROCESSING, DONE
+
+
+def test_cancel_leaves_solved_jobs_to_resume(tmp_path, monkeypatch, fossils, make_script):
+    monkeypatch.setattr(postprocess_pool, 'postprocess_worker_command', lambda: None)
+    monkeypatch.setattr(postprocess_pool, '_pool', None)
+    started = threading.Event()
+    release = threading.Event()
+    processed = []
+
+    def process_fossils_output(file, timer=None, **options):
+        started.set()
+        release.wait(10)
+        processed.append(file)
+        return True
+
+    monkeypatch.setattr(postprocess, 'process_fossils_output', process_fossils_output)
+    jobs = tmp_path / "jobs"
+    jobs.mkdir()
+    scripts = [make_script(jobs, f"job{index}") for index in range(3)]
+    ledger = JobLedger(str(tmp_path / "jobs.db"))
+
+    try:
+        batch = FossilsBatch(fossils, max_jobs=3, resource_aware=False, longest_first=False, max_retries=0,
+                             postprocess_options={}, postprocess_workers=1, ledger=ledger)
+        batch.start(scripts)
+        deadline = time.time() + 10
+        while time.time() < deadline and not (started.is_set() and
+                                               set(batch.states.values()) == {POST_PROCESSING}):
+            time.sleep(0.05)
+        assert set(batch.states.values()) == {POST_PROCESSING}
+
+        # One job is being post-processed, the other two wait for the pool
+        batch.cancel()
+        release.set()
+        assert batch.wait(10)
+        states = {job['file']: job['state'] for job in ledger.jobs(batch.batch_id)}
+        assert states[processed[0]] == DONE
+        waiting = sorted(file for file, state in states.items() if state == POST_PROCESSING)
+        assert len(waiting) == 2
+        assert ledger.unfinished_batch()['id'] == batch.batch_id
+
+        # Resuming post-processes them without solving them again
+        resumed = FossilsBatch.from_ledger(ledger, ledger.batch(batch.batch_id))
+        resumed.resume(batch.batch_id)
+        assert resumed.wait(10)
+        assert sorted(processed[1:]) == waiting
+        assert {job['state'] for job in ledger.jobs(batch.batch_id)} == {DONE}
+        assert [job['attempts'] for job in ledger.jobs(batch.batch_id)] == [1, 1, 1]
+    finally:
+        release.set()
+        postprocess_pool.shutdown_postprocess_pool()
+        ledger.close()
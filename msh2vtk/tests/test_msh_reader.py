@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from engine import msh_reader
+from engine.msh_reader import read_fossils_results
+from engine.streaming import iter_result_chunks
+
+NODES = [(4, 0.0, 0.0, 0.0), (2, 1.0, 0.0, 0.0), (9, 0.0, 1.0, 0.0), (7, 0.0, 0.0, 1.5)]
+TRIANGLES = [(1, 4, 2, 9), (2, 4, 9, 7)]
+TETRAHEDRA = [(3, 4, 2, 9, 7)]
+# Node data in another order than the nodes, and missing node 7
+STRESS = [(9, 1, 0, 0, 0, 1, 0, 0, 0, 1), (4, 2, 0, 0, 0, 2, 0, 0, 0, 2), (2, 3, 1, 0, 1, 3, 0, 0, 0, 3)]
+FORCE = [(2, 0.5, 0, 0), (9, 0, 0.5, 0), (4, 0, 0, 0.5)]
+
+
+def line(values):
+    return " ".join(str(v) for v in values)
+
+
+def node_data(name, rows, version):
+    return (f"$MeshFormat\n{version} 0 8\n$EndMeshFormat\n$NodeData\n1\n\"{name}\"\n1\n0.0\n3\n0\n"
+            f"{len(rows[0]) - 1}\n{len(rows)}\n" + "".join(line(row) + "\n" for row in rows) + "$EndNodeData\n")
+
+
+def write_job(folder, version):
+    if version == "2.2":
+        nodes = f"{len(NODES)}\n" + "".join(line(node) + "\n" for node in NODES)
+        elements = [(tag, 2, 2, 0, 1) + tuple(rest) for tag, *rest in TRIANGLES]
+        elements += [(tag, 4, 2, 0, 1) + tuple(rest) for tag, *rest in TETRAHEDRA]
+        elements = f"{len(elements)}\n" + "".join(line(row) + "\n" for row in elements)
+    else:
+        nodes = (f"1 {len(NODES)} 1 9\n3 1 0 {len(NODES)}\n" + "".join(f"{node[0]}\n" for node in NODES)
+                 + "".join(line(node[1:]) + "\n" for node in NODES))
+        elements = (f"2 3 1 3\n2 1 2 {len(TRIANGLES)}\n" + "".join(line(row) + "\n" for row in TRIANGLES)
+                    + f"3 1 4 {len(TETRAHEDRA)}\n" + "".join(line(row) + "\n" for row in TETRAHEDRA))
+    mesh = folder / "mesh.msh"
+    mesh.write_text(f"$MeshFormat\n{version} 0 8\n$EndMeshFormat\n$Nodes\n{nodes}$EndNodes\n"
+                    f"$Elements\n{elements}$EndElements\n")
+    stress = folder / "smooth_stress_tensor.msh"
+    stress.write_text(node_data("stress", STRESS, version))
+    force = folder / "force_vector.msh"
+    force.write_text(node_data("force", FORCE, version))
+    return str(mesh), str(stress), str(force)
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    """Parse a few bytes at a time so rows straddle the block boundaries"""
+    monkeypatch.setattr(msh_reader, 'ASCII_BLOCK_BYTES', 7)
+    monkeypatch.setattr(msh_reader, 'BLOCK_VALUES', 5)
+
+
+@pytest.mark.parametrize("version", ["2.2", "4.1"])
+def test_ascii_sections_are_read_in_blocks(tmp_path, version):
+    results = read_fossils_results(*write_job(tmp_path, version))
+
+    assert results['node_tags'].tolist() == [4, 2, 9, 7]
+    assert results['node_coords'][3].tolist() == [0.0, 0.0, 1.5]
+    elements = {element_type: (tags.tolist(), connectivity.tolist())
+                for element_type, tags, connectivity in results['elements']}
+    assert elements == {2: ([1, 2], [[4, 2, 9], [4, 9, 7]]), 4: ([3], [[4, 2, 9, 7]])}
+    assert results['stress'][:, 0].tolist() == [2, 3, 1, 0]
+    assert results['force'].tolist() == [[0, 0, 0.5], [0.5, 0, 0], [0, 0.5, 0], [0, 0, 0]]
+
+
+@pytest.mark.parametrize("version", ["2.2", "4.1"])
+def test_scratch_read_is_disk_backed_and_aligned_per_chunk(tmp_path, version):
+    files = write_job(tmp_path, version)
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    streamed = read_fossils_results(*files, scratch_dir=str(scratch))
+    in_memory = read_fossils_results(*files)
+
+    assert isinstance(streamed['node_coords'], np.memmap)
+    assert isinstance(streamed['stress'], np.memmap)
+    assert streamed['stress_index'] is not None
+    chunks = list(iter_result_chunks(streamed, chunk_size=3))
+    whole = next(iter_result_chunks(in_memory, chunk_size=len(NODES)))
+    assert np.allclose(np.concatenate([chunk['von_mises'] for chunk in chunks]), whole['von_mises'])
+    assert np.array_equal(np.concatenate([chunk['forces'] for chunk in chunks]), whole['forces'])
+
+
+def test_truncated_section_is_a_format_error(tmp_path):
+    mesh, stress, force = write_job(tmp_path, "2.2")
+    with open(stress, 'w') as f:
+        # The header still announces the dropped last row
+        f.write(node_data("stress", STRESS, "2.2").replace(line(STRESS[-1]) + "\n", ""))
+    with pytest.raises(msh_reader.MshFormatError):
+        read_fossils_results(mesh, stress, force)
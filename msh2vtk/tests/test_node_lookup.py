@@ -0,0 +1,21 @@
+import numpy as np
+
+from engine.node_lookup import NodeLocator, ChunkedNodeLocator
+
+
+def test_chunked_lookup_matches_the_whole_index():
+    rng = np.random.default_rng(0)
+    coords = rng.uniform(0, 10, size=(500, 3))
+    # Duplicated nodes split across chunks, near misses and a point far away
+    coords[400] = coords[3] + 5e-5
+    points = np.vstack([coords[[3, 120, 499]], coords[7] + 2e-4, [[50.0, 50.0, 50.0]]])
+
+    chunked = ChunkedNodeLocator(points, 1e-4)
+    for start in range(0, len(coords), 64):
+        chunked.update(coords[start:start + 64], start)
+    matches, distances = chunked.find(points[::-1])
+    expected_matches, expected_distances = NodeLocator(coords, 1e-4).find(points[::-1])
+
+    assert [indices.tolist() for indices in matches] == [indices.tolist() for indices in expected_matches]
+    assert np.allclose(distances, expected_distances)
+    assert matches[-1].tolist() == [3, 400]
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from engine import postprocess
+from engine.postprocess import process_fossils_output
+from engine.vtk_export import LEGACY_FORMAT
+
+from test_msh_reader import write_job
+
+FIXATIONS = [{"name": "jaw", "nodes": [[1.0, 0.0, 0.0]], "direction": "xyz"},
+             {"name": "skull", "nodes": [[0.0, 0.0, 1.5]], "direction": "xyz"},
+             {"name": "loose", "nodes": [[5.0, 5.0, 5.0]], "direction": "xyz"}]
+
+
+@pytest.fixture
+def job(tmp_path):
+    """A Fossils script with areas of interest and fixations, and its MSH output"""
+    script = tmp_path / "job.py"
+    script.write_text(
+        "#! /usr/bin/env python3\n# Areas of interest\n#tip: [[0.0, 1.0, 0.0], [1.0, 0.0, 0.0]]\n"
+        "#base: [[0.0, 0.0, 0.0], [3.0, 3.0, 3.0]]\n\n\ndef parms(d={}):\n    p = {}\n"
+        f"    p['fixations'] = {json.dumps(FIXATIONS, indent=4)}\n    p['loads'] = []\n    return p\n")
+    (tmp_path / "job").mkdir()
+    write_job(tmp_path / "job", "4.1")
+    return script
+
+
+def summary(script):
+    with open(script.parent / "job" / "von_mises_stress_results.csv") as f:
+        # Areas of interest and fixations, after the statistics
+        return [line for line in f.read().splitlines() if line.split(',')[0] in ("tip", "base", "jaw", "skull", "loose")]
+
+
+def test_streamed_summary_matches_the_in_memory_one(job, monkeypatch):
+    assert process_fossils_output(str(job), export_smooth_stress=False, export_vtk=False)
+    expected = summary(job)
+    assert [line.split(',')[0] for line in expected] == ["tip", "base", "jaw", "skull"]
+
+    def no_index(*args):
+        raise AssertionError("streaming built an index over every node")
+
+    monkeypatch.setattr(postprocess, 'NodeLocator', no_index)
+    (job.parent / "job" / "von_mises_stress_results.csv").unlink()
+    assert process_fossils_output(str(job), export_smooth_stress=False, export_vtk=False, streaming=True,
+                                  chunk_size=3)
+    assert summary(job) == expected
+
+
+def test_streaming_refuses_legacy_vtk(job):
+    assert not process_fossils_output(str(job), export_vtk=True, vtk_format=LEGACY_FORMAT, streaming=True)
+    assert sorted(path.name for path in (job.parent / "job").iterdir()) == [
+        "force_vector.msh", "mesh.msh", "smooth_stress_tensor.msh"]
@@ -0,0 +1,76 @@
+import sys
+import threading
+import time
+
+from engine import postprocess, postprocess_pool
+from engine.postprocess_pool import PostProcessPool
+
+
+def test_in_process_fallback_runs_on_the_pool_slots(monkeypatch):
+    monkeypatch.setattr(postprocess_pool, 'postprocess_worker_command', lambda: None)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def process_fossils_output(file, timer=None, **options):
+        with lock:
+            running.append(file)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(file)
+        return file != "bad.py"
+
+    monkeypatch.setattr(postprocess, 'process_fossils_output', process_fossils_output)
+    pool = PostProcessPool(size=2)
+    try:
+        jobs = [pool.submit(f"job{index}.py", {}) for index in range(9)] + [pool.submit("bad.py", {})]
+        cancelled = pool.submit("cancelled.py", {})
+        cancelled.cancel()
+        assert all(job.done.wait(5) for job in jobs + [cancelled])
+    finally:
+        pool.shutdown()
+
+    assert [job.ok for job in jobs] == [True] * 9 + [False]
+    assert (cancelled.ok, cancelled.error) == (False, "cancelled")
+    assert max(peak) == 2
+    assert pool.is_idle()
+
+
+# A worker that takes a request and never answers
+HANGING_WORKER = [sys.executable, '-c', 'import sys, time; sys.stdin.readline(); time.sleep(60)']
+
+
+def test_hung_worker_is_killed_and_restarted():
+    pool = PostProcessPool(size=1, command=HANGING_WORKER, job_timeout=0.5)
+    try:
+        first = pool.submit("first.py", {}, on_log=lambda line: None)
+        assert first.done.wait(10)
+        hung = pool.processes[0]
+        assert hung.poll() is not None
+
+        second = pool.submit("second.py", {}, on_log=lambda line: None)
+        assert second.done.wait(10)
+        assert pool.processes[0] is not hung
+    finally:
+        pool.shutdown()
+
+    assert (first.ok, first.error) == (False, "timed out after 0.5 s")
+    assert (second.ok, second.error) == (False, "timed out after 0.5 s")
+    assert pool.is_idle()
+
+
+def test_cancel_kills_the_worker_of_a_running_job():
+    pool = PostProcessPool(size=1, command=HANGING_WORKER, job_timeout=0)
+    try:
+        job = pool.submit("running.py", {}, on_log=lambda line: None)
+        deadline = time.time() + 10
+        while job._stop is None and time.time() < deadline:
+            time.sleep(0.01)
+        job.cancel()
+        assert job.done.wait(10)
+    finally:
+        pool.shutdown()
+
+    assert (job.ok, job.error) == (False, "cancelled")
+    assert pool.is_idle()
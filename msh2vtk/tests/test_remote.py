@@ -0,0 +1,164 @@
+import os
+import io
+import time
+import socket
+import zipfile
+import threading
+
+import pytest
+
+from engine.batch import FossilsBatch, CANCELLED
+from engine.events import STATUS
+from engine.remote import RemoteWorker, RemoteError, extract_zip
+from engine import worker as worker_module
+from engine.worker import WorkerAgent, make_worker_server
+from engine.workspace import MSH_OUTPUT_FILES
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def start_worker(tmp_path, fossils):
+    """Start worker agents on localhost (port 0) and return their addresses"""
+    servers = []
+
+    def start(slots=1, token=TOKEN):
+        workdir = tmp_path / f"worker{len(servers) + 1}"
+        agent = WorkerAgent(fossils, slots=slots, workdir=str(workdir), token=token, resource_aware=False,
+                            postprocess_workers=1)
+        server = make_worker_server(agent, "127.0.0.1", 0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        host, port = server.server_address[:2]
+        return f"{host}:{port}"
+
+    yield start
+    for server in servers:
+        server.agent.shutdown()
+        server.shutdown()
+        server.server_close()
+
+
+def test_wrong_token_is_rejected(start_worker):
+    address = start_worker()
+    with pytest.raises(RemoteError) as error:
+        RemoteWorker(address, "wrong")._request('GET', '/status')
+    assert error.value.status == 401
+    assert not RemoteWorker(address).connect()
+
+    worker = RemoteWorker(address, TOKEN)
+    assert worker.connect()
+    assert worker.slots == 1
+
+
+def test_busy_worker_answers_503(tmp_path, start_worker, make_script):
+    address = start_worker(slots=1)
+    worker = RemoteWorker(address, TOKEN)
+    first = worker.submit(make_script(tmp_path, "slow"), {})
+    with pytest.raises(RemoteError) as error:
+        worker.submit(make_script(tmp_path, "other"), {})
+    assert error.value.status == 503
+    worker.cancel(first)
+
+
+def test_refused_job_frees_its_slot(tmp_path, start_worker, make_script, monkeypatch):
+    address = start_worker(slots=1)
+    worker = RemoteWorker(address, TOKEN)
+    script = make_script(tmp_path, "job")
+    with pytest.raises(RemoteError) as error:
+        worker.submit(script, {'max_retries': 'two'})
+    assert error.value.status == 400
+
+    def broken_batch(*args, **kwargs):
+        raise RuntimeError("no batch")
+
+    monkeypatch.setattr(worker_module, 'FossilsBatch', broken_batch)
+    with pytest.raises(RemoteError) as error:
+        worker.submit(script, {})
+    assert error.value.status == 400
+    # Neither request holds the only slot nor leaves its bundle behind
+    assert os.listdir(tmp_path / "worker1") == []
+    monkeypatch.setattr(worker_module, 'FossilsBatch', FossilsBatch)
+    worker.cancel(worker.submit(script, {}))
+
+
+def test_batch_runs_on_two_workers_and_downloads_results(tmp_path, start_worker, fossils, make_script):
+    addresses = [start_worker(slots=2), start_worker(slots=2)]
+    jobs = tmp_path / "jobs"
+    jobs.mkdir()
+    scripts = [make_script(jobs, f"job{index}") for index in range(4)]
+
+    batch = FossilsBatch(fossils, max_jobs=0, resource_aware=False, longest_first=False, max_retries=0,
+                         remote_workers=addresses, remote_token=TOKEN)
+    batch.start(scripts)
+    assert batch.wait(60)
+
+    assert all(batch.results.get(script) for script in scripts)
+    for script in scripts:
+        folder = os.path.splitext(script)[0]
+        for name in MSH_OUTPUT_FILES:
+            with open(os.path.join(folder, name)) as f:
+                assert f.read() == f"{name} of {os.path.basename(script)}\n"
+        # The inputs stay, the worker's copy of them is not sent back
+        assert sorted(os.listdir(folder)) == sorted(("bone.stl", "fossils.log") + MSH_OUTPUT_FILES)
+    workers = {record['worker'] for record in batch.metric_records}
+    assert len(workers) == 2
+
+    # Downloaded jobs are deleted from the workers, only their metrics file stays
+    deadline = time.time() + 5
+    while time.time() < deadline and any(os.listdir(tmp_path / name) != ["job_metrics.jsonl"]
+                                         for name in ("worker1", "worker2")):
+        time.sleep(0.1)
+    assert [os.listdir(tmp_path / name) for name in ("worker1", "worker2")] == [["job_metrics.jsonl"]] * 2
+
+
+def test_start_returns_while_a_silent_worker_is_connected(tmp_path, fossils, make_script):
+    # Accepts connections (through the backlog) but never answers
+    silent = socket.socket()
+    silent.bind(("127.0.0.1", 0))
+    silent.listen(1)
+    jobs = tmp_path / "jobs"
+    jobs.mkdir()
+    script = make_script(jobs, "job")
+    batch = FossilsBatch(fossils, max_jobs=0, resource_aware=False, max_retries=0,
+                         remote_workers=["%s:%d" % silent.getsockname()], remote_token=TOKEN)
+    statuses = []
+    batch.events.subscribe(lambda event: statuses.append(event.data['text']), (STATUS,))
+    try:
+        started = time.perf_counter()
+        batch.start([script])
+        assert time.perf_counter() - started < 0.5
+        assert batch.is_running()
+        assert statuses and statuses[0].startswith("🔄 Preparing Fossils")
+
+        # Cancelling while the worker is still being connected ends the batch at once
+        batch.cancel()
+        assert batch.wait(1)
+        assert batch.states == {script: CANCELLED}
+    finally:
+        silent.close()
+
+
+def zip_bytes(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.parametrize("name", ["../escape.txt", "sub/../../escape.txt", "/tmp/escape.txt", "."])
+def test_extract_zip_refuses_unsafe_paths(tmp_path, name):
+    target = tmp_path / "target"
+    with pytest.raises(ValueError):
+        extract_zip(zip_bytes([("ok.txt", b"ok"), (name, b"evil")]), str(target))
+    assert not (tmp_path / "escape.txt").exists()
+    # Nothing is extracted from a refused archive
+    assert not (target / "ok.txt").exists()
+
+
+def test_extract_zip_keeps_subfolders(tmp_path):
+    count = extract_zip(zip_bytes([("job.py", b"x"), ("job/bone.stl", b"solid")]), str(tmp_path / "out"))
+    assert count == 2
+    assert (tmp_path / "out" / "job" / "bone.stl").read_bytes() == b"solid"
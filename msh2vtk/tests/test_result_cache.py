@@ -0,0 +1,27 @@
+import os
+
+from engine import result_cache
+from engine.result_cache import check_cache, update_manifest, load_manifest
+
+
+def test_touched_input_is_hashed_once(tmp_path, monkeypatch):
+    source = tmp_path / "mesh.msh"
+    source.write_bytes(b"$MeshFormat\n4.1 0 8\n$EndMeshFormat\n")
+    output = tmp_path / "combined_data.vtu"
+    output.write_bytes(b"<VTKFile/>")
+    update_manifest(str(tmp_path), [str(source)], {'export_vtk': True}, [str(output)])
+
+    # Same content with a new mtime, e.g. copied back from a worker
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    hashed = []
+    file_hash = result_cache.file_hash
+    monkeypatch.setattr(result_cache, 'file_hash', lambda path: hashed.append(path) or file_hash(path))
+
+    assert check_cache(str(tmp_path), [str(source)], {'export_vtk': True}) == (True, "outputs are up to date")
+    assert load_manifest(str(tmp_path))['inputs']['mesh.msh']['mtime_ns'] == source.stat().st_mtime_ns
+    assert check_cache(str(tmp_path), [str(source)], {'export_vtk': True})[0]
+    assert hashed == [str(source)]
+
+    source.write_bytes(b"$MeshFormat\n4.1 0 8\n$EndMeshFormaT\n")
+    assert check_cache(str(tmp_path), [str(source)], {'export_vtk': True}) == (False, "mesh.msh changed")
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from engine.stress import compute_stress_fields, FULL_TENSOR, SYMMETRIC_TENSOR, PRINCIPAL, SCALAR
+
+
+def baseline_von_mises(sig, numComp):
+    """The per-node loop the GUI used before the vectorized kernel"""
+    if len(sig) == 9:
+        [xx, xy, xz, yx, yy, yz, zx, zy, zz] = sig
+        return np.sqrt(((xx - yy) ** 2 + (yy - zz) ** 2 + (zz - xx) ** 2) / 2 + 3 * (xy * xy + yz * yz + zx * zx))
+    if len(sig) == 6:
+        [xx, yy, zz, xy, yz, zx] = sig
+        return np.sqrt(((xx - yy) ** 2 + (yy - zz) ** 2 + (zz - xx) ** 2) / 2 + 3 * (xy * xy + yz * yz + zx * zx))
+    if len(sig) == 3:
+        if numComp == 3:
+            return sig[0]
+        [s1, s2, s3] = sig
+        return np.sqrt(((s1 - s2) ** 2 + (s2 - s3) ** 2 + (s3 - s1) ** 2) / 2)
+    return sig[0]
+
+
+def symmetric_tensors(rng, count):
+    tensors = rng.normal(size=(count, 3, 3))
+    return (tensors + tensors.transpose(0, 2, 1)) / 2
+
+
+@pytest.mark.parametrize("width, num_comp, layout", [
+    (9, 9, FULL_TENSOR), (6, 6, SYMMETRIC_TENSOR), (3, 1, PRINCIPAL), (3, 3, SCALAR), (1, 1, SCALAR)])
+def test_von_mises_matches_the_per_node_loop(width, num_comp, layout):
+    rng = np.random.default_rng(width + num_comp)
+    if width == 9:
+        data = symmetric_tensors(rng, 50).reshape(-1, 9)
+    elif width == 6:
+        tensors = symmetric_tensors(rng, 50)
+        data = np.column_stack([tensors[:, 0, 0], tensors[:, 1, 1], tensors[:, 2, 2],
+                                tensors[:, 0, 1], tensors[:, 1, 2], tensors[:, 2, 0]])
+    else:
+        data = rng.normal(size=(50, width))
+
+    fields = compute_stress_fields(data.tolist(), num_comp=num_comp, num_nodes=50)
+
+    assert fields['layout'] == layout
+    assert np.allclose(fields['von_mises'], [baseline_von_mises(sig, num_comp) for sig in data.tolist()])
+
+
+def test_principal_stresses_and_max_shear():
+    tensors = symmetric_tensors(np.random.default_rng(0), 20)
+    fields = compute_stress_fields(tensors.reshape(-1, 9), num_comp=9)
+
+    expected = np.array([np.sort(np.linalg.eigvalsh(tensor))[::-1] for tensor in tensors])
+    assert np.allclose(fields['principal'], expected)
+    assert np.allclose(fields['max_shear'], (expected[:, 0] - expected[:, 2]) / 2)
+    assert 'principal' not in compute_stress_fields(tensors.reshape(-1, 9), num_comp=9, principal=False)
@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from engine import telegram
+
+
+class BotAPIStub(BaseHTTPRequestHandler):
+    """Stand-in for the Telegram Bot API: records sendMessage calls and plays the queued answers"""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        form = urllib.parse.parse_qs(self.rfile.read(length).decode('utf-8'))
+        server = self.server
+        with server.lock:
+            server.requests.append((time.time(), form['text'][0]))
+            status, payload = server.answers.pop(0) if server.answers else (200, {'ok': True})
+        time.sleep(server.delay)
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def bot_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BotAPIStub)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.answers = []
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    telegram.configure("123:TOKEN", "42", api_url=f"http://{host}:{port}")
+    yield server
+    telegram.discard_pending_messages()
+    telegram.configure("", "", api_url="")
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    """A dispatcher without the production rate limit, installed as the shared one"""
+    dispatcher = telegram.TelegramDispatcher(messages_per_minute=6000, digest_interval=60.0)
+    monkeypatch.setattr(telegram, '_dispatcher', dispatcher)
+    return dispatcher
+
+
+def sent(bot_api):
+    with bot_api.lock:
+        return [text for at, text in bot_api.requests]
+
+
+def test_send_returns_before_the_request_completes(bot_api, dispatcher):
+    bot_api.delay = 0.5
+    start = time.perf_counter()
+    assert telegram.send_telegram_message("🚀 start")
+    assert time.perf_counter() - start < 0.1
+    assert telegram.flush_telegram(timeout=5)
+    assert sent(bot_api) == ["🚀 start"]
+
+
+def test_messages_keep_their_order_and_file_updates_become_one_digest(bot_api, dispatcher):
+    telegram.send_telegram_message("🚀 start")
+    for index in range(5):
+        telegram.send_telegram_message(f"✅ file {index}\n📊 {index + 1}/5", silent=True, digest=True)
+    telegram.send_telegram_message("🎉 done")
+    assert telegram.flush_telegram(timeout=5)
+
+    messages = sent(bot_api)
+    assert len(messages) == 3
+    assert messages[0] == "🚀 start"
+    assert messages[1].startswith("📬 <b>5 updates</b>")
+    assert [f"✅ file {index} 📊 {index + 1}/5" in messages[1] for index in range(5)] == [True] * 5
+    assert messages[1].index("file 0") < messages[1].index("file 4")
+    assert messages[2] == "🎉 done"
+
+
+def test_429_is_retried_after_the_requested_delay(bot_api, dispatcher):
+    bot_api.answers = [(429, {'ok': False, 'error_code': 429, 'parameters': {'retry_after': 0.3}})]
+    telegram.send_telegram_message("⚠️ throttled")
+    assert telegram.flush_telegram(timeout=5)
+
+    with bot_api.lock:
+        requests = list(bot_api.requests)
+    assert [text for at, text in requests] == ["⚠️ throttled", "⚠️ throttled"]
+    assert requests[1][0] - requests[0][0] >= 0.3
+
+
+def test_flush_sends_the_pending_digest_and_drains_the_queue(bot_api, dispatcher):
+    bot_api.delay = 0.05
+    for index in range(3):
+        telegram.send_telegram_message(f"✅ file {index}", digest=True)
+    telegram.send_telegram_message("🎉 done")
+    telegram.send_telegram_message("✅ late file", digest=True)
+
+    # The last entry would otherwise wait for the 60 s digest interval
+    assert telegram.flush_telegram(timeout=5)
+    assert dispatcher._queue.empty()
+    assert sent(bot_api)[-2:] == ["🎉 done", "✅ late file"]
+    assert len(sent(bot_api)) == 3
+
+
+def test_nothing_is_queued_when_notifications_are_off(dispatcher):
+    telegram.configure("", "")
+    assert not telegram.send_telegram_message("🚀 start")
+    assert dispatcher._queue.empty()
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from engine.vtk_export import write_vtu_stream
+
+NODE_TAGS = np.array([4, 2, 9, 7])
+NODE_COORDS = np.array([[0.0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]])
+POINT_DATA = {'Von mises Stress': np.arange(4.0)}
+
+
+def test_streamed_vtu_is_complete(tmp_path):
+    path = tmp_path / "combined_data.vtu"
+    write_vtu_stream(str(path), NODE_COORDS, NODE_TAGS, [(4, np.array([1]), np.array([[4, 2, 9, 7]]))],
+                     POINT_DATA, chunk_size=2)
+    assert path.read_bytes().endswith(b"</VTKFile>\n")
+
+
+# Beyond the largest tag, negative, and between known tags
+@pytest.mark.parametrize("tag", [12, -1, 5])
+def test_unknown_node_tags_are_refused_before_writing(tmp_path, tag):
+    path = tmp_path / "combined_data.vtu"
+    with pytest.raises(ValueError, match="unknown node tags"):
+        write_vtu_stream(str(path), NODE_COORDS, NODE_TAGS, [(4, np.array([1]), np.array([[4, 2, 9, tag]]))],
+                         POINT_DATA, chunk_size=2)
+    assert not path.exists()
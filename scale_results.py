@@ -7,12 +7,12 @@ def find_vtk_files(directory):
     vtk_files = []
     for root, dirs, files in os.walk(directory):
         for file in files:
-            if file.endswith('.vtk'):
+            if file.endswith(('.vtk', '.vtu')):
                 vtk_files.append(os.path.join(root, file))
     return vtk_files
 
 def get_user_choice(vtk_files):
-    print("\nList of .vtk files in the directory:")
+    print("\nList of .vtk/.vtu files in the directory:")
     for i, vtk_file in enumerate(vtk_files):
         print(f"{i+1}. {vtk_file}")
 
@@ -34,7 +34,10 @@ def get_variable_choice(array_names):
     return selected_variable
 
 def read_vtk_to_dataframe(vtk_file):
-    reader = vtk.vtkGenericDataObjectReader()
+    if vtk_file.endswith('.vtu'):
+        reader = vtk.vtkXMLUnstructuredGridReader()
+    else:
+        reader = vtk.vtkGenericDataObjectReader()
     reader.SetFileName(vtk_file)
     reader.Update()
     
@@ -74,11 +77,20 @@ def save_scaled_vtk(df, data, vtk_file, variable_name):
     point_data.RemoveArray(variable_name)
     point_data.AddArray(scaled_vtk_array)
     
-    writer = vtk.vtkGenericDataObjectWriter()
-    new_file_name = vtk_file.replace('.vtk', '.vtk')
+    new_file_name = vtk_file
+    if vtk_file.endswith('.vtu'):
+        # Keep .vtu files as compressed appended binary
+        writer = vtk.vtkXMLUnstructuredGridWriter()
+        writer.SetDataModeToAppended()
+        writer.EncodeAppendedDataOff()
+        writer.SetHeaderTypeToUInt64()
+        writer.SetCompressorTypeToZLib()
+    else:
+        # Legacy .vtk files are rewritten as ASCII for older pipelines
+        writer = vtk.vtkGenericDataObjectWriter()
+        writer.SetFileTypeToASCII()
     writer.SetFileName(new_file_name)
     writer.SetInputData(data)
-    writer.SetFileTypeToASCII()  # Set the file type to ASCII
     writer.Write()
     print(f"Scaled file saved as {new_file_name}")
 
@@ -91,11 +103,11 @@ def main():
     vtk_files = find_vtk_files(directory)
     
     if not vtk_files:
-        print("No .vtk files found in the directory.")
+        print("No .vtk or .vtu files found in the directory.")
         return
     
     selected_files = get_user_choice(vtk_files)
-    print("\nSelected .vtk files:")
+    print("\nSelected .vtk/.vtu files:")
     for file in selected_files:
         print(file)
     
@@ -112,7 +124,7 @@ def main():
         save_scaled_vtk(df, data, file, selected_variable)
         
         if export_csv:
-            csv_file_name = file.replace('.vtk', '.csv')
+            csv_file_name = os.path.splitext(file)[0] + '.csv'
             df.to_csv(csv_file_name, index=False)
             print(f"CSV file saved as {csv_file_name}")
 